@@ -1,11 +1,40 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
-
-import tkinter as tk
-from tkinter import filedialog, messagebox
+import argparse
+import bisect
+import csv
+import functools
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 
 
 @dataclass
@@ -17,44 +46,829 @@ class Process:
     completion_time: int = 0
     turnaround_time: int = 0
     waiting_time: int = 0
+    response_time: int = 0
+
+
+class ProcessTable:
+    # Struct-of-arrays storage: one int64 column per field instead of one
+    # Process object per job. arrival_sorted records that rows are already in
+    # (arrival, pid) order so sort_by_arrival can be skipped. The content digest
+    # is cached and dropped by the methods that change rows; code that edits
+    # pid/arrival/burst in place must call forget_digest().
+    COLUMNS = ("pid", "arrival", "burst", "remaining", "completion", "turnaround", "waiting", "response")
+    __slots__ = COLUMNS + ("arrival_sorted", "_digest")
+
+    def __init__(
+        self,
+        pid: Sequence[int],
+        arrival: Sequence[int],
+        burst: Sequence[int],
+        arrival_sorted: bool = False,
+    ) -> None:
+        self.pid = np.asarray(pid, dtype=np.int64)
+        self.arrival = np.asarray(arrival, dtype=np.int64)
+        self.burst = np.asarray(burst, dtype=np.int64)
+        if not (len(self.pid) == len(self.arrival) == len(self.burst)):
+            raise ValueError("pid, arrival and burst columns must have the same length")
+        self.remaining = self.burst.copy()
+        self.completion = np.zeros(len(self.pid), dtype=np.int64)
+        self.turnaround = np.zeros(len(self.pid), dtype=np.int64)
+        self.waiting = np.zeros(len(self.pid), dtype=np.int64)
+        self.response = np.zeros(len(self.pid), dtype=np.int64)
+        self.arrival_sorted = arrival_sorted
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def empty(cls) -> ProcessTable:
+        return cls([], [], [])
+
+    @classmethod
+    def from_processes(cls, processes: Sequence[Process]) -> ProcessTable:
+        table = cls(
+            [p.pid for p in processes],
+            [p.arrival_time for p in processes],
+            [p.burst_time for p in processes],
+        )
+        table.remaining[:] = [p.remaining_time for p in processes]
+        table.completion[:] = [p.completion_time for p in processes]
+        table.turnaround[:] = [p.turnaround_time for p in processes]
+        table.waiting[:] = [p.waiting_time for p in processes]
+        table.response[:] = [p.response_time for p in processes]
+        return table
+
+    def __len__(self) -> int:
+        return len(self.pid)
+
+    def to_processes(self) -> List[Process]:
+        return [
+            Process(*row)
+            for row in zip(
+                self.pid.tolist(),
+                self.arrival.tolist(),
+                self.burst.tolist(),
+                self.remaining.tolist(),
+                self.completion.tolist(),
+                self.turnaround.tolist(),
+                self.waiting.tolist(),
+                self.response.tolist(),
+            )
+        ]
+
+    def write_back(self, processes: Sequence[Process]) -> None:
+        rows = zip(
+            processes,
+            self.remaining.tolist(),
+            self.completion.tolist(),
+            self.turnaround.tolist(),
+            self.waiting.tolist(),
+            self.response.tolist(),
+        )
+        for p, rt, ct, tat, wt, resp in rows:
+            p.remaining_time = rt
+            p.completion_time = ct
+            p.turnaround_time = tat
+            p.waiting_time = wt
+            p.response_time = resp
+
+    def append(self, pid: int, arrival_time: int, burst_time: int) -> None:
+        if self.arrival_sorted and len(self):
+            self.arrival_sorted = (int(self.arrival[-1]), int(self.pid[-1])) <= (arrival_time, pid)
+        for name, value in zip(self.COLUMNS, (pid, arrival_time, burst_time, burst_time, 0, 0, 0, 0)):
+            setattr(self, name, np.append(getattr(self, name), np.int64(value)))
+        self._digest = None
+
+    def insert_sorted(self, pid: int, arrival_time: int, burst_time: int) -> int:
+        # Insert into an arrival-sorted table, after any rows with the same
+        # (arrival, pid) like a stable sort would; returns the new row index.
+        if not self.arrival_sorted:
+            raise ValueError("insert_sorted needs an arrival-sorted table")
+        low = int(np.searchsorted(self.arrival, arrival_time, side="left"))
+        high = int(np.searchsorted(self.arrival, arrival_time, side="right"))
+        index = low + int(np.searchsorted(self.pid[low:high], pid, side="right"))
+        for name, value in zip(self.COLUMNS, (pid, arrival_time, burst_time, burst_time, 0, 0, 0, 0)):
+            setattr(self, name, np.insert(getattr(self, name), index, np.int64(value)))
+        self._digest = None
+        return index
+
+    def sort_by_arrival(self) -> None:
+        if self.arrival_sorted:
+            return
+        order = np.lexsort((self.pid, self.arrival))
+        for name in self.COLUMNS:
+            setattr(self, name, getattr(self, name)[order])
+        self.arrival_sorted = True
+        self._digest = None
+
+    def digest(self, compute: bool = True) -> Optional[str]:
+        # SHA-256 of the pid, arrival and burst columns in row order; with
+        # compute=False only an already cached digest is returned.
+        if self._digest is None and compute:
+            h = hashlib.sha256(struct.pack("<Q", len(self)))
+            for column in (self.pid, self.arrival, self.burst):
+                h.update(np.ascontiguousarray(column, dtype="<i8").data)
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def forget_digest(self) -> None:
+        self._digest = None
+
+
+def _is_arrival_sorted(pid: np.ndarray, arrival: np.ndarray) -> bool:
+    if len(arrival) < 2:
+        return True
+    step = np.diff(arrival)
+    return bool(np.all((step > 0) | ((step == 0) & (pid[1:] >= pid[:-1]))))
+
 
+Processes = Union[ProcessTable, List[Process]]
 
-def reset_stats(processes: List[Process]) -> None:
+
+def as_table(processes: Processes) -> ProcessTable:
+    if isinstance(processes, ProcessTable):
+        return processes
+    return ProcessTable.from_processes(processes)
+
+
+def reset_stats(processes: Processes) -> None:
+    if isinstance(processes, ProcessTable):
+        processes.remaining[:] = processes.burst
+        processes.completion[:] = 0
+        processes.turnaround[:] = 0
+        processes.waiting[:] = 0
+        processes.response[:] = 0
+        return
     for p in processes:
         p.remaining_time = p.burst_time
         p.completion_time = 0
         p.turnaround_time = 0
         p.waiting_time = 0
+        p.response_time = 0
 
 
-def _add_segment(segments: List[tuple], pid: int, start: int, end: int) -> None:
-    if start == end:
-        return
-    if segments and segments[-1][0] == pid and segments[-1][2] == start:
-        segments[-1] = (pid, segments[-1][1], end)
-        return
-    segments.append((pid, start, end))
+def _fcfs_completion(arrival: np.ndarray, burst: np.ndarray) -> np.ndarray:
+    # FCFS completion times of arrival-sorted jobs in closed form: with S_k the
+    # running burst total, c_k = max(c_{k-1}, a_k) + b_k unrolls to
+    # c_k = S_k + max over j <= k of (a_j - S_{j-1}).
+    total = np.cumsum(burst)
+    return total + np.maximum.accumulate(arrival - (total - burst))
+
+
+def busy_period_starts(table: ProcessTable) -> np.ndarray:
+    # Row indices (into the arrival-sorted table) where a busy period begins.
+    # Every policy here is work-conserving, so the CPU is busy over the same
+    # intervals as under FCFS, and a new busy period starts at row k+1
+    # whenever a_{k+1} > c_k.
+    table.sort_by_arrival()
+    if not len(table):
+        return np.zeros(0, dtype=np.int64)
+    ends = _fcfs_completion(table.arrival, table.burst)
+    starts = np.flatnonzero(table.arrival[1:] > ends[:-1]) + 1
+    return np.concatenate(([0], starts))
+
+
+class Timeline:
+    # Run-length CPU timeline: parallel int64 arrays of (pid, start, end) with
+    # pid -1 for idle. add() merges a segment into the previous one when the
+    # same pid continues without a gap. Queries run on NumPy copies of the
+    # columns that are rebuilt only after the timeline has changed.
+    __slots__ = ("_pids", "_starts", "_ends", "_cache_key", "_cache")
+
+    def __init__(self) -> None:
+        self._pids = array("q")
+        self._starts = array("q")
+        self._ends = array("q")
+        self._cache_key: Optional[Tuple[int, int]] = None
+        self._cache: Tuple[np.ndarray, ...] = ()
+
+    @classmethod
+    def from_arrays(cls, pids: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Timeline:
+        # Columns must already be merged (as produced by add)
+        timeline = cls()
+        timeline._pids.frombytes(np.ascontiguousarray(pids, dtype=np.int64).tobytes())
+        timeline._starts.frombytes(np.ascontiguousarray(starts, dtype=np.int64).tobytes())
+        timeline._ends.frombytes(np.ascontiguousarray(ends, dtype=np.int64).tobytes())
+        return timeline
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Tuple[int, int, int]]) -> Timeline:
+        timeline = cls()
+        for pid, start, end in segments:
+            timeline.add(pid, start, end)
+        return timeline
+
+    def add(self, pid: int, start: int, end: int) -> None:
+        if start == end:
+            return
+        ends = self._ends
+        if ends and ends[-1] == start and self._pids[-1] == pid:
+            ends[-1] = end
+            return
+        self._pids.append(pid)
+        self._starts.append(start)
+        ends.append(end)
+
+    def copy(self) -> Timeline:
+        timeline = Timeline()
+        timeline._pids = self._pids[:]
+        timeline._starts = self._starts[:]
+        timeline._ends = self._ends[:]
+        return timeline
+
+    def pop_front(self, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Removes the first `count` segments and returns them as columns; the
+        # streaming simulators pass segments on once nothing can merge into them
+        pids = np.array(self._pids[:count], dtype=np.int64)
+        starts = np.array(self._starts[:count], dtype=np.int64)
+        ends = np.array(self._ends[:count], dtype=np.int64)
+        del self._pids[:count]
+        del self._starts[:count]
+        del self._ends[:count]
+        self._cache_key = None
+        return pids, starts, ends
+
+    def truncate(self, length: int, last_end: int) -> None:
+        # Roll back to an earlier state: keep `length` segments and restore the
+        # end of the last one, which later merges may have extended.
+        del self._pids[length:]
+        del self._starts[length:]
+        del self._ends[length:]
+        if length:
+            self._ends[-1] = last_end
+        # The rerun may come back to the same length and end time
+        self._cache_key = None
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        return zip(self._pids, self._starts, self._ends)
+
+    def __getitem__(self, index: int) -> Tuple[int, int, int]:
+        return self._pids[index], self._starts[index], self._ends[index]
+
+    def __repr__(self) -> str:
+        return f"Timeline({len(self)} segments, end={self.end_time})"
+
+    @property
+    def end_time(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._columns()[:3]
+
+    def _columns(self) -> Tuple[np.ndarray, ...]:
+        key = (len(self._ends), self.end_time)
+        if self._cache_key != key:
+            pids = np.array(self._pids, dtype=np.int64)
+            starts = np.array(self._starts, dtype=np.int64)
+            ends = np.array(self._ends, dtype=np.int64)
+            busy = np.where(pids != -1, ends - starts, 0)
+            self._cache = (pids, starts, ends, np.concatenate(([0], np.cumsum(busy))))
+            self._cache_key = key
+        return self._cache
+
+    def index_at(self, t: float) -> int:
+        # Index of the segment covering time t, or -1 outside the timeline
+        _, starts, ends, _ = self._columns()
+        i = int(np.searchsorted(ends, t, side="right"))
+        if i < len(ends) and starts[i] <= t:
+            return i
+        return -1
+
+    def pid_at(self, t: float) -> Optional[int]:
+        i = self.index_at(t)
+        return self._pids[i] if i != -1 else None
+
+    def window(self, start: float, end: float) -> Tuple[int, int]:
+        # Index range [first, last) of segments overlapping [start, end)
+        _, starts, ends, _ = self._columns()
+        first = int(np.searchsorted(ends, start, side="right"))
+        last = int(np.searchsorted(starts, end, side="left"))
+        return first, max(first, last)
+
+    def busy_until(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        # Non-idle CPU time in [0, t) for each t
+        pids, starts, ends, busy_before = self._columns()
+        t = np.asarray(times, dtype=np.float64)
+        if not len(ends):
+            return np.zeros_like(t)
+        i = np.searchsorted(ends, t, side="right")
+        inside = np.minimum(i, len(ends) - 1)
+        partial = np.clip(t - starts[inside], 0, ends[inside] - starts[inside])
+        partial = np.where((i < len(ends)) & (pids[inside] != -1), partial, 0)
+        return busy_before[i] + partial
+
+    def busy_time(self, start: float = 0, end: Optional[float] = None) -> float:
+        if end is None:
+            end = self.end_time
+        low, high = self.busy_until(np.array([start, end], dtype=np.float64))
+        return float(high - low)
+
+    def utilization(self, start: float = 0, end: Optional[float] = None) -> float:
+        if end is None:
+            end = self.end_time
+        if end <= start:
+            return 0.0
+        return self.busy_time(start, end) / (end - start)
+
+    def occupancy(self) -> Dict[int, int]:
+        # Total CPU time per pid (idle excluded)
+        pids, starts, ends, _ = self._columns()
+        running = pids != -1
+        keys, inverse = np.unique(pids[running], return_inverse=True)
+        totals = np.bincount(inverse, weights=(ends - starts)[running], minlength=len(keys))
+        return dict(zip(keys.tolist(), totals.astype(np.int64).tolist()))
+
+
+def _accepts_process_list(simulate: Callable[..., Timeline]) -> Callable[..., Timeline]:
+    # Thin adapter so the simulators keep working on List[Process]: run on a
+    # temporary table, then copy the results back onto the Process objects.
+    @functools.wraps(simulate)
+    def wrapper(processes: Processes, *args, **kwargs) -> Timeline:
+        if isinstance(processes, ProcessTable):
+            return simulate(processes, *args, **kwargs)
+        table = ProcessTable.from_processes(processes)
+        segments = simulate(table, *args, **kwargs)
+        table.write_back(processes)
+        return segments
+
+    return wrapper
+
+
+def _record_completions(
+    table: ProcessTable, completion: Sequence[int], first_run: Optional[Sequence[int]] = None
+) -> None:
+    # first_run holds when each process was first dispatched; without it the
+    # policy is non-preemptive and response time equals waiting time.
+    table.completion[:] = completion
+    np.subtract(table.completion, table.arrival, out=table.turnaround)
+    np.subtract(table.turnaround, table.burst, out=table.waiting)
+    if first_run is None:
+        table.response[:] = table.waiting
+    else:
+        table.response[:] = first_run
+        table.response -= table.arrival
+
+
+@dataclass
+class Checkpoint:
+    # Scheduler state at the top of a simulation loop iteration: the clock, how
+    # many processes (in arrival order) were admitted, the timeline size and
+    # the policy's ready-queue contents.
+    time: int
+    cursor: int
+    segments: int
+    last_end: int
+    state: tuple
+
+
+class CheckpointLog:
+    # Passed to a simulator to record a Checkpoint every `every` loop
+    # iterations, or more rarely when the ready queue is long: the checkpoint
+    # after one of a queue of q jobs comes at least q iterations later, so
+    # all snapshots together stay linear in the length of the run. After
+    # rewind(t) the next run with this log resumes from the last checkpoint
+    # before t instead of starting at time 0.
+    def __init__(self, every: int = 256) -> None:
+        self.every = every
+        self.checkpoints: List[Checkpoint] = []
+        self.timeline: Optional[Timeline] = None
+        self.resume_from: Optional[Checkpoint] = None
+
+    def begin(self) -> Tuple[Timeline, Optional[Checkpoint]]:
+        checkpoint, self.resume_from = self.resume_from, None
+        if checkpoint is None or self.timeline is None:
+            self.checkpoints = []
+            self.timeline = Timeline()
+            return self.timeline, None
+        # The last run's timeline has been handed out (to the GUI's chart and
+        # the result cache), so the rerun works on a copy of it
+        self.timeline = self.timeline.copy()
+        self.timeline.truncate(checkpoint.segments, checkpoint.last_end)
+        return self.timeline, checkpoint
+
+    def discard(self) -> None:
+        # For runs that keep no checkpoints: the next resume starts over
+        self.checkpoints = []
+        self.timeline = None
+        self.resume_from = None
+
+    def record(self, time: int, cursor: int, timeline: Timeline, state: tuple) -> None:
+        self.checkpoints.append(Checkpoint(time, cursor, len(timeline), timeline.end_time, state))
+
+    def rewind(self, arrival_time: int) -> Optional[Checkpoint]:
+        # A process arriving at t cannot affect anything decided before t, so
+        # any checkpoint taken strictly before t is still valid.
+        keep = bisect.bisect_left([cp.time for cp in self.checkpoints], arrival_time)
+        del self.checkpoints[keep:]
+        self.resume_from = self.checkpoints[-1] if self.checkpoints else None
+        return self.resume_from
+
+
+class SimStats:
+    # Opt-in instrumentation, filled in when a simulator gets stats=SimStats().
+    # Counts are per scheduler step: a dispatch is one pick of a job to run
+    # (the lone-job fast paths of RR and MLFQ count once), a preemption is a
+    # dispatch that ends with the job unfinished and another job dispatched
+    # next (SRTF stops at every arrival, but the running job often keeps the
+    # CPU, which is neither a preemption nor a new dispatch), and pushes/pops
+    # cover every ready queue (FCFS counts its arrival order as one). Only the preemption and demotion branches test for stats; the
+    # rest is derived once at the end, so a run without stats pays nothing.
+    def __init__(self) -> None:
+        self.dispatches = 0
+        self.preemptions = 0
+        self.queue_pushes = 0
+        self.queue_pops = 0
+        self.demotions: Dict[int, int] = {}
+        self.context_switches = 0
+        self.idle_time = 0
+        self.phases: Dict[str, float] = {}
+        # False when the result came from a cache hit or a parallel run, which
+        # count no scheduler steps: those counters are then unavailable
+        self.counted = True
+        self._preemptions_seen = 0
+        self._last_pid: Optional[int] = None
+
+    def demote(self, level: int) -> None:
+        self.demotions[level] = self.demotions.get(level, 0) + 1
+
+    def record_run(self, segments: Timeline, admitted: int, completed: int) -> None:
+        # Called by a simulator when it finishes; admitted and completed only
+        # cover this call (a resumed run starts from its checkpoint).
+        self.record_steps(admitted, completed)
+        self.record_timeline(segments)
+
+    def record_steps(self, admitted: int, completed: int) -> None:
+        preempted = self.preemptions - self._preemptions_seen
+        self._preemptions_seen = self.preemptions
+        self.dispatches += completed + preempted
+        self.queue_pushes += admitted + preempted
+        self.queue_pops += completed + preempted
+
+    def record_segments(self, pids: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> None:
+        # Streamed runs never hold the whole timeline, so they add up idle
+        # time and context switches one stretch of segments at a time
+        idle = pids == -1
+        self.idle_time += int((ends[idle] - starts[idle]).sum())
+        running = pids[~idle]
+        if not len(running):
+            return
+        self.context_switches += int(np.count_nonzero(running[1:] != running[:-1]))
+        if self._last_pid is not None and running[0] != self._last_pid:
+            self.context_switches += 1
+        self._last_pid = int(running[-1])
+
+    def record_uncounted(self, segments: Timeline) -> None:
+        self.counted = False
+        self.record_timeline(segments)
+
+    def record_timeline(self, segments: Timeline) -> None:
+        # These two describe the whole resulting timeline
+        pids, starts, ends = segments.arrays()
+        idle = pids == -1
+        self.idle_time = int((ends[idle] - starts[idle]).sum())
+        self.context_switches = count_context_switches(segments)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> Dict[str, object]:
+        counted = self.counted
+        return {
+            "dispatches": self.dispatches if counted else None,
+            "preemptions": self.preemptions if counted else None,
+            "context_switches": self.context_switches,
+            "queue_pushes": self.queue_pushes if counted else None,
+            "queue_pops": self.queue_pops if counted else None,
+            "demotions": (
+                {f"Q{level + 1}": count for level, count in sorted(self.demotions.items())} if counted else None
+            ),
+            "idle_time": self.idle_time,
+            "phase_seconds": dict(self.phases),
+        }
+
+
+def timed(stats: Optional[SimStats], name: str) -> ContextManager[None]:
+    return stats.phase(name) if stats is not None else nullcontext()
+
+
+class SimulationCancelled(Exception):
+    pass
+
+
+class Progress:
+    # Shared between a running simulation and whoever watches it, e.g. the GUI
+    # thread. The simulator calls tick() at least every `every` loop
+    # iterations and tick() raises SimulationCancelled once cancel() has been
+    # called.
+    def __init__(self, every: int = 1024) -> None:
+        self.every = every
+        self.total = 0
+        self.completed = 0
+        self.time = 0
+        self.cancelled = False
+
+    def start(self, total: int) -> None:
+        self.total = total
+        self.completed = 0
+        self.time = 0
+
+    def tick(self, completed: int, time: int) -> None:
+        self.completed = completed
+        self.time = time
+        if self.cancelled:
+            raise SimulationCancelled()
+
+    def finish(self) -> None:
+        self.completed = self.total
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.total else 0.0
+
+
+@dataclass
+class LoadReport:
+    accepted: int = 0
+    rejected: int = 0
+    reasons: Dict[str, int] = field(default_factory=dict)
+    samples: List[Tuple[int, str]] = field(default_factory=list)
+    max_samples: int = 20
+
+    def reject(self, line_no: int, reason: str, count: int = 1) -> None:
+        self.rejected += count
+        self.reasons[reason] = self.reasons.get(reason, 0) + count
+        if len(self.samples) < self.max_samples:
+            self.samples.append((line_no, reason))
+
+    def summary(self) -> str:
+        if not self.rejected:
+            return f"Loaded {self.accepted} processes."
+        reasons = ", ".join(f"{count} {reason}" for reason, count in self.reasons.items())
+        return f"Loaded {self.accepted} processes, rejected {self.rejected} lines ({reasons})."
+
+
+_CHUNK_BYTES = 1 << 22
+_WHITESPACE = np.zeros(256, dtype=bool)
+_WHITESPACE[list(b" \t\n\r\x0b\x0c")] = True
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+_INT64_RANGE = (-(2**63), 2**63)
+
+
+def _tokenize_chunk(data: bytes) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+    # Vectorized integer tokenizer: returns (line of each token, token values,
+    # number of lines), or None if the chunk has anything that is not a plain
+    # (optionally signed) integer of at most 18 digits.
+    buf = np.frombuffer(data, dtype=np.uint8)
+    space = _WHITESPACE[buf]
+    newline_pos = np.flatnonzero(buf == 10)
+    n_lines = len(newline_pos) + (0 if data.endswith(b"\n") else 1)
+
+    solid = ~space
+    starts = np.flatnonzero(solid & np.concatenate(([True], space[:-1])))
+    ends = np.flatnonzero(solid & np.concatenate((space[1:], [True]))) + 1
+    if not len(starts):
+        return starts, starts.astype(np.int64), n_lines
+
+    lengths = ends - starts
+    first = buf[starts]
+    negative = first == 45
+    signed = negative | (first == 43)
+    n_digits = lengths - signed
+    if n_digits.min() <= 0 or n_digits.max() > 18:
+        return None
+
+    # Digit value times 10**(distance to token end) for every non-space byte,
+    # summed per token. Sign bytes contribute nothing.
+    solid_pos = np.flatnonzero(solid)
+    token_offsets = np.cumsum(lengths) - lengths
+    digits = buf[solid_pos].astype(np.int64) - 48
+    digits[token_offsets[signed]] = 0
+    if digits.min() < 0 or digits.max() > 9:
+        return None
+    exponents = np.repeat(ends, lengths) - solid_pos - 1
+    values = np.add.reduceat(digits * _POW10[exponents], token_offsets)
+    values[negative] *= -1
+    return np.searchsorted(newline_pos, starts), values, n_lines
+
+
+def _parse_chunk(data: bytes, first_line: int, report: LoadReport) -> Tuple[np.ndarray, ...]:
+    tokens = _tokenize_chunk(data)
+    if tokens is None:
+        return _parse_chunk_slow(data, first_line, report)
+    token_line, values, n_lines = tokens
+
+    counts = np.bincount(token_line, minlength=n_lines)
+    first_token = np.cumsum(counts) - counts
+    for line in np.flatnonzero((counts > 0) & (counts < 3)).tolist():
+        report.reject(first_line + line, "fewer than 3 fields")
+
+    lines = np.flatnonzero(counts >= 3)
+    heads = first_token[lines]
+    pid, at, bt = values[heads], values[heads + 1], values[heads + 2]
+
+    bad_at = at < 0
+    bad_bt = ~bad_at & (bt <= 0)
+    for line in lines[bad_at].tolist():
+        report.reject(first_line + line, "negative arrival time")
+    for line in lines[bad_bt].tolist():
+        report.reject(first_line + line, "non-positive burst time")
+    keep = ~(bad_at | bad_bt)
+    report.accepted += int(keep.sum())
+    return pid[keep], at[keep], bt[keep]
+
+
+def _parse_chunk_slow(data: bytes, first_line: int, report: LoadReport) -> Tuple[np.ndarray, ...]:
+    rows: List[Tuple[int, int, int]] = []
+    for line_no, line in enumerate(data.splitlines(), start=first_line):
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) < 3:
+            report.reject(line_no, "fewer than 3 fields")
+            continue
+        try:
+            pid, at, bt = map(int, parts[:3])
+        except ValueError:
+            report.reject(line_no, "non-integer field")
+            continue
+        if not all(_INT64_RANGE[0] <= v < _INT64_RANGE[1] for v in (pid, at, bt)):
+            report.reject(line_no, "value out of range")
+            continue
+        if at < 0:
+            report.reject(line_no, "negative arrival time")
+            continue
+        if bt <= 0:
+            report.reject(line_no, "non-positive burst time")
+            continue
+        rows.append((pid, at, bt))
+    report.accepted += len(rows)
+    columns = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    return columns[:, 0], columns[:, 1], columns[:, 2]
+
+
+def _iter_chunks(path: str, report: LoadReport, chunk_bytes: int) -> Iterator[Tuple[np.ndarray, ...]]:
+    line_no = 1
+    with open(path, "rb") as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                return
+            yield _parse_chunk(b"".join(lines), line_no, report)
+            line_no += len(lines)
+
+
+def load_process_table(
+    path: str, report: Optional[LoadReport] = None, chunk_bytes: int = _CHUNK_BYTES
+) -> ProcessTable:
+    if report is None:
+        report = LoadReport()
+    try:
+        chunks = list(_iter_chunks(path, report, chunk_bytes))
+    except FileNotFoundError:
+        return ProcessTable.empty()
+    if not chunks:
+        return ProcessTable.empty()
+    pid, at, bt = (np.concatenate(column) for column in zip(*chunks))
+    return ProcessTable(pid, at, bt, arrival_sorted=_is_arrival_sorted(pid, at))
+
+
+def iter_processes_from_file(
+    path: str, report: Optional[LoadReport] = None, chunk_bytes: int = _CHUNK_BYTES
+) -> Iterator[Process]:
+    if report is None:
+        report = LoadReport()
+    for pid, at, bt in _iter_chunks(path, report, chunk_bytes):
+        for row in zip(pid.tolist(), at.tolist(), bt.tolist()):
+            yield Process(*row, row[2])
 
 
 def load_processes_from_file(path: str) -> List[Process]:
-    processes: List[Process] = []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) < 3:
-                    continue
-                pid, at, bt = map(int, parts[:3])
-                if at < 0 or bt <= 0:
-                    continue
-                processes.append(Process(pid, at, bt, bt))
+        return list(iter_processes_from_file(path))
     except FileNotFoundError:
         return []
 
-    return processes
+
+# Binary trace: a 32-byte header followed by the pid, arrival and burst
+# columns as little-endian int64, so a trace can be memory-mapped as-is.
+TRACE_MAGIC = b"CPUTRACE"
+TRACE_VERSION = 1
+TRACE_FLAG_ARRIVAL_SORTED = 1
+_TRACE_HEADER = struct.Struct("<8sIIQ8x")
+_TRACE_DTYPE = np.dtype("<i8")
+
+
+def is_trace_file(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(TRACE_MAGIC)) == TRACE_MAGIC
+    except OSError:
+        return False
+
+
+def write_trace(path: str, table: ProcessTable) -> None:
+    flags = TRACE_FLAG_ARRIVAL_SORTED if _is_arrival_sorted(table.pid, table.arrival) else 0
+    with open(path, "wb") as f:
+        f.write(_TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, flags, len(table)))
+        for column in (table.pid, table.arrival, table.burst):
+            f.write(np.ascontiguousarray(column, dtype=_TRACE_DTYPE).tobytes())
+
+
+def convert_text_to_trace(
+    src: str, dst: str, report: Optional[LoadReport] = None, sort: bool = False
+) -> LoadReport:
+    # The trace is written to dst.part and renamed at the end, so a missing
+    # source or a failed conversion leaves no trace behind that looks valid.
+    if report is None:
+        report = LoadReport()
+    with open(src, "rb"):
+        pass
+    part = dst + ".part"
+    try:
+        if sort:
+            table = load_process_table(src, report)
+            table.sort_by_arrival()
+            write_trace(part, table)
+        else:
+            _stream_text_to_trace(src, part, report)
+        os.replace(part, dst)
+    finally:
+        if os.path.exists(part):
+            os.remove(part)
+    return report
+
+
+def _stream_text_to_trace(src: str, dst: str, report: LoadReport) -> None:
+    # Stream chunk by chunk: pids go straight into dst, arrival and burst are
+    # spooled to temporary files and appended once the row count is known.
+    count = 0
+    arrival_sorted = True
+    last: Optional[Tuple[int, int]] = None
+    with open(dst, "wb") as out, tempfile.TemporaryFile() as arrivals, tempfile.TemporaryFile() as bursts:
+        out.write(_TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, 0))
+        for pid, at, bt in _iter_chunks(src, report, _CHUNK_BYTES):
+            if not len(pid):
+                continue
+            if arrival_sorted:
+                head = (int(at[0]), int(pid[0]))
+                arrival_sorted = (last is None or last <= head) and _is_arrival_sorted(pid, at)
+            last = (int(at[-1]), int(pid[-1]))
+            out.write(pid.astype(_TRACE_DTYPE).tobytes())
+            arrivals.write(at.astype(_TRACE_DTYPE).tobytes())
+            bursts.write(bt.astype(_TRACE_DTYPE).tobytes())
+            count += len(pid)
+        for spool in (arrivals, bursts):
+            spool.seek(0)
+            shutil.copyfileobj(spool, out)
+        out.seek(0)
+        flags = TRACE_FLAG_ARRIVAL_SORTED if arrival_sorted else 0
+        out.write(_TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, flags, count))
+
+
+def map_trace(path: str) -> Tuple[np.ndarray, bool]:
+    # Read-only (3, count) mapping of the pid, arrival and burst columns plus
+    # the header's arrival-sorted flag; nothing is read until it is touched.
+    with open(path, "rb") as f:
+        header = f.read(_TRACE_HEADER.size)
+    if len(header) < _TRACE_HEADER.size:
+        raise ValueError(f"{path}: truncated trace header")
+    magic, version, flags, count = _TRACE_HEADER.unpack(header)
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"{path}: not a binary trace file")
+    if version != TRACE_VERSION:
+        raise ValueError(f"{path}: unsupported trace version {version}")
+    expected = _TRACE_HEADER.size + 3 * count * _TRACE_DTYPE.itemsize
+    if os.path.getsize(path) != expected:
+        raise ValueError(f"{path}: expected {expected} bytes for {count} processes")
+    arrival_sorted = bool(flags & TRACE_FLAG_ARRIVAL_SORTED)
+    if count == 0:
+        return np.zeros((3, 0), dtype=_TRACE_DTYPE), arrival_sorted
+    columns = np.memmap(path, dtype=_TRACE_DTYPE, mode="r", offset=_TRACE_HEADER.size, shape=(3, count))
+    return columns, arrival_sorted
+
+
+def load_trace(path: str) -> ProcessTable:
+    # pid/arrival/burst are views on the mapped file, only the per-run
+    # columns (remaining and the stats) get real memory.
+    columns, arrival_sorted = map_trace(path)
+    if not columns.shape[1]:
+        return ProcessTable.empty()
+    return ProcessTable(columns[0], columns[1], columns[2], arrival_sorted=arrival_sorted)
+
+
+def open_process_file(path: str, report: Optional[LoadReport] = None) -> ProcessTable:
+    if is_trace_file(path):
+        return load_trace(path)
+    return load_process_table(path, report)
 
 
 def enter_processes_manually() -> List[Process]:
@@ -99,495 +913,1289 @@ def enter_processes_manually() -> List[Process]:
     return processes
 
 
-def simulate_fcfs(processes: List[Process]) -> List[tuple]:
-    segments: List[tuple] = []
-    current_time = 0
-    for p in processes:
-        if current_time < p.arrival_time:
-            _add_segment(segments, -1, current_time, p.arrival_time)
-            current_time = p.arrival_time
-        _add_segment(segments, p.pid, current_time, current_time + p.burst_time)
-        p.waiting_time = current_time - p.arrival_time
-        current_time += p.burst_time
-        p.turnaround_time = p.waiting_time + p.burst_time
-        p.completion_time = current_time
-    return segments
-
-
-def simulate_sjf(processes: List[Process]) -> List[tuple]:
-    n = len(processes)
-    completed = 0
-    current_time = 0
-    done = [False] * n
-    segments: List[tuple] = []
-
-    while completed < n:
-        idx = -1
-        min_bt = 10**9
-        for i, p in enumerate(processes):
-            if not done[i] and p.arrival_time <= current_time and p.burst_time < min_bt:
-                min_bt = p.burst_time
-                idx = i
-
-        if idx == -1:
-            _add_segment(segments, -1, current_time, current_time + 1)
-            current_time += 1
-            continue
-
-        p = processes[idx]
-        _add_segment(segments, p.pid, current_time, current_time + p.burst_time)
-        p.waiting_time = current_time - p.arrival_time
-        current_time += p.burst_time
-        p.completion_time = current_time
-        p.turnaround_time = p.completion_time - p.arrival_time
-        done[idx] = True
-        completed += 1
-    return segments
-
-
-def simulate_srtf(processes: List[Process]) -> List[tuple]:
-    n = len(processes)
-    completed = 0
-    current_time = 0
-    segments: List[tuple] = []
-
-    while completed < n:
-        idx = -1
-        min_remaining = 10**9
-        for i, p in enumerate(processes):
-            if p.arrival_time <= current_time and p.remaining_time > 0:
-                if p.remaining_time < min_remaining:
-                    min_remaining = p.remaining_time
-                    idx = i
-
-        if idx == -1:
-            _add_segment(segments, -1, current_time, current_time + 1)
-            current_time += 1
-            continue
-
-        _add_segment(segments, processes[idx].pid, current_time, current_time + 1)
-        processes[idx].remaining_time -= 1
-        current_time += 1
-
-        if processes[idx].remaining_time == 0:
-            completed += 1
-            p = processes[idx]
-            p.completion_time = current_time
-            p.turnaround_time = p.completion_time - p.arrival_time
-            p.waiting_time = p.turnaround_time - p.burst_time
-    return segments
-
-
-def simulate_rr(processes: List[Process], quantum: int) -> List[tuple]:
-    n = len(processes)
-    rem = [p.burst_time for p in processes]
-    current_time = 0
-    completed = 0
-    i = 0
-    segments: List[tuple] = []
-
-    # processes assumed sorted by arrival time
-    queue: List[int] = []
-    while i < n and processes[i].arrival_time <= current_time:
-        queue.append(i)
-        i += 1
-
-    while completed < n:
+def _fcfs_timeline(pids: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Timeline:
+    # Vectorized equivalent of the Timeline.add calls the FCFS loop makes:
+    # back-to-back runs of the same pid merge into one segment, and an idle
+    # segment goes before every job that starts after the previous one ended.
+    n = len(pids)
+    if not n:
+        return Timeline()
+    prev_end = np.concatenate(([0], ends[:-1]))
+    idle = starts > prev_end
+    merged = np.zeros(n, dtype=bool)
+    merged[1:] = ~idle[1:] & (pids[1:] == pids[:-1])
+    if merged.any():
+        heads = np.flatnonzero(~merged)
+        tails = np.append(heads[1:] - 1, n - 1)
+        pids, starts, ends = pids[heads], starts[heads], ends[tails]
+        prev_end, idle = prev_end[heads], idle[heads]
+
+    slots = np.arange(len(pids)) + np.cumsum(idle)
+    size = len(pids) + int(np.count_nonzero(idle))
+    seg_pid = np.full(size, -1, dtype=np.int64)
+    seg_start = np.empty(size, dtype=np.int64)
+    seg_end = np.empty(size, dtype=np.int64)
+    seg_pid[slots] = pids
+    seg_start[slots] = starts
+    seg_end[slots] = ends
+    idle_slots = slots[idle] - 1
+    seg_start[idle_slots] = prev_end[idle]
+    seg_end[idle_slots] = starts[idle]
+    return Timeline.from_arrays(seg_pid, seg_start, seg_end)
+
+
+Remaining = Union[List[int], Dict[int, int]]
+
+
+class Policy(ABC):
+    # Scheduling decisions for simulate_policy. The engine owns the clock,
+    # the arrival cursor, the timeline and the per-job bookkeeping; a policy
+    # only keeps its ready queue(s) of job indices. `remaining` holds the
+    # engine's remaining times (a list by table row, or a dict by arrival
+    # number when streaming), shared so a policy can key on it.
+
+    # A policy that sets this implements queued/snapshot/restore, which let
+    # a run with a CheckpointLog (every GUI run) record checkpoints. Without
+    # them such a run records none and resuming it reruns from the start.
+    checkpointable = False
+
+    def bind(self, remaining: Remaining, stats: Optional[SimStats]) -> None:
+        # Called at the start of every run; drops any previous queue contents
+        self.remaining = remaining
+        self.stats = stats
+
+    @abstractmethod
+    def on_arrival(self, idx: int) -> None:
+        ...
+
+    @abstractmethod
+    def select_next(self, now: int, next_arrival: Optional[int]) -> Tuple[int, int]:
+        # Take a job off the ready queue and decide how long it runs. Only
+        # called while something is ready; next_arrival is None once every
+        # process has been admitted.
+        ...
+
+    @abstractmethod
+    def on_quantum_expiry(self, idx: int) -> None:
+        # The job from the last select_next ran out its time with work left.
+        # Arrivals up to the current time have already been admitted.
+        ...
+
+    def queued(self) -> Iterable[int]:
+        raise NotImplementedError
+
+    def snapshot(self) -> tuple:
+        raise NotImplementedError
+
+    def restore(self, state: tuple) -> None:
+        raise NotImplementedError
+
+    def closed_form(self, table: ProcessTable, order: Optional[np.ndarray]) -> Optional[Timeline]:
+        # Optional shortcut: fill in the result columns directly and return
+        # the timeline, or None to use the loop. Runs that take it record no
+        # checkpoints.
+        return None
+
+
+class FCFSPolicy(Policy):
+    checkpointable = True
+
+    def bind(self, remaining: Remaining, stats: Optional[SimStats]) -> None:
+        super().bind(remaining, stats)
+        self.queue: Deque[int] = deque()
+        # The bound method saves a call level on the hot path
+        self.on_arrival = self.queue.append
+
+    def on_arrival(self, idx: int) -> None:
+        self.queue.append(idx)
+
+    def select_next(self, now: int, next_arrival: Optional[int]) -> Tuple[int, int]:
+        idx = self.queue.popleft()
+        return idx, self.remaining[idx]
+
+    def on_quantum_expiry(self, idx: int) -> None:
+        # select_next runs every job to completion, so only a subclass that
+        # cuts runs short gets here; the job keeps its place at the front
+        self.queue.appendleft(idx)
+
+    def queued(self) -> Iterable[int]:
+        return self.queue
+
+    def snapshot(self) -> tuple:
+        return tuple(self.queue)
+
+    def restore(self, state: tuple) -> None:
+        self.queue.extend(state)
+
+    def closed_form(self, table: ProcessTable, order: Optional[np.ndarray]) -> Optional[Timeline]:
+        if order is None:
+            completion = _fcfs_completion(table.arrival, table.burst)
+            _record_completions(table, completion)
+            return _fcfs_timeline(table.pid, completion - table.burst, completion)
+        burst = table.burst[order]
+        completion = _fcfs_completion(table.arrival[order], burst)
+        scattered = np.empty_like(completion)
+        scattered[order] = completion
+        _record_completions(table, scattered)
+        return _fcfs_timeline(table.pid[order], completion - burst, completion)
+
+
+class SJFPolicy(Policy):
+    # Min-heap keyed on (burst, index), so ties go to the lower list index
+    # like the original linear scan did.
+    checkpointable = True
+
+    def bind(self, remaining: Remaining, stats: Optional[SimStats]) -> None:
+        super().bind(remaining, stats)
+        self.heap: List[Tuple[int, int]] = []
+
+    def on_arrival(self, idx: int) -> None:
+        heapq.heappush(self.heap, (self.remaining[idx], idx))
+
+    def select_next(self, now: int, next_arrival: Optional[int]) -> Tuple[int, int]:
+        rem, idx = heapq.heappop(self.heap)
+        return idx, rem
+
+    def on_quantum_expiry(self, idx: int) -> None:
+        # Back on the heap under its remaining time (SRTF cuts runs short)
+        heapq.heappush(self.heap, (self.remaining[idx], idx))
+
+    def queued(self) -> Iterable[int]:
+        return (idx for _, idx in self.heap)
+
+    def snapshot(self) -> tuple:
+        return tuple(self.heap)
+
+    def restore(self, state: tuple) -> None:
+        self.heap = list(state)
+
+
+class SRTFPolicy(SJFPolicy):
+    # Same heap keyed on remaining time. Between two events the running job
+    # stays the best choice (its remaining time only shrinks), so it runs
+    # straight to the next arrival or its completion.
+    def select_next(self, now: int, next_arrival: Optional[int]) -> Tuple[int, int]:
+        rem, idx = heapq.heappop(self.heap)
+        if next_arrival is not None and next_arrival < now + rem:
+            return idx, next_arrival - now
+        return idx, rem
+
+
+class RRPolicy(Policy):
+    checkpointable = True
+
+    def __init__(self, quantum: int) -> None:
+        self.quantum = quantum
+
+    def bind(self, remaining: Remaining, stats: Optional[SimStats]) -> None:
+        super().bind(remaining, stats)
+        self.queue: Deque[int] = deque()
+        # The bound method saves a call level on the hot path
+        self.on_arrival = self.on_quantum_expiry = self.queue.append
+
+    def on_arrival(self, idx: int) -> None:
+        self.queue.append(idx)
+
+    def on_quantum_expiry(self, idx: int) -> None:
+        self.queue.append(idx)
+
+    def select_next(self, now: int, next_arrival: Optional[int]) -> Tuple[int, int]:
+        queue = self.queue
+        idx = queue.popleft()
+        rem = self.remaining[idx]
+        if queue:
+            return idx, min(self.quantum, rem)
+        if next_arrival is not None:
+            # Alone in the system: run every slice up to the first quantum
+            # boundary at or after the next arrival in one step.
+            slices = -(-(next_arrival - now) // self.quantum)
+            return idx, min(slices * self.quantum, rem)
+        return idx, rem
+
+    def queued(self) -> Iterable[int]:
+        return self.queue
+
+    def snapshot(self) -> tuple:
+        return tuple(self.queue)
+
+    def restore(self, state: tuple) -> None:
+        self.queue.extend(state)
+
+
+class MLFQPolicy(Policy):
+    # N-level feedback queue. quanta[k] is the time slice of level k, 0 in
+    # the last place makes that level run jobs to completion; the default is
+    # (q1, q2, 0). A job that has used up the allotment of its level
+    # (accumulated CPU time, one quantum by default) moves down a level.
+    # With boost=S every queued job goes back to the top level at the first
+    # scheduling decision at or after each multiple of S. The lowest set bit
+    # of `mask` is the highest non-empty level.
+    checkpointable = True
+
+    def __init__(
+        self,
+        q1: int = 2,
+        q2: int = 4,
+        levels: Optional[Sequence[int]] = None,
+        boost: Optional[int] = None,
+        allotment: Optional[Sequence[int]] = None,
+    ) -> None:
+        quanta = tuple(levels) if levels else (q1, q2, 0)
+        if any(q < 0 for q in quanta) or 0 in quanta[:-1]:
+            raise ValueError("MLFQ quanta must be > 0 (only the last level may be 0)")
+        if boost is not None and boost <= 0:
+            raise ValueError("MLFQ boost period must be > 0")
+        self.quanta = tuple(q or None for q in quanta)
+        if allotment is None:
+            allotment = [q or 0 for q in quanta]
+        elif len(allotment) == 1:
+            allotment = list(allotment) * len(quanta)
+        if len(allotment) != len(quanta):
+            raise ValueError("MLFQ needs one allotment per level")
+        if any(a <= 0 for a in allotment[:-1]):
+            raise ValueError("MLFQ allotments must be > 0")
+        self.allotment = tuple(allotment)
+        self.boost = boost
+
+    def bind(self, remaining: Remaining, stats: Optional[SimStats]) -> None:
+        super().bind(remaining, stats)
+        self.levels: Tuple[Deque[int], ...] = tuple(deque() for _ in self.quanta)
+        self.mask = 0
+        # CPU time used at the current level, for queued jobs that have any
+        self.used: Dict[int, int] = {}
+        self.next_boost = self.boost
+        self.level = 0
+        self.level_used = 0
+        self.end = 0
+
+    def on_arrival(self, idx: int) -> None:
+        self.levels[0].append(idx)
+        self.mask |= 1
+
+    def select_next(self, now: int, next_arrival: Optional[int]) -> Tuple[int, int]:
+        if self.next_boost is not None and now >= self.next_boost:
+            self._boost(now)
+        mask = self.mask
+        level = (mask & -mask).bit_length() - 1
+        queue = self.levels[level]
+        idx = queue.popleft()
         if not queue:
-            next_time = max(current_time, processes[i].arrival_time)
-            _add_segment(segments, -1, current_time, next_time)
-            current_time = next_time
-            while i < n and processes[i].arrival_time <= current_time:
-                queue.append(i)
-                i += 1
-            continue
-
-        idx = queue.pop(0)
-        run = min(quantum, rem[idx])
-        _add_segment(segments, processes[idx].pid, current_time, current_time + run)
-        rem[idx] -= run
-        current_time += run
-
-        while i < n and processes[i].arrival_time <= current_time:
-            queue.append(i)
-            i += 1
-
-        if rem[idx] > 0:
-            queue.append(idx)
+            mask ^= 1 << level
+            self.mask = mask
+        alone = not mask
+        last = len(self.quanta) - 1
+        horizon = next_arrival
+        if self.next_boost is not None and (horizon is None or self.next_boost < horizon):
+            horizon = self.next_boost
+        left = self.remaining[idx]
+        used = self.used.pop(idx, 0)
+        run = 0
+        while True:
+            quantum = self.quanta[level]
+            if quantum is None:
+                run += left
+                break
+            if alone:
+                # Nobody else is ready, so take every slice at this level up to
+                # the next arrival or boost, or until the job is demoted.
+                slices = -(-left // quantum)
+                if level < last:
+                    slices = min(slices, -(-(self.allotment[level] - used) // quantum))
+                if horizon is not None:
+                    slices = min(slices, -(-(horizon - now - run) // quantum))
+                step = min(slices * quantum, left)
+            else:
+                step = min(quantum, left)
+            left -= step
+            run += step
+            if left == 0:
+                break
+            used += step
+            if level < last and used >= self.allotment[level]:
+                if self.stats is not None:
+                    self.stats.demote(level)
+                level += 1
+                used = 0
+            # A lone job keeps sinking through the levels until it finishes or
+            # the next arrival or boost would get to change the picture.
+            if not alone or (horizon is not None and horizon <= now + run):
+                break
+        self.level = level
+        self.level_used = used
+        self.end = now + run
+        return idx, run
+
+    def on_quantum_expiry(self, idx: int) -> None:
+        if self.next_boost is not None and self.end >= self.next_boost:
+            self._boost(self.end)
+            level, used = 0, 0
         else:
-            completed += 1
-            p = processes[idx]
-            p.completion_time = current_time
-            p.turnaround_time = p.completion_time - p.arrival_time
-            p.waiting_time = p.turnaround_time - p.burst_time
-    return segments
-
-
-def simulate_mlfq(processes: List[Process], q1: int = 2, q2: int = 4) -> List[tuple]:
-    n = len(processes)
-    remaining = [p.burst_time for p in processes]
-    current_time = 0
-    completed = 0
-    i = 0
-    segments: List[tuple] = []
-
-    q1_queue: List[int] = []
-    q2_queue: List[int] = []
-    q3_queue: List[int] = []
-
-    def add_arrivals() -> None:
-        nonlocal i
-        while i < n and processes[i].arrival_time <= current_time:
-            q1_queue.append(i)
+            level, used = self.level, self.level_used
+        self.levels[level].append(idx)
+        self.mask |= 1 << level
+        if used:
+            self.used[idx] = used
+
+    def _boost(self, now: int) -> None:
+        top = self.levels[0]
+        for queue in self.levels[1:]:
+            top.extend(queue)
+            queue.clear()
+        self.mask = 1 if top else 0
+        self.used.clear()
+        self.next_boost = (now // self.boost + 1) * self.boost
+
+    def queued(self) -> Iterable[int]:
+        return (idx for queue in self.levels for idx in queue)
+
+    def snapshot(self) -> tuple:
+        return tuple(tuple(queue) for queue in self.levels), tuple(self.used.items()), self.next_boost
+
+    def restore(self, state: tuple) -> None:
+        levels, used, self.next_boost = state
+        for level, (queue, queued) in enumerate(zip(self.levels, levels)):
+            queue.extend(queued)
+            if queue:
+                self.mask |= 1 << level
+        self.used.update(used)
+
+
+class PolicyLoop:
+    # The event loop behind simulate_policy and the streaming simulators: the
+    # clock jumps from one scheduling decision to the next, idle gaps are
+    # skipped in one step and arrivals come off a cursor. Jobs are indices
+    # into the per-job containers (lists by table row, or dicts by arrival
+    # number when streaming); rows[i] is the job of the i-th arrival and
+    # arrival[i] its time. The first `count` arrivals are loaded, and
+    # arrival[count] is the time of the next one or None if there is none.
+    # Once every loaded arrival is admitted, `load` is called to load more
+    # and returns the new count. run() returns when every job has finished
+    # or after `pause` steps, and carries on from there when called again.
+    def __init__(
+        self,
+        policy: Policy,
+        rows: Sequence[int],
+        arrival: Union[List[Optional[int]], Dict[int, Optional[int]]],
+        pids: Remaining,
+        burst: Remaining,
+        remaining: Remaining,
+        completion: Remaining,
+        first_run: Remaining,
+        count: int,
+        segments: Optional[Timeline] = None,
+        stats: Optional[SimStats] = None,
+        load: Optional[Callable[[], int]] = None,
+    ) -> None:
+        self.policy = policy
+        self.rows = rows
+        self.arrival = arrival
+        self.pids = pids
+        self.burst = burst
+        self.remaining = remaining
+        self.completion = completion
+        self.first_run = first_run
+        self.count = count
+        self.segments = segments if segments is not None else Timeline()
+        self.stats = stats
+        self.load = load
+        self.time = 0
+        self.cursor = 0
+        self.completed = 0
+        # The job last put back by on_quantum_expiry, tracked with stats only
+        self.requeued = -1
+        policy.bind(remaining, stats)
+
+    def run(self, log: Optional[CheckpointLog] = None, progress: Optional[Progress] = None, pause: int = 0) -> None:
+        policy = self.policy
+        on_arrival = policy.on_arrival
+        select_next = policy.select_next
+        on_quantum_expiry = policy.on_quantum_expiry
+        rows, arrival, pids, burst = self.rows, self.arrival, self.pids, self.burst
+        remaining, completion, first_run = self.remaining, self.completion, self.first_run
+        segments = self.segments
+        seg_pids, seg_starts, seg_ends = segments._pids, segments._starts, segments._ends
+        stats = self.stats
+        current_time, i, completed, requeued = self.time, self.cursor, self.completed, self.requeued
+        load = self.load
+        n = self.count
+        # The cursor position at which more arrivals have to be loaded
+        refill = -1 if arrival[n] is None else n
+        while i < n and arrival[i] <= current_time:
+            on_arrival(rows[i])
             i += 1
+        while i == refill:
+            n = load()
+            refill = -1 if arrival[n] is None else n
+            while i < n and arrival[i] <= current_time:
+                on_arrival(rows[i])
+                i += 1
 
-    add_arrivals()
-
-    while completed < n:
-        if not (q1_queue or q2_queue or q3_queue):
-            next_time = max(current_time, processes[i].arrival_time)
-            _add_segment(segments, -1, current_time, next_time)
-            current_time = next_time
-            add_arrivals()
-            continue
+        # Checkpoints, progress reports and pauses are due every `every`
+        # steps. A local countdown keeps that to one decrement per step; it
+        # starts at -1 (and never reaches 0) when there are none, and one
+        # higher otherwise so that every call makes at least one step. A
+        # checkpoint of q queued jobs is followed by the next one no sooner
+        # than q steps later.
+        hooks = [hook.every for hook in (log, progress) if hook is not None]
+        if pause:
+            hooks.append(pause)
+        every = min(hooks) if hooks else 0
+        countdown = every + 1 if every else -1
+        wait = log.every if log is not None else 0
+
+        # This loop is the hot path of every policy, so segments are merged
+        # inline the way Timeline.add does it.
+        while completed < n:
+            countdown -= 1
+            if not countdown:
+                countdown = every
+                if log is not None:
+                    wait -= every
+                    if wait <= 0:
+                        queued_rem = tuple((idx, remaining[idx]) for idx in policy.queued())
+                        log.record(current_time, i, segments, (policy.snapshot(), queued_rem))
+                        wait = max(log.every, len(queued_rem))
+                if progress is not None:
+                    progress.tick(completed, current_time)
+                if pause:
+                    break
+            if completed == i:
+                # Nothing ready: skip the whole idle gap in one step
+                seg_pids.append(-1)
+                seg_starts.append(current_time)
+                current_time = arrival[i]
+                seg_ends.append(current_time)
+                while i < n and arrival[i] <= current_time:
+                    on_arrival(rows[i])
+                    i += 1
+                while i == refill:
+                    n = load()
+                    refill = -1 if arrival[n] is None else n
+                    while i < n and arrival[i] <= current_time:
+                        on_arrival(rows[i])
+                        i += 1
+                continue
 
-        if q1_queue:
-            idx = q1_queue.pop(0)
-            run = min(q1, remaining[idx])
-            _add_segment(segments, processes[idx].pid, current_time, current_time + run)
-            remaining[idx] -= run
-            current_time += run
-            add_arrivals()
-            if remaining[idx] > 0:
-                q2_queue.append(idx)
+            idx, run = select_next(current_time, arrival[i])
+            left = remaining[idx]
+            if left == burst[idx]:
+                first_run[idx] = current_time
+            pid = pids[idx]
+            if seg_ends and seg_ends[-1] == current_time and seg_pids[-1] == pid:
+                if idx == requeued and stats is not None:
+                    # Requeued and picked again straight away: it kept the CPU
+                    stats.preemptions -= 1
+                current_time += run
+                seg_ends[-1] = current_time
             else:
-                completed += 1
-                p = processes[idx]
-                p.completion_time = current_time
-                p.turnaround_time = p.completion_time - p.arrival_time
-                p.waiting_time = p.turnaround_time - p.burst_time
-            continue
+                seg_pids.append(pid)
+                seg_starts.append(current_time)
+                current_time += run
+                seg_ends.append(current_time)
 
-        if q2_queue:
-            idx = q2_queue.pop(0)
-            run = min(q2, remaining[idx])
-            _add_segment(segments, processes[idx].pid, current_time, current_time + run)
-            remaining[idx] -= run
-            current_time += run
-            add_arrivals()
-            if remaining[idx] > 0:
-                q3_queue.append(idx)
+            while i < n and arrival[i] <= current_time:
+                on_arrival(rows[i])
+                i += 1
+            while i == refill:
+                n = load()
+                refill = -1 if arrival[n] is None else n
+                while i < n and arrival[i] <= current_time:
+                    on_arrival(rows[i])
+                    i += 1
+
+            if run < left:
+                remaining[idx] = left - run
+                on_quantum_expiry(idx)
+                if stats is not None:
+                    stats.preemptions += 1
+                    requeued = idx
             else:
+                requeued = -1
+                remaining[idx] = 0
                 completed += 1
-                p = processes[idx]
-                p.completion_time = current_time
-                p.turnaround_time = p.completion_time - p.arrival_time
-                p.waiting_time = p.turnaround_time - p.burst_time
-            continue
-
-        if q3_queue:
-            idx = q3_queue.pop(0)
-            run = remaining[idx]
-            _add_segment(segments, processes[idx].pid, current_time, current_time + run)
-            remaining[idx] = 0
-            current_time += run
-            add_arrivals()
-            completed += 1
-            p = processes[idx]
-            p.completion_time = current_time
-            p.turnaround_time = p.completion_time - p.arrival_time
-            p.waiting_time = p.turnaround_time - p.burst_time
+                completion[idx] = current_time
+        self.time, self.cursor, self.completed, self.requeued = current_time, i, completed, requeued
+        self.count = n
+
+
+@_accepts_process_list
+def simulate_policy(
+    table: ProcessTable,
+    policy: Policy,
+    log: Optional[CheckpointLog] = None,
+    progress: Optional[Progress] = None,
+    stats: Optional[SimStats] = None,
+) -> Timeline:
+    # Runs a policy over a whole table in one PolicyLoop. Checkpoints store
+    # the policy's queues plus the remaining time of every queued job.
+    n = len(table)
+    order = None if table.arrival_sorted else np.argsort(table.arrival, kind="stable")
+    segments = policy.closed_form(table, order)
+    if segments is not None:
+        # Cheaper to redo than to resume, so it records no checkpoints
+        if log is not None:
+            log.discard()
+        table.remaining[:] = 0
+        if progress is not None:
+            progress.start(n)
+            progress.finish()
+        if stats is not None:
+            stats.record_run(segments, n, n)
+        return segments
+    if log is not None and not policy.checkpointable:
+        log.discard()
+        log = None
+
+    pids = table.pid.tolist()
+    burst = table.burst.tolist()
+    if order is None:
+        rows: Sequence[int] = range(n)
+        arrival: List[Optional[int]] = table.arrival.tolist()
+    else:
+        rows = order.tolist()
+        arrival = table.arrival[order].tolist()
+    arrival.append(None)
+    remaining = list(burst)
+
+    segments, resume = log.begin() if log is not None else (Timeline(), None)
+    if resume is None:
+        loop = PolicyLoop(policy, rows, arrival, pids, burst, remaining, [0] * n, [0] * n, n, segments, stats)
+    else:
+        completion = table.completion.tolist()
+        first_run = (table.arrival + table.response).tolist()
+        loop = PolicyLoop(policy, rows, arrival, pids, burst, remaining, completion, first_run, n, segments, stats)
+        i = resume.cursor
+        for pos in range(i):
+            remaining[rows[pos]] = 0
+        state, queued_rem = resume.state
+        for idx, left in queued_rem:
+            remaining[idx] = left
+        policy.restore(state)
+        loop.time, loop.cursor, loop.completed = resume.time, i, i - len(queued_rem)
+    first_cursor, first_completed = loop.cursor, loop.completed
+
+    if progress is not None:
+        progress.start(n)
+    loop.run(log, progress)
+    table.remaining[:] = remaining
+    if progress is not None:
+        progress.finish()
+    _record_completions(table, loop.completion, loop.first_run)
+    if stats is not None:
+        stats.record_run(segments, loop.cursor - first_cursor, loop.completed - first_completed)
     return segments
 
 
-def print_processes(processes: List[Process]) -> None:
-    if not processes:
+def simulate_fcfs(
+    processes: Processes,
+    log: Optional[CheckpointLog] = None,
+    progress: Optional[Progress] = None,
+    stats: Optional[SimStats] = None,
+) -> Timeline:
+    return simulate_policy(processes, FCFSPolicy(), log=log, progress=progress, stats=stats)
+
+
+def simulate_sjf(
+    processes: Processes,
+    log: Optional[CheckpointLog] = None,
+    progress: Optional[Progress] = None,
+    stats: Optional[SimStats] = None,
+) -> Timeline:
+    return simulate_policy(processes, SJFPolicy(), log=log, progress=progress, stats=stats)
+
+
+def simulate_srtf(
+    processes: Processes,
+    log: Optional[CheckpointLog] = None,
+    progress: Optional[Progress] = None,
+    stats: Optional[SimStats] = None,
+) -> Timeline:
+    return simulate_policy(processes, SRTFPolicy(), log=log, progress=progress, stats=stats)
+
+
+def simulate_rr(
+    processes: Processes,
+    quantum: int,
+    log: Optional[CheckpointLog] = None,
+    progress: Optional[Progress] = None,
+    stats: Optional[SimStats] = None,
+) -> Timeline:
+    return simulate_policy(processes, RRPolicy(quantum), log=log, progress=progress, stats=stats)
+
+
+def simulate_mlfq(
+    processes: Processes,
+    q1: int = 2,
+    q2: int = 4,
+    log: Optional[CheckpointLog] = None,
+    progress: Optional[Progress] = None,
+    stats: Optional[SimStats] = None,
+) -> Timeline:
+    return simulate_policy(processes, MLFQPolicy(q1, q2), log=log, progress=progress, stats=stats)
+
+
+def print_processes(processes: Processes) -> None:
+    if not len(processes):
         print("No processes loaded.")
         return
+    table = as_table(processes)
     print("ID\tAT\tBT")
-    for p in processes:
-        print(f"{p.pid}\t{p.arrival_time}\t{p.burst_time}")
+    for pid, at, bt in zip(table.pid.tolist(), table.arrival.tolist(), table.burst.tolist()):
+        print(f"{pid}\t{at}\t{bt}")
 
 
-def print_results(processes: List[Process]) -> None:
-    if not processes:
+@dataclass
+class Summary:
+    count: int
+    total_burst: int
+    total_waiting: int
+    total_turnaround: int
+    makespan: int
+
+    @property
+    def avg_waiting(self) -> float:
+        return self.total_waiting / self.count if self.count else 0.0
+
+    @property
+    def avg_turnaround(self) -> float:
+        return self.total_turnaround / self.count if self.count else 0.0
+
+
+def summarize(table: ProcessTable) -> Summary:
+    # Totals as int64 column reductions, so they stay exact for any table size
+    if not len(table):
+        return Summary(0, 0, 0, 0, 0)
+    return Summary(
+        count=len(table),
+        total_burst=int(table.burst.sum()),
+        total_waiting=int(table.waiting.sum()),
+        total_turnaround=int(table.turnaround.sum()),
+        makespan=int(table.completion.max()),
+    )
+
+
+def print_results(processes: Processes) -> None:
+    if not len(processes):
         print("No processes to display.")
         return
-    total_wt = 0
-    total_tat = 0
+    table = as_table(processes)
     print("Process\tAT\tBT\tCT\tTAT\tWT")
-    for p in processes:
-        total_wt += p.waiting_time
-        total_tat += p.turnaround_time
-        print(
-            f"{p.pid}\t{p.arrival_time}\t{p.burst_time}\t"
-            f"{p.completion_time}\t{p.turnaround_time}\t{p.waiting_time}"
+    rows = zip(
+        table.pid.tolist(),
+        table.arrival.tolist(),
+        table.burst.tolist(),
+        table.completion.tolist(),
+        table.turnaround.tolist(),
+        table.waiting.tolist(),
+    )
+    for pid, at, bt, ct, tat, wt in rows:
+        print(f"{pid}\t{at}\t{bt}\t{ct}\t{tat}\t{wt}")
+    summary = summarize(table)
+    print(f"\nAverage Waiting Time: {summary.avg_waiting:.2f}")
+    print(f"Average Turnaround Time: {summary.avg_turnaround:.2f}")
+
+
+def count_context_switches(segments: Timeline) -> int:
+    # A switch is the CPU starting a different process than the last one it
+    # ran; idle gaps in between do not count on their own.
+    pids = segments.arrays()[0]
+    running = pids[pids != -1]
+    return int(np.count_nonzero(running[1:] != running[:-1]))
+
+
+def print_gantt(segments: Timeline) -> None:
+    print("Process\tStart\tEnd")
+    for pid, start, end in segments:
+        label = f"P{pid}" if pid != -1 else "IDLE"
+        print(f"{label}\t{start}\t{end}")
+
+
+def _result_rows(table: ProcessTable) -> Iterator[Tuple[int, ...]]:
+    return zip(
+        table.pid.tolist(),
+        table.arrival.tolist(),
+        table.burst.tolist(),
+        table.completion.tolist(),
+        table.turnaround.tolist(),
+        table.waiting.tolist(),
+        table.response.tolist(),
+    )
+
+
+def write_results_csv(table: ProcessTable, out: TextIO) -> None:
+    writer = csv.writer(out)
+    writer.writerow(["pid", "arrival", "burst", "completion", "turnaround", "waiting", "response"])
+    writer.writerows(_result_rows(table))
+
+
+def results_to_json(table: ProcessTable, segments: Timeline, title: str) -> Dict[str, object]:
+    from metrics import tail_stats
+
+    keys = ("pid", "arrival", "burst", "completion", "turnaround", "waiting", "response")
+    summary = summarize(table)
+    return {
+        "algorithm": title,
+        "average_waiting_time": summary.avg_waiting,
+        "average_turnaround_time": summary.avg_turnaround,
+        "total_waiting_time": summary.total_waiting,
+        "total_turnaround_time": summary.total_turnaround,
+        "makespan": summary.makespan,
+        "tail": tail_stats(table).to_dict() if len(table) else None,
+        "processes": [dict(zip(keys, row)) for row in _result_rows(table)],
+        "segments": [list(seg) for seg in segments],
+    }
+
+
+@dataclass
+class PolicyInfo:
+    # One entry of the policy registry. params lists the (keyword, label)
+    # pairs of the quantum settings the factory always takes, options those
+    # of optional settings that are left out while None. The labels name them
+    # in titles and GUI messages.
+    name: str
+    factory: Callable[..., Policy]
+    params: Tuple[Tuple[str, str], ...] = ()
+    description: str = ""
+    options: Tuple[Tuple[str, str], ...] = ()
+
+    def settings(self, **settings: object) -> List[Tuple[str, str, object]]:
+        # (keyword, label, value) of every setting this run actually uses
+        used = [(key, label, settings[key]) for key, label in self.params]
+        used += [(key, label, settings[key]) for key, label in self.options if settings.get(key) is not None]
+        return used
+
+    def create(self, **settings: object) -> Policy:
+        return self.factory(**{key: value for key, _, value in self.settings(**settings)})
+
+    def title(self, **settings: object) -> str:
+        used = self.settings(**settings)
+        if not used:
+            return self.name
+        values = ", ".join(f"{label}={_format_setting(value)}" for _, label, value in used)
+        return f"{self.name} ({values})"
+
+
+class MLFQInfo(PolicyInfo):
+    # An explicit level list replaces Q1/Q2
+    def settings(self, **settings: object) -> List[Tuple[str, str, object]]:
+        used = super().settings(**settings)
+        if settings.get("levels") is not None:
+            used = [item for item in used if item[0] not in ("q1", "q2")]
+        return used
+
+
+def _format_setting(value: object) -> str:
+    if isinstance(value, (tuple, list)):
+        return ",".join(str(v) for v in value)
+    return str(value)
+
+
+POLICIES: Dict[str, PolicyInfo] = {}
+
+
+def register_policy(info: PolicyInfo) -> PolicyInfo:
+    POLICIES[info.name.upper()] = info
+    return info
+
+
+def get_policy(algorithm: str) -> PolicyInfo:
+    info = POLICIES.get(algorithm.upper())
+    if info is None:
+        raise ValueError(f"unknown algorithm: {algorithm}")
+    return info
+
+
+register_policy(PolicyInfo("FCFS", FCFSPolicy, description="First come, first served"))
+register_policy(PolicyInfo("SJF", SJFPolicy, description="Shortest job first (non-preemptive)"))
+register_policy(PolicyInfo("SRTF", SRTFPolicy, description="Shortest remaining time first"))
+register_policy(PolicyInfo("RR", RRPolicy, (("quantum", "Q"),), "Round robin"))
+register_policy(
+    MLFQInfo(
+        "MLFQ",
+        MLFQPolicy,
+        (("q1", "Q1"), ("q2", "Q2")),
+        "Multilevel feedback queue",
+        (("levels", "Levels"), ("boost", "Boost"), ("allotment", "Allotment")),
+    )
+)
+
+# The built-in policies; the CLI and GUI list POLICIES, which may have more
+ALGORITHMS = tuple(POLICIES)
+
+
+def run_algorithm(
+    table: ProcessTable,
+    algorithm: str,
+    quantum: int = 2,
+    q1: int = 2,
+    q2: int = 4,
+    log: Optional[CheckpointLog] = None,
+    progress: Optional[Progress] = None,
+    stats: Optional[SimStats] = None,
+    **options: object,
+) -> Timeline:
+    # options: settings only some policies take, e.g. MLFQ levels and boost
+    policy = get_policy(algorithm).create(quantum=quantum, q1=q1, q2=q2, **options)
+    return simulate_policy(table, policy, log=log, progress=progress, stats=stats)
+
+
+class IncrementalRun:
+    # Keeps the checkpoints of the last run of one algorithm on one table so
+    # that late-arriving processes only cost a re-simulation of the suffix
+    # after their arrival time.
+    def __init__(
+        self,
+        table: ProcessTable,
+        algorithm: str,
+        quantum: int = 2,
+        q1: int = 2,
+        q2: int = 4,
+        checkpoint_every: int = 256,
+        **options: object,
+    ) -> None:
+        self.table = table
+        self.algorithm = algorithm.upper()
+        self.params = (quantum, q1, q2)
+        self.options = options
+        self.log = CheckpointLog(checkpoint_every)
+        self.timeline: Optional[Timeline] = None
+        self._dirty_from: Optional[int] = None
+
+    def matches(
+        self, table: ProcessTable, algorithm: str, quantum: int = 2, q1: int = 2, q2: int = 4, **options: object
+    ) -> bool:
+        return (
+            table is self.table
+            and algorithm.upper() == self.algorithm
+            and (quantum, q1, q2) == self.params
+            and options == self.options
         )
-    avg_wt = total_wt / len(processes)
-    avg_tat = total_tat / len(processes)
-    print(f"\nAverage Waiting Time: {avg_wt:.2f}")
-    print(f"Average Turnaround Time: {avg_tat:.2f}")
 
+    # A cancelled run leaves the checkpoints and the table half-written, so
+    # callers should drop the IncrementalRun after SimulationCancelled.
+    def run(self, progress: Optional[Progress] = None, stats: Optional[SimStats] = None) -> Timeline:
+        with timed(stats, "sort"):
+            self.table.sort_by_arrival()
+        reset_stats(self.table)
+        self.log.resume_from = None
+        self.timeline = self._simulate(progress, stats)
+        self._dirty_from = None
+        return self.timeline
+
+    def insert(self, pid: int, arrival_time: int, burst_time: int) -> None:
+        self.table.insert_sorted(pid, arrival_time, burst_time)
+        if self._dirty_from is None or arrival_time < self._dirty_from:
+            self._dirty_from = arrival_time
+
+    def resume(self, progress: Optional[Progress] = None, stats: Optional[SimStats] = None) -> Timeline:
+        if self.timeline is None:
+            return self.run(progress, stats)
+        if self._dirty_from is None:
+            if stats is not None:
+                stats.record_uncounted(self.timeline)
+            return self.timeline
+        if self.log.rewind(self._dirty_from) is None:
+            return self.run(progress, stats)
+        self.timeline = self._simulate(progress, stats)
+        self._dirty_from = None
+        return self.timeline
+
+    def _simulate(self, progress: Optional[Progress] = None, stats: Optional[SimStats] = None) -> Timeline:
+        quantum, q1, q2 = self.params
+        with timed(stats, "simulate"):
+            return run_algorithm(
+                self.table,
+                self.algorithm,
+                quantum,
+                q1,
+                q2,
+                log=self.log,
+                progress=progress,
+                stats=stats,
+                **self.options,
+            )
 
-class SchedulerApp(tk.Tk):
-    def __init__(self) -> None:
-        super().__init__()
-        self.title("CPU Scheduling Simulator")
-        self.geometry("900x600")
-        self.minsize(900, 600)
 
-        self.processes: List[Process] = []
+def algorithm_title(algorithm: str, quantum: int = 2, q1: int = 2, q2: int = 4, **options: object) -> str:
+    return get_policy(algorithm).title(quantum=quantum, q1=q1, q2=q2, **options)
 
-        self._build_ui()
-        self._try_load_default()
 
-    def _build_ui(self) -> None:
-        header = tk.Label(self, text="CPU Scheduling Simulator", font=("Arial", 18, "bold"))
-        header.pack(pady=10)
-
-        container = tk.Frame(self)
-        container.pack(fill=tk.BOTH, expand=True, padx=12, pady=8)
-
-        left = tk.Frame(container)
-        left.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
-
-        right = tk.Frame(container)
-        right.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-
-        # Input section
-        input_box = tk.LabelFrame(left, text="Add Process", padx=8, pady=8)
-        input_box.pack(fill=tk.X)
-
-        tk.Label(input_box, text="ID").grid(row=0, column=0, sticky="w")
-        tk.Label(input_box, text="Arrival Time").grid(row=0, column=1, sticky="w")
-        tk.Label(input_box, text="Burst Time").grid(row=0, column=2, sticky="w")
-
-        self.id_entry = tk.Entry(input_box, width=10)
-        self.at_entry = tk.Entry(input_box, width=12)
-        self.bt_entry = tk.Entry(input_box, width=12)
-        self.id_entry.grid(row=1, column=0, padx=5, pady=4)
-        self.at_entry.grid(row=1, column=1, padx=5, pady=4)
-        self.bt_entry.grid(row=1, column=2, padx=5, pady=4)
-
-        add_btn = tk.Button(input_box, text="Add", command=self.add_process)
-        add_btn.grid(row=1, column=3, padx=6)
-
-        # Actions
-        action_box = tk.LabelFrame(left, text="Actions", padx=8, pady=8)
-        action_box.pack(fill=tk.X, pady=10)
-
-        tk.Button(action_box, text="Load From File", command=self.load_from_file).grid(row=0, column=0, padx=5, pady=4)
-        tk.Button(action_box, text="Clear All", command=self.clear_processes).grid(row=0, column=1, padx=5, pady=4)
-        tk.Button(action_box, text="Run Selected", command=self.run_selected).grid(row=0, column=2, padx=5, pady=4)
-
-        # Algorithm controls
-        algo_box = tk.LabelFrame(left, text="Algorithm", padx=8, pady=8)
-        algo_box.pack(fill=tk.X, pady=6)
-
-        self.algorithm_var = tk.StringVar(value="FCFS")
-        algo_options = ["FCFS", "SJF", "SRTF", "RR", "MLFQ"]
-        self.algorithm_menu = tk.OptionMenu(algo_box, self.algorithm_var, *algo_options)
-        self.algorithm_menu.grid(row=0, column=0, padx=5, pady=4, sticky="w")
-
-        tk.Label(algo_box, text="RR Quantum").grid(row=0, column=1, padx=5, sticky="e")
-        self.rr_quantum_entry = tk.Entry(algo_box, width=6)
-        self.rr_quantum_entry.insert(0, "2")
-        self.rr_quantum_entry.grid(row=0, column=2, padx=5)
-
-        tk.Label(algo_box, text="MLFQ Q1").grid(row=1, column=1, padx=5, sticky="e")
-        self.mlfq_q1_entry = tk.Entry(algo_box, width=6)
-        self.mlfq_q1_entry.insert(0, "2")
-        self.mlfq_q1_entry.grid(row=1, column=2, padx=5)
-
-        tk.Label(algo_box, text="MLFQ Q2").grid(row=1, column=3, padx=5, sticky="e")
-        self.mlfq_q2_entry = tk.Entry(algo_box, width=6)
-        self.mlfq_q2_entry.insert(0, "4")
-        self.mlfq_q2_entry.grid(row=1, column=4, padx=5)
-
-        # Process list
-        list_box = tk.LabelFrame(left, text="Current Processes", padx=8, pady=8)
-        list_box.pack(fill=tk.BOTH, expand=True)
-
-        self.process_list = tk.Text(list_box, height=10, wrap="none")
-        self.process_list.pack(fill=tk.BOTH, expand=True)
-
-        # Results
-        results_box = tk.LabelFrame(right, text="Results", padx=8, pady=8)
-        results_box.pack(fill=tk.BOTH, expand=True)
-
-        self.results_text = tk.Text(results_box, height=20, wrap="none")
-        self.results_text.pack(fill=tk.BOTH, expand=True)
-
-        # Gantt Chart
-        gantt_box = tk.LabelFrame(right, text="Gantt Chart", padx=8, pady=8)
-        gantt_box.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
-
-        self.gantt_canvas = tk.Canvas(gantt_box, height=120, bg="white")
-        self.gantt_canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-        self.gantt_scroll = tk.Scrollbar(gantt_box, orient=tk.HORIZONTAL, command=self.gantt_canvas.xview)
-        self.gantt_scroll.pack(side=tk.BOTTOM, fill=tk.X)
-        self.gantt_canvas.configure(xscrollcommand=self.gantt_scroll.set)
-
-        footer = tk.Label(self, text="Input format: ID ArrivalTime BurstTime", fg="#666")
-        footer.pack(pady=6)
-
-    def _try_load_default(self) -> None:
-        default_file = "processes.txt"
-        loaded = load_processes_from_file(default_file)
-        if loaded:
-            self.processes = loaded
-            self._refresh_process_list()
-
-    def _refresh_process_list(self) -> None:
-        self.process_list.delete("1.0", tk.END)
-        if not self.processes:
-            self.process_list.insert(tk.END, "No processes loaded.\n")
-            return
-        self.process_list.insert(tk.END, "ID\tAT\tBT\n")
-        for p in self.processes:
-            self.process_list.insert(tk.END, f"{p.pid}\t{p.arrival_time}\t{p.burst_time}\n")
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError("must be > 0")
+    return value
 
-    def _set_results(self, text: str) -> None:
-        self.results_text.delete("1.0", tk.END)
-        self.results_text.insert(tk.END, text)
 
-    def _draw_gantt(self, segments: List[tuple]) -> None:
-        self.gantt_canvas.delete("all")
-        if not segments:
-            return
+def _int_list(text: str) -> Tuple[int, ...]:
+    try:
+        values = tuple(int(part) for part in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected comma-separated integers") from None
+    if any(value < 0 for value in values):
+        raise argparse.ArgumentTypeError("values must be >= 0")
+    return values
+
+
+def _add_policy_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-q", "--quantum", type=_positive_int, default=2, help="RR quantum")
+    parser.add_argument("--q1", type=_positive_int, default=2, help="MLFQ queue 1 quantum")
+    parser.add_argument("--q2", type=_positive_int, default=4, help="MLFQ queue 2 quantum")
+    parser.add_argument(
+        "--levels", type=_int_list, help="MLFQ quantum per level, e.g. 2,4,8,0 (0 = run to completion); replaces Q1/Q2"
+    )
+    parser.add_argument("--boost", type=_positive_int, help="MLFQ: move every job to the top level each BOOST units")
+    parser.add_argument(
+        "--allotment", type=_int_list, help="MLFQ CPU time per level before demotion (one value or one per level)"
+    )
+
+
+def _add_export_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--trace-json", metavar="PATH", help="write the timeline as Chrome-trace/Perfetto JSON")
+    parser.add_argument("--gantt-png", metavar="PATH", help="write the Gantt chart as a PNG image")
+    parser.add_argument("--png-width", type=_positive_int, default=1600, help="width of the PNG in pixels")
+
+
+def _policy_options(args: argparse.Namespace) -> Optional[Dict[str, object]]:
+    # The optional policy settings given on the command line, checked by
+    # building the policy once; None after printing the error.
+    options = {key: getattr(args, key) for key in ("levels", "boost", "allotment") if getattr(args, key) is not None}
+    try:
+        get_policy(args.algorithm).create(quantum=args.quantum, q1=args.q1, q2=args.q2, **options)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return None
+    return options
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="CPU scheduling simulator. Starts the GUI when no command is given."
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    sub.add_parser("gui", help="start the Tkinter GUI")
+
+    run = sub.add_parser("run", help="simulate a process file without a display")
+    run.add_argument("trace", help="text process file or binary trace")
+    run.add_argument("-a", "--algorithm", type=str.upper, choices=tuple(POLICIES), default="FCFS")
+    _add_policy_options(run)
+    run.add_argument("-f", "--format", choices=("text", "csv", "json"), default="text")
+    run.add_argument("--no-gantt", action="store_true", help="omit the Gantt segments from text output")
+    run.add_argument("--cache-dir", help="reuse results cached in this directory")
+    run.add_argument(
+        "-j", "--workers", type=_positive_int, default=None, help="simulate busy periods in parallel processes"
+    )
+    run.add_argument("--stats-json", metavar="PATH", help="write scheduler counters and phase timings to PATH")
+    _add_export_options(run)
+
+    sweep = sub.add_parser("sweep", help="run RR or MLFQ over a range of quanta in parallel")
+    sweep.add_argument("trace", help="text process file or binary trace")
+    sweep.add_argument("-a", "--algorithm", type=str.upper, choices=("RR", "MLFQ"), default="RR")
+    sweep.add_argument("-q", "--quantum", default="1:10", help="RR quanta, e.g. 1:10, 2:32:2 or 1,2,4,8")
+    sweep.add_argument("--q1", default="1:4", help="MLFQ queue 1 quanta")
+    sweep.add_argument("--q2", default="2:8:2", help="MLFQ queue 2 quanta")
+    sweep.add_argument("-j", "--workers", type=_positive_int, default=None, help="worker processes")
+    sweep.add_argument("-f", "--format", choices=("text", "csv", "json"), default="text")
+
+    stream = sub.add_parser("stream", help="simulate a trace of any length in bounded memory")
+    stream.add_argument("trace", help="arrival-ordered text process file or sorted binary trace")
+    stream.add_argument("-a", "--algorithm", type=str.upper, choices=tuple(POLICIES), default="FCFS")
+    _add_policy_options(stream)
+    stream.add_argument("--rows", action="store_true", help="print each finished process as a CSV row")
+    stream.add_argument("--segments", metavar="PATH", help="write the Gantt segments as CSV to PATH")
+    stream.add_argument("--stats-json", metavar="PATH", help="write scheduler counters and the run time to PATH")
+    _add_export_options(stream)
+
+    batch = sub.add_parser("batch", help="simulate many random workloads at once, with confidence intervals")
+    batch.add_argument(
+        "-a", "--algorithm", type=str.upper, choices=tuple(POLICIES), nargs="+", default=list(POLICIES)
+    )
+    _add_policy_options(batch)
+    batch.add_argument("-k", "--workloads", type=_positive_int, default=10000, help="number of workloads")
+    batch.add_argument("-n", "--size", type=_positive_int, default=20, help="processes per workload")
+    batch.add_argument("--seed", type=int, default=0)
+    batch.add_argument("--load", type=float, default=0.9, help="offered load (mean burst / mean gap)")
+    batch.add_argument("--mean-burst", type=float, default=10.0)
+    batch.add_argument("--confidence", type=float, default=0.95)
+    batch.add_argument("-f", "--format", choices=("text", "json"), default="text")
+
+    convert = sub.add_parser("convert", help="convert a text process file to a binary trace")
+    convert.add_argument("src")
+    convert.add_argument("dst")
+    convert.add_argument("--sort", action="store_true", help="sort by arrival time before writing")
+    return parser
+
+
+def _load_cli_table(path: str) -> Optional[ProcessTable]:
+    if not os.path.isfile(path):
+        print(f"error: no such file: {path}", file=sys.stderr)
+        return None
+    report = LoadReport()
+    try:
+        table = open_process_file(path, report)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return None
+    if report.rejected:
+        print(report.summary(), file=sys.stderr)
+    if not len(table):
+        print("error: no processes loaded", file=sys.stderr)
+        return None
+    return table
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    options = _policy_options(args)
+    if options is None:
+        return 1
+    stats = SimStats() if args.stats_json else None
+    with timed(stats, "load"):
+        table = _load_cli_table(args.trace)
+    if table is None:
+        return 1
+
+    if args.cache_dir or args.workers:
+        from cache import ResultCache, run_cached
+
+        cache = ResultCache(directory=args.cache_dir) if args.cache_dir else None
+        segments = run_cached(
+            table,
+            args.algorithm,
+            args.quantum,
+            args.q1,
+            args.q2,
+            cache=cache,
+            workers=args.workers,
+            stats=stats,
+            **options,
+        )
+    else:
+        with timed(stats, "sort"):
+            table.sort_by_arrival()
+        reset_stats(table)
+        with timed(stats, "simulate"):
+            segments = run_algorithm(table, args.algorithm, args.quantum, args.q1, args.q2, stats=stats, **options)
+    title = algorithm_title(args.algorithm, args.quantum, args.q1, args.q2, **options)
+
+    with timed(stats, "render"):
+        if args.format == "csv":
+            write_results_csv(table, sys.stdout)
+        elif args.format == "json":
+            json.dump(results_to_json(table, segments, title), sys.stdout)
+            print()
+        else:
+            from metrics import format_tail_stats, tail_stats
+
+            print(f"[{title} Results]")
+            print_results(table)
+            print()
+            print("\n".join(format_tail_stats(tail_stats(table))))
+            if not args.no_gantt:
+                print()
+                print_gantt(segments)
+        if args.trace_json or args.gantt_png:
+            from export import export_timeline
 
-        scale = 25
-        y = 20
-        height = 40
-        max_time = max(seg[2] for seg in segments)
+            try:
+                export_timeline(segments, table.pid, args.trace_json, args.gantt_png, args.png_width, title)
+            except OSError as exc:
+                print(f"error: {exc}", file=sys.stderr)
+                return 1
 
-        for pid, start, end in segments:
-            x1 = start * scale + 10
-            x2 = end * scale + 10
-            color = "#c7e8ff" if pid != -1 else "#e8e8e8"
-            label = f"P{pid}" if pid != -1 else "IDLE"
-            self.gantt_canvas.create_rectangle(x1, y, x2, y + height, fill=color, outline="#333")
-            self.gantt_canvas.create_text((x1 + x2) / 2, y + height / 2, text=label, font=("Arial", 10, "bold"))
-            self.gantt_canvas.create_text(x1, y + height + 12, text=str(start), anchor="n", font=("Arial", 9))
-
-        self.gantt_canvas.create_text(max_time * scale + 10, y + height + 12, text=str(max_time), anchor="n", font=("Arial", 9))
-        self.gantt_canvas.configure(scrollregion=(0, 0, max_time * scale + 40, y + height + 30))
-
-    def add_process(self) -> None:
+    if stats is not None:
         try:
-            pid = int(self.id_entry.get().strip())
-            at = int(self.at_entry.get().strip())
-            bt = int(self.bt_entry.get().strip())
-        except ValueError:
-            messagebox.showerror("Invalid Input", "Please enter valid integer values.")
-            return
+            with open(args.stats_json, "w") as f:
+                json.dump({"algorithm": title, "processes": len(table), **stats.to_dict()}, f, indent=2)
+        except OSError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+    return 0
 
-        if at < 0 or bt <= 0:
-            messagebox.showerror("Invalid Input", "Arrival time must be >= 0 and burst time > 0.")
-            return
 
-        self.processes.append(Process(pid, at, bt, bt))
-        self._refresh_process_list()
-        self.id_entry.delete(0, tk.END)
-        self.at_entry.delete(0, tk.END)
-        self.bt_entry.delete(0, tk.END)
+def _cmd_sweep(args: argparse.Namespace) -> int:
+    from parallel import parse_int_values, print_sweep, sweep_mlfq, sweep_rr, write_sweep_csv
 
-    def load_from_file(self) -> None:
-        file_path = filedialog.askopenfilename(
-            title="Select processes file",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*")],
-        )
-        if not file_path:
-            return
-        loaded = load_processes_from_file(file_path)
-        if loaded:
-            self.processes = loaded
-            self._refresh_process_list()
+    try:
+        if args.algorithm == "RR":
+            grid = (parse_int_values(args.quantum),)
         else:
-            messagebox.showerror("Load Failed", "File is empty or invalid format.")
-
-    def clear_processes(self) -> None:
-        self.processes = []
-        self._refresh_process_list()
-        self._set_results("")
-
-    def _build_results(self, title: str) -> None:
-        total_wt = 0
-        total_tat = 0
-        lines = [f"[{title} Results]", "Process\tAT\tBT\tCT\tTAT\tWT"]
-        for p in self.processes:
-            total_wt += p.waiting_time
-            total_tat += p.turnaround_time
-            lines.append(
-                f"{p.pid}\t{p.arrival_time}\t{p.burst_time}\t"
-                f"{p.completion_time}\t{p.turnaround_time}\t{p.waiting_time}"
-            )
-        avg_wt = total_wt / len(self.processes)
-        avg_tat = total_tat / len(self.processes)
-        lines.append("")
-        lines.append(f"Average Waiting Time: {avg_wt:.2f}")
-        lines.append(f"Average Turnaround Time: {avg_tat:.2f}")
-        self._set_results("\n".join(lines))
-
-    def run_selected(self) -> None:
-        if not self.processes:
-            messagebox.showwarning("No Data", "Load or add processes first.")
-            return
-
-        # Ensure stable order by arrival time for preemptive algorithms
-        self.processes.sort(key=lambda p: (p.arrival_time, p.pid))
-        reset_stats(self.processes)
-
-        algo = self.algorithm_var.get()
-        if algo == "FCFS":
-            segments = simulate_fcfs(self.processes)
-            self._build_results("FCFS")
-            self._draw_gantt(segments)
-            return
-        if algo == "SJF":
-            segments = simulate_sjf(self.processes)
-            self._build_results("SJF")
-            self._draw_gantt(segments)
-            return
-        if algo == "SRTF":
-            segments = simulate_srtf(self.processes)
-            self._build_results("SRTF")
-            self._draw_gantt(segments)
-            return
-        if algo == "RR":
-            try:
-                quantum = int(self.rr_quantum_entry.get().strip())
-            except ValueError:
-                messagebox.showerror("Invalid Quantum", "RR quantum must be an integer.")
-                return
-            if quantum <= 0:
-                messagebox.showerror("Invalid Quantum", "RR quantum must be > 0.")
-                return
-            segments = simulate_rr(self.processes, quantum)
-            self._build_results(f"RR (Q={quantum})")
-            self._draw_gantt(segments)
-            return
-        if algo == "MLFQ":
-            try:
-                q1 = int(self.mlfq_q1_entry.get().strip())
-                q2 = int(self.mlfq_q2_entry.get().strip())
-            except ValueError:
-                messagebox.showerror("Invalid Quantum", "MLFQ Q1/Q2 must be integers.")
-                return
-            if q1 <= 0 or q2 <= 0:
-                messagebox.showerror("Invalid Quantum", "MLFQ Q1/Q2 must be > 0.")
-                return
-            segments = simulate_mlfq(self.processes, q1=q1, q2=q2)
-            self._build_results(f"MLFQ (Q1={q1}, Q2={q2})")
-            self._draw_gantt(segments)
-            return
+            grid = (parse_int_values(args.q1), parse_int_values(args.q2))
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    table = _load_cli_table(args.trace)
+    if table is None:
+        return 1
+
+    if args.algorithm == "RR":
+        results = sweep_rr(table, grid[0], workers=args.workers)
+    else:
+        results = sweep_mlfq(table, grid[0], grid[1], workers=args.workers)
+
+    if args.format == "csv":
+        write_sweep_csv(results, sys.stdout)
+    elif args.format == "json":
+        json.dump([vars(r) for r in results], sys.stdout)
+        print()
+    else:
+        print_sweep(results)
+    return 0
+
+
+def _cmd_stream(args: argparse.Namespace) -> int:
+    from export import ChromeTraceWriter, GanttRaster
+    from metrics import TailAccumulator, format_tail_stats
+    from streaming import Finished, iter_arrivals, stream_algorithm
+
+    options = _policy_options(args)
+    if options is None:
+        return 1
+    if not os.path.isfile(args.trace):
+        print(f"error: no such file: {args.trace}", file=sys.stderr)
+        return 1
+    report = LoadReport()
+    stats = SimStats() if args.stats_json else None
+    events = stream_algorithm(
+        iter_arrivals(args.trace, report), args.algorithm, args.quantum, args.q1, args.q2, stats=stats, **options
+    )
+    acc = TailAccumulator()
+    batch: List[Finished] = []
+    rows = csv.writer(sys.stdout) if args.rows else None
+    if rows is not None:
+        rows.writerow(Finished._fields)
+    title = algorithm_title(args.algorithm, args.quantum, args.q1, args.q2, **options)
+    seg_file = open(args.segments, "w", newline="") if args.segments else None
+    segments = csv.writer(seg_file) if seg_file is not None else None
+    trace_file = open(args.trace_json, "w") if args.trace_json else None
+    raster = GanttRaster(args.png_width) if args.gantt_png else None
+    trace = ChromeTraceWriter(trace_file, title) if trace_file is not None else None
+    try:
+        if segments is not None:
+            segments.writerow(["pid", "start", "end"])
+        # Loading, simulating and writing are interleaved, so they are timed
+        # as one phase
+        with timed(stats, "stream"):
+            for event in events:
+                if not isinstance(event, Finished):
+                    if segments is not None:
+                        segments.writerow(event)
+                    if trace is not None:
+                        trace.add(*event)
+                    if raster is not None:
+                        raster.add(*event)
+                    continue
+                if rows is not None:
+                    rows.writerow(event)
+                if trace is not None:
+                    trace.name_tracks((event.pid,))
+                batch.append(event)
+                if len(batch) == 4096:
+                    acc.add(*_finished_columns(batch))
+                    batch.clear()
+        acc.add(*_finished_columns(batch))
+        if trace is not None:
+            trace.close()
+        if raster is not None:
+            raster.write_png(args.gantt_png)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if seg_file is not None:
+            seg_file.close()
+        if trace_file is not None:
+            trace_file.close()
+    if report.rejected:
+        print(report.summary(), file=sys.stderr)
+    if rows is None:
+        tail = acc.result()
+        print(f"[{title} Results]")
+        print(f"Processes: {tail.count}")
+        print(f"Average Waiting Time: {tail.waiting.mean:.2f}")
+        print(f"Average Turnaround Time: {tail.turnaround.mean:.2f}")
+        print()
+        print("\n".join(format_tail_stats(tail)))
+    if stats is not None:
+        try:
+            with open(args.stats_json, "w") as f:
+                json.dump({"algorithm": title, "processes": acc.count, **stats.to_dict()}, f, indent=2)
+        except OSError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def _finished_columns(batch: Sequence[Tuple[int, ...]]) -> Tuple[np.ndarray, ...]:
+    # (arrival, burst, completion, waiting, turnaround, response) of Finished records
+    if not batch:
+        return tuple(np.zeros(0, dtype=np.int64) for _ in range(6))
+    data = np.array(batch, dtype=np.int64)
+    return data[:, 1], data[:, 2], data[:, 3], data[:, 5], data[:, 4], data[:, 6]
+
+
+def _cmd_batch(args: argparse.Namespace) -> int:
+    from batch import WorkloadBatch, compare_batch, print_batch
+
+    options = {key: getattr(args, key) for key in ("levels", "boost", "allotment") if getattr(args, key) is not None}
+    if not 0 < args.confidence < 1 or args.load <= 0 or args.mean_burst <= 0:
+        print("error: need 0 < confidence < 1 and a positive load and mean burst", file=sys.stderr)
+        return 1
+    workloads = WorkloadBatch.random(args.workloads, args.size, args.seed, args.load, args.mean_burst)
+    try:
+        results = compare_batch(
+            workloads, args.algorithm, quantum=args.quantum, q1=args.q1, q2=args.q2, **options
+        )
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.format == "json":
+        json.dump(
+            [
+                {"algorithm": r.title, **{name: list(ci) for name, ci in r.summary(args.confidence).items()}}
+                for r in results
+            ],
+            sys.stdout,
+        )
+        print()
+    else:
+        print_batch(results, args.confidence)
+    return 0
 
 
-def main() -> None:
-    app = SchedulerApp()
-    app.mainloop()
+def _cmd_convert(args: argparse.Namespace) -> int:
+    try:
+        report = convert_text_to_trace(args.src, args.dst, sort=args.sort)
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(report.summary())
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "run":
+        return _cmd_run(args)
+    if args.command == "sweep":
+        return _cmd_sweep(args)
+    if args.command == "stream":
+        return _cmd_stream(args)
+    if args.command == "batch":
+        return _cmd_batch(args)
+    if args.command == "convert":
+        return _cmd_convert(args)
+
+    # Tk is only imported when the GUI is actually requested
+    from gui import main as gui_main
+
+    gui_main()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    # Let gui.py and parallel.py import this script as "algorithm" instead of
+    # loading a second copy with its own ProcessTable class.
+    sys.modules.setdefault("algorithm", sys.modules[__name__])
+    sys.exit(main())
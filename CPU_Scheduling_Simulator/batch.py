@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from algorithm import ProcessTable, get_policy
+from workloads import DEFAULT_LOAD
+
+# Many small independent workloads simulated together: row k of a padded
+# (K, N) array is one workload, and every step dispatches one job in each
+# unfinished workload with a handful of whole-array operations, instead of
+# one Python-level simulation per workload. Results match run_algorithm on
+# each workload as an arrival-sorted table; only averages come back.
+
+# Arrival time of padding slots (and of "no next arrival"), far enough from
+# int64 overflow that adding a burst or quantum stays safe
+NEVER = np.iinfo(np.int64).max >> 2
+# MLFQ ready-queue key: level in the high bits, FIFO stamp in the low ones
+_LEVEL_SHIFT = 40
+
+METRICS = ("avg_waiting", "avg_turnaround", "avg_response")
+
+
+class WorkloadBatch:
+    # K workloads padded to the longest one. Row k holds count[k] jobs in
+    # arrival order (pid = column index); slots past count[k] are ignored.
+    def __init__(self, arrival: np.ndarray, burst: np.ndarray, count: Optional[Sequence[int]] = None) -> None:
+        self.arrival = np.asarray(arrival, dtype=np.int64)
+        self.burst = np.asarray(burst, dtype=np.int64)
+        if self.arrival.ndim != 2 or self.arrival.shape != self.burst.shape:
+            raise ValueError("arrival and burst must be 2-D arrays of the same shape")
+        k, n = self.arrival.shape
+        self.count = np.full(k, n, dtype=np.int64) if count is None else np.asarray(count, dtype=np.int64)
+        if self.count.shape != (k,) or (self.count < 1).any() or (self.count > n).any():
+            raise ValueError("count must give 1..N jobs for every workload")
+        self.valid = np.arange(n) < self.count[:, None]
+        if (self.burst[self.valid] <= 0).any() or (self.arrival[self.valid] < 0).any():
+            raise ValueError("bursts must be > 0 and arrivals >= 0")
+        if (np.diff(np.where(self.valid, self.arrival, NEVER), axis=1) < 0).any():
+            raise ValueError("each workload must be sorted by arrival time")
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    @classmethod
+    def from_tables(cls, tables: Sequence[ProcessTable]) -> WorkloadBatch:
+        # Each table is sorted by (arrival, pid) first, as run_algorithm sees it
+        n = max(len(table) for table in tables)
+        arrival = np.zeros((len(tables), n), dtype=np.int64)
+        burst = np.zeros((len(tables), n), dtype=np.int64)
+        for row, table in enumerate(tables):
+            table.sort_by_arrival()
+            arrival[row, : len(table)] = table.arrival
+            burst[row, : len(table)] = table.burst
+        return cls(arrival, burst, [len(table) for table in tables])
+
+    @classmethod
+    def random(cls, k: int, n: int, seed: int = 0, load: float = DEFAULT_LOAD, mean_burst: float = 10.0) -> WorkloadBatch:
+        # Poisson arrivals and exponential bursts, like the "poisson" workload
+        rng = np.random.default_rng(seed)
+        burst = np.maximum(1, np.rint(rng.exponential(mean_burst, (k, n)))).astype(np.int64)
+        gaps = rng.exponential(mean_burst / load, (k, n))
+        return cls(np.floor(np.cumsum(gaps, axis=1)).astype(np.int64), burst)
+
+    def table(self, row: int) -> ProcessTable:
+        n = int(self.count[row])
+        return ProcessTable(np.arange(n), self.arrival[row, :n], self.burst[row, :n], arrival_sorted=True)
+
+
+@dataclass
+class BatchResult:
+    title: str
+    count: np.ndarray
+    completion: np.ndarray
+    # Per-workload averages, shape (K,)
+    avg_waiting: np.ndarray
+    avg_turnaround: np.ndarray
+    avg_response: np.ndarray
+
+    def interval(self, metric: str = "avg_waiting", confidence: float = 0.95) -> Tuple[float, float, float]:
+        # (mean, low, high) of the metric over workloads; normal approximation,
+        # so meant for the large K of Monte-Carlo runs
+        values = getattr(self, metric)
+        mean = float(values.mean())
+        if len(values) < 2:
+            return mean, mean, mean
+        half = NormalDist().inv_cdf((1 + confidence) / 2) * float(values.std(ddof=1)) / math.sqrt(len(values))
+        return mean, mean - half, mean + half
+
+    def summary(self, confidence: float = 0.95) -> Dict[str, Tuple[float, float, float]]:
+        return {metric: self.interval(metric, confidence) for metric in METRICS}
+
+
+def _result(
+    batch: WorkloadBatch, title: str, completion: np.ndarray, first_run: Optional[np.ndarray] = None
+) -> BatchResult:
+    valid = batch.valid
+    turnaround = np.where(valid, completion - batch.arrival, 0)
+    waiting = np.where(valid, turnaround - batch.burst, 0)
+    response = waiting if first_run is None else np.where(valid, first_run - batch.arrival, 0)
+    count = batch.count
+    return BatchResult(
+        title=title,
+        count=count,
+        completion=np.where(valid, completion, 0),
+        avg_waiting=waiting.sum(axis=1) / count,
+        avg_turnaround=turnaround.sum(axis=1) / count,
+        avg_response=response.sum(axis=1) / count,
+    )
+
+
+def _fcfs(batch: WorkloadBatch) -> np.ndarray:
+    # The closed form runs along each row; padding gets a zero burst at the
+    # last real arrival, so it does not disturb anything before it.
+    last = np.take_along_axis(batch.arrival, (batch.count - 1)[:, None], axis=1)
+    arrival = np.where(batch.valid, batch.arrival, last)
+    burst = np.where(batch.valid, batch.burst, 0)
+    total = np.cumsum(burst, axis=1)
+    return total + np.maximum.accumulate(arrival - (total - burst), axis=1)
+
+
+def _stepped(
+    batch: WorkloadBatch,
+    shortest: bool,
+    preemptive: bool,
+    quanta: Sequence[int] = (),
+    allotment: Sequence[int] = (),
+    boost: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Lockstep event loop for every policy with a ready queue. Each job has a
+    # key and the ready job with the smallest key runs next (ties to the lower
+    # index, like the heaps): its remaining time for SJF/SRTF (shortest), or
+    # (level, FIFO stamp) for RR/MLFQ, with RR as a one-level MLFQ. A job alone
+    # in its workload takes all its slices up to the next arrival, boost or
+    # demotion at once, like the lone-job paths of RRPolicy and MLFQPolicy.
+    k, n = batch.arrival.shape
+    arrival = np.concatenate((np.where(batch.valid, batch.arrival, NEVER), np.full((k, 1), NEVER)), axis=1)
+    rem = np.where(batch.valid, batch.burst, 0)
+    key = np.full((k, n), NEVER, dtype=np.int64)
+    first_run = np.full((k, n), -1, dtype=np.int64)
+    completion = np.zeros((k, n), dtype=np.int64)
+    level = np.zeros((k, n), dtype=np.int64)
+    used = np.zeros((k, n), dtype=np.int64)
+    quanta_arr = np.asarray(quanta, dtype=np.int64)
+    allot_arr = np.asarray(allotment, dtype=np.int64)
+    last = len(quanta) - 1
+
+    # Per-workload state. `live` maps physical rows to batch rows and `active`
+    # lists the physical rows still running; finished rows are only dropped
+    # from the arrays once they make up half of them.
+    live = np.arange(k)
+    active = np.arange(k)
+    t = np.zeros(k, dtype=np.int64)
+    cursor = np.zeros(k, dtype=np.int64)
+    seq = np.zeros(k, dtype=np.int64)
+    ready = np.zeros(k, dtype=np.int64)
+    left_jobs = batch.count.copy()
+    next_boost = np.full(k, NEVER if boost is None else boost, dtype=np.int64)
+    out_completion = np.zeros((k, n), dtype=np.int64)
+    out_first = np.zeros((k, n), dtype=np.int64)
+
+    def admit(rows: np.ndarray) -> None:
+        # Queue every job that has arrived by now, in arrival order
+        while True:
+            rows = rows[arrival[rows, cursor[rows]] <= t[rows]]
+            if not len(rows):
+                return
+            jobs = cursor[rows]
+            if shortest:
+                key[rows, jobs] = rem[rows, jobs]
+            else:
+                key[rows, jobs] = seq[rows]
+                seq[rows] += 1
+            cursor[rows] += 1
+            ready[rows] += 1
+
+    def apply_boost(rows: np.ndarray) -> None:
+        # Every queued job goes to level 0, keeping the (level, stamp) order
+        sub = key[rows]
+        rank = np.empty_like(sub)
+        np.put_along_axis(rank, np.argsort(sub, axis=1, kind="stable"), np.arange(n), axis=1)
+        key[rows] = np.where(sub != NEVER, seq[rows, None] + rank, NEVER)
+        seq[rows] += ready[rows]
+        level[rows] = 0
+        used[rows] = 0
+        next_boost[rows] = (t[rows] // boost + 1) * boost
+
+    admit(active)
+    while len(active):
+        rows = active
+        idle = rows[ready[rows] == 0]
+        if len(idle):
+            t[idle] = arrival[idle, cursor[idle]]
+            admit(idle)
+        if boost is not None:
+            due = rows[t[rows] >= next_boost[rows]]
+            if len(due):
+                apply_boost(due)
+
+        job = (key if len(rows) == len(live) else key[rows]).argmin(axis=1)
+        # Flat cell indices: cheaper than indexing the 2-D arrays with pairs
+        cell = rows * n + job
+        key_f, rem_f, first_f = key.reshape(-1), rem.reshape(-1), first_run.reshape(-1)
+        left = rem_f[cell]
+        start = t[rows]
+        fresh = cell[first_f[cell] < 0]
+        first_f[fresh] = t[fresh // n]
+        key_f[cell] = NEVER
+        ready[rows] -= 1
+        next_arrival = arrival[rows, cursor[rows]]
+
+        if shortest:
+            run = np.minimum(left, next_arrival - start) if preemptive else left
+        else:
+            level_f, used_f = level.reshape(-1), used.reshape(-1)
+            lvl = level_f[cell]
+            quantum = quanta_arr[lvl]
+            run = np.where(quantum == 0, left, np.minimum(quantum, left))
+            alone = np.flatnonzero((ready[rows] == 0) & (quantum > 0))
+            if len(alone):
+                q = quantum[alone]
+                slices = -(-left[alone] // q)
+                upper = lvl[alone] < last
+                to_demote = -(-(allot_arr[lvl[alone]] - used_f[cell[alone]]) // q)
+                slices = np.where(upper, np.minimum(slices, to_demote), slices)
+                horizon = np.minimum(next_arrival[alone], next_boost[rows[alone]])
+                slices = np.where(horizon < NEVER, np.minimum(slices, -(-(horizon - start[alone]) // q)), slices)
+                run[alone] = np.minimum(slices * q, left[alone])
+
+        end = start + run
+        t[rows] = end
+        left -= run
+        rem_f[cell] = left
+        admit(rows)
+
+        done = left == 0
+        completion.reshape(-1)[cell[done]] = end[done]
+        left_jobs[rows[done]] -= 1
+        back = ~done
+        if back.any():
+            br, cb = rows[back], cell[back]
+            if shortest:
+                key_f[cb] = left[back]
+            else:
+                lvl = lvl[back]
+                u = used_f[cb] + run[back]
+                demote = (lvl < last) & (u >= allot_arr[lvl])
+                lvl = lvl + demote
+                u = np.where(demote, 0, u)
+                if boost is not None:
+                    boosted = end[back] >= next_boost[br]
+                    if boosted.any():
+                        apply_boost(br[boosted])
+                        lvl = np.where(boosted, 0, lvl)
+                        u = np.where(boosted, 0, u)
+                level_f[cb] = lvl
+                used_f[cb] = u
+                key_f[cb] = (lvl << _LEVEL_SHIFT) | seq[br]
+                seq[br] += 1
+            ready[br] += 1
+
+        finished = left_jobs[rows] == 0
+        if finished.any():
+            gone = rows[finished]
+            out_completion[live[gone]] = completion[gone]
+            out_first[live[gone]] = first_run[gone]
+            active = rows[~finished]
+            if len(active) <= len(live) // 2:
+                live = live[active]
+                arrival, rem, key = arrival[active], rem[active], key[active]
+                first_run, completion, level, used = first_run[active], completion[active], level[active], used[active]
+                t, cursor, seq, ready = t[active], cursor[active], seq[active], ready[active]
+                left_jobs, next_boost = left_jobs[active], next_boost[active]
+                active = np.arange(len(live))
+    return out_completion, out_first
+
+
+def simulate_batch(
+    batch: WorkloadBatch,
+    algorithm: str,
+    quantum: int = 2,
+    q1: int = 2,
+    q2: int = 4,
+    levels: Optional[Sequence[int]] = None,
+    boost: Optional[int] = None,
+    allotment: Optional[Sequence[int]] = None,
+) -> BatchResult:
+    info = get_policy(algorithm)
+    options = {"levels": levels, "boost": boost, "allotment": allotment}
+    # Builds (and so validates) the policy the settings describe
+    policy = info.create(quantum=quantum, q1=q1, q2=q2, **options)
+    title = info.title(quantum=quantum, q1=q1, q2=q2, **options)
+    name = info.name
+    if name == "FCFS":
+        return _result(batch, title, _fcfs(batch))
+    if name == "SJF":
+        completion, _ = _stepped(batch, shortest=True, preemptive=False)
+        return _result(batch, title, completion)
+    if name == "SRTF":
+        return _result(batch, title, *_stepped(batch, shortest=True, preemptive=True))
+    if name == "RR":
+        return _result(batch, title, *_stepped(batch, False, True, (quantum,), (quantum,)))
+    if name == "MLFQ":
+        quanta = [q or 0 for q in policy.quanta]
+        return _result(batch, title, *_stepped(batch, False, True, quanta, policy.allotment, boost))
+    raise ValueError(f"no batch simulator for {name}")
+
+
+def compare_batch(
+    batch: WorkloadBatch, algorithms: Sequence[str], **settings: object
+) -> List[BatchResult]:
+    # Every policy on the same workloads, e.g. for paired comparisons
+    return [simulate_batch(batch, algorithm, **settings) for algorithm in algorithms]
+
+
+def print_batch(results: Sequence[BatchResult], confidence: float = 0.95) -> None:
+    label = f"{confidence:.0%} CI"
+    print(f"Algorithm\tAvg WT\t{label}\tAvg TAT\t{label}\tAvg RT\t{label}")
+    for r in results:
+        cells = []
+        for mean, low, high in r.summary(confidence).values():
+            cells.append(f"{mean:.2f}\t[{low:.2f}, {high:.2f}]")
+        print(f"{r.title}\t" + "\t".join(cells))
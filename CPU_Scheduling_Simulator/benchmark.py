@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from algorithm import ALGORITHMS, reset_stats, run_algorithm, summarize
+from workloads import WORKLOADS, generate_workload
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def _parse_sizes(text: str) -> List[int]:
+    # Accepts plain integers and powers of ten written as 1e5
+    return [int(float(part)) for part in text.split(",")]
+
+
+def _parse_names(text: str, choices: Sequence[str]) -> List[str]:
+    names = [part.strip() for part in text.split(",") if part.strip()]
+    for name in names:
+        if name not in choices:
+            raise argparse.ArgumentTypeError(f"{name!r} is not one of {', '.join(choices)}")
+    return names
+
+
+def run_case(
+    workload: str,
+    algorithm: str,
+    size: int,
+    seed: int,
+    quantum: int,
+    measure_memory: bool,
+    repeat: int = 3,
+    min_time: float = 0.2,
+) -> Dict[str, object]:
+    # wall_time is the best of `repeat` runs, since noise only ever adds
+    # time; short cases keep repeating until min_time has passed in total so
+    # that one slow run cannot pass for a regression.
+    table = generate_workload(workload, size, seed)
+    best = float("inf")
+    total = 0.0
+    runs = 0
+    while runs < repeat or (total < min_time and runs < 1000):
+        reset_stats(table)
+        start = time.perf_counter()
+        segments = run_algorithm(table, algorithm, quantum=quantum)
+        wall = time.perf_counter() - start
+        best = min(best, wall)
+        total += wall
+        runs += 1
+
+    record: Dict[str, object] = {
+        "workload": workload,
+        "algorithm": algorithm,
+        "size": size,
+        "seed": seed,
+        "wall_time": best,
+        "runs": runs,
+        "segments": len(segments),
+        "avg_waiting": summarize(table).avg_waiting,
+    }
+    del segments
+
+    if measure_memory:
+        # Separate run: tracing slows allocation-heavy code down too much to
+        # share a run with the wall-time measurement.
+        reset_stats(table)
+        tracemalloc.start()
+        run_algorithm(table, algorithm, quantum=quantum)
+        record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return record
+
+
+def run_benchmarks(
+    workloads: Sequence[str],
+    algorithms: Sequence[str],
+    sizes: Sequence[int],
+    seed: int = 0,
+    quantum: int = 4,
+    measure_memory: bool = True,
+    budget: Optional[float] = None,
+    repeat: int = 3,
+    min_time: float = 0.2,
+) -> List[Dict[str, object]]:
+    records: List[Dict[str, object]] = []
+    for workload in workloads:
+        for algorithm in algorithms:
+            for size in sorted(sizes):
+                record = run_case(workload, algorithm, size, seed, quantum, measure_memory, repeat, min_time)
+                records.append(record)
+                _print_record(record)
+                # Larger sizes will only take longer, skip them once over budget
+                if budget is not None and record["wall_time"] > budget:
+                    print(f"  {workload}/{algorithm}: over {budget}s budget, skipping larger sizes", file=sys.stderr)
+                    break
+    return records
+
+
+def _print_record(record: Dict[str, object]) -> None:
+    memory = record.get("peak_memory")
+    memory_text = f"{memory / 2**20:9.1f} MiB" if memory is not None else "        -"
+    print(
+        f"{record['workload']:<13}{record['algorithm']:<6}{record['size']:>10}"
+        f"{record['wall_time']:>11.3f}s{memory_text}{record['segments']:>11} segs",
+        flush=True,
+    )
+
+
+def save_results(path: str, records: List[Dict[str, object]], quantum: int) -> None:
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "quantum": quantum,
+        "records": records,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def compare_results(
+    baseline_path: str, records: List[Dict[str, object]], threshold: float, min_delta: float = 0.001
+) -> int:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["records"]
+    def key(record: Dict[str, object]) -> tuple:
+        return record["workload"], record["algorithm"], record["size"]
+
+    previous = {key(r): r for r in baseline}
+
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (ratios are new / old):")
+    for record in records:
+        old = previous.get(key(record))
+        if old is None:
+            continue
+        time_ratio = record["wall_time"] / max(old["wall_time"], 1e-9)
+        line = f"{record['workload']:<13}{record['algorithm']:<6}{record['size']:>10}  time x{time_ratio:.2f}"
+        if "peak_memory" in record and "peak_memory" in old:
+            line += f"  memory x{record['peak_memory'] / max(old['peak_memory'], 1):.2f}"
+        # Sub-millisecond cases swing by more than the threshold between
+        # processes, so a regression also has to cost min_delta seconds
+        if time_ratio > threshold and record["wall_time"] - old["wall_time"] > min_delta:
+            line += "  REGRESSION"
+            regressions += 1
+        print(line)
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the schedulers on synthetic workloads.")
+    parser.add_argument("--sizes", type=_parse_sizes, default=list(DEFAULT_SIZES), help="e.g. 1e3,1e4,1e5,1e6,1e7")
+    parser.add_argument("--workloads", type=lambda t: _parse_names(t, list(WORKLOADS)), default=list(WORKLOADS))
+    parser.add_argument("--algorithms", type=lambda t: _parse_names(t.upper(), ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quantum", type=int, default=4, help="RR quantum (MLFQ uses its defaults)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--budget", type=float, default=None, help="seconds; skip larger sizes once exceeded")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best time is reported")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="keep repeating short cases until this many seconds in total"
+    )
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="time ratio reported as a regression")
+    parser.add_argument(
+        "--min-delta", type=float, default=0.001, help="seconds; smaller slowdowns are never reported as regressions"
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'workload':<13}{'algo':<6}{'size':>10}{'time':>12}{'peak mem':>13}{'segments':>16}")
+    records = run_benchmarks(
+        args.workloads,
+        args.algorithms,
+        args.sizes,
+        seed=args.seed,
+        quantum=args.quantum,
+        measure_memory=not args.no_memory,
+        budget=args.budget,
+        repeat=max(args.repeat, 1),
+        min_time=args.min_time,
+    )
+    if args.output:
+        save_results(args.output, records, args.quantum)
+    if args.compare:
+        return 1 if compare_results(args.compare, records, args.threshold, args.min_delta) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from algorithm import ProcessTable, SimStats, Timeline, get_policy, reset_stats, run_algorithm, timed
+
+# One cached run: the timeline columns plus the per-process result columns.
+# Turnaround and waiting times are derived from completion on a hit.
+_Entry = Dict[str, np.ndarray]
+
+# Part of every key; bump when the stored columns change so old files miss
+_FORMAT = 2
+
+
+def _params(algorithm: str, quantum: int, q1: int, q2: int, **options: object) -> Tuple[str, Tuple[object, ...]]:
+    # Only the parameters an algorithm actually uses go into its key; optional
+    # settings are tagged with their name and left out while unset.
+    info = get_policy(algorithm)
+    settings = info.settings(quantum=quantum, q1=q1, q2=q2, **options)
+    required = {key for key, _ in info.params}
+    return info.name, tuple(value if key in required else (key, value) for key, _, value in settings)
+
+
+class ResultCache:
+    # Results keyed by the process set's content digest plus the algorithm and
+    # its parameters. Kept in memory with LRU eviction and, if a directory is
+    # given, also as one .npz file per entry.
+    def __init__(self, max_entries: int = 32, directory: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys_by_digest: Dict[str, Set[str]] = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(
+        table: ProcessTable, algorithm: str, quantum: int = 2, q1: int = 2, q2: int = 4, **options: object
+    ) -> str:
+        algo, params = _params(algorithm, quantum, q1, q2, **options)
+        suffix = hashlib.sha256(repr((_FORMAT, algo, params)).encode()).hexdigest()[:16]
+        return f"{table.digest()}-{suffix}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> Optional[str]:
+        return os.path.join(self.directory, f"{key}.npz") if self.directory is not None else None
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._keys_by_digest.setdefault(key.split("-")[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            old, _ = self._entries.popitem(last=False)
+            self._keys_by_digest.get(old.split("-")[0], set()).discard(old)
+
+    def get(
+        self, table: ProcessTable, algorithm: str, quantum: int = 2, q1: int = 2, q2: int = 4, **options: object
+    ) -> Optional[Timeline]:
+        # On a hit the table's result columns are filled in as if it had run
+        key = self.key(table, algorithm, quantum, q1, q2, **options)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        else:
+            path = self._path(key)
+            if path is None or not os.path.exists(path):
+                self.misses += 1
+                return None
+            with np.load(path) as data:
+                entry = {name: data[name] for name in data.files}
+            self._remember(key, entry)
+        self.hits += 1
+
+        table.remaining[:] = entry["remaining"]
+        table.completion[:] = entry["completion"]
+        table.response[:] = entry["response"]
+        np.subtract(table.completion, table.arrival, out=table.turnaround)
+        np.subtract(table.turnaround, table.burst, out=table.waiting)
+        return Timeline.from_arrays(entry["pids"], entry["starts"], entry["ends"])
+
+    def put(
+        self,
+        table: ProcessTable,
+        algorithm: str,
+        timeline: Timeline,
+        quantum: int = 2,
+        q1: int = 2,
+        q2: int = 4,
+        **options: object,
+    ) -> None:
+        key = self.key(table, algorithm, quantum, q1, q2, **options)
+        pids, starts, ends = timeline.arrays()
+        entry = {
+            "pids": pids,
+            "starts": starts,
+            "ends": ends,
+            "remaining": table.remaining.copy(),
+            "completion": table.completion.copy(),
+            "response": table.response.copy(),
+        }
+        self._remember(key, entry)
+        path = self._path(key)
+        if path is not None:
+            # Write under a temporary name first so readers never see half a file
+            tmp = f"{path}.tmp.npz"
+            np.savez(tmp, **entry)
+            os.replace(tmp, path)
+
+    def invalidate(self, table: ProcessTable) -> None:
+        # Drop every entry of this process set; call before changing it
+        digest = table.digest(compute=False)
+        if digest is None:
+            return
+        for key in self._keys_by_digest.pop(digest, set()):
+            self._entries.pop(key, None)
+        if self.directory is not None:
+            for path in glob.glob(os.path.join(glob.escape(self.directory), f"{digest}-*.npz")):
+                os.remove(path)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_digest.clear()
+        if self.directory is not None:
+            for path in glob.glob(os.path.join(glob.escape(self.directory), "*.npz")):
+                os.remove(path)
+
+
+def run_cached(
+    table: ProcessTable,
+    algorithm: str,
+    quantum: int = 2,
+    q1: int = 2,
+    q2: int = 4,
+    cache: Optional[ResultCache] = None,
+    workers: Optional[int] = None,
+    stats: Optional[SimStats] = None,
+    **options: object,
+) -> Timeline:
+    # workers: simulate busy periods in that many processes (see run_sharded);
+    # the per-dispatch counters in stats are only filled in by a serial run,
+    # a cache hit or a parallel run marks them unavailable
+    with timed(stats, "sort"):
+        table.sort_by_arrival()
+    if cache is not None:
+        timeline = cache.get(table, algorithm, quantum, q1, q2, **options)
+        if timeline is not None:
+            if stats is not None:
+                stats.record_uncounted(timeline)
+            return timeline
+    reset_stats(table)
+    with timed(stats, "simulate"):
+        if workers is None:
+            timeline = run_algorithm(table, algorithm, quantum, q1, q2, stats=stats, **options)
+        else:
+            from parallel import run_sharded
+
+            timeline = run_sharded(table, algorithm, quantum, q1, q2, workers=workers, **options)
+            if stats is not None:
+                stats.record_uncounted(timeline)
+    if cache is not None:
+        cache.put(table, algorithm, timeline, quantum, q1, q2, **options)
+    return timeline
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Iterable, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from algorithm import Timeline
+
+# Timeline exporters that take segments as they are produced, so neither the
+# JSON trace nor the image needs the whole timeline in memory.
+
+# Segments buffered by add() before they are written out in one go
+_CHUNK = 4096
+
+
+class ChromeTraceWriter:
+    # Chrome trace-event JSON, readable by ui.perfetto.dev and chrome://tracing:
+    # one complete ("X") event per segment, on one track (thread) per pid, with
+    # one time unit shown as one microsecond. Idle segments are left out.
+    # Tracks are named by name_tracks(), which callers run once per process
+    # (when it finishes, for a stream), so nothing grows with the pid count.
+    def __init__(self, out: TextIO, title: str = "CPU") -> None:
+        self.out = out
+        self._first = True
+        self._pending: List[str] = []
+        out.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self._emit([json.dumps({"name": "process_name", "ph": "M", "pid": 0, "args": {"name": title}})])
+
+    def _emit(self, events: List[str]) -> None:
+        self._pending.extend(events)
+        if len(self._pending) >= _CHUNK:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        if not self._first:
+            self.out.write(",\n")
+        self.out.write(",\n".join(self._pending))
+        self._pending.clear()
+        self._first = False
+
+    def add(self, pid: int, start: int, end: int) -> None:
+        if pid != -1:
+            self._emit([f'{{"name": "P{pid}", "ph": "X", "pid": 0, "tid": {pid}, "ts": {start}, "dur": {end - start}}}'])
+
+    def add_arrays(self, pids: Iterable[int], starts: Iterable[int], ends: Iterable[int]) -> None:
+        self._emit(
+            [
+                f'{{"name": "P{pid}", "ph": "X", "pid": 0, "tid": {pid}, "ts": {start}, "dur": {end - start}}}'
+                for pid, start, end in zip(_as_list(pids), _as_list(starts), _as_list(ends))
+                if pid != -1
+            ]
+        )
+
+    def name_tracks(self, pids: Iterable[int]) -> None:
+        events = []
+        for pid in _as_list(pids):
+            events.append(f'{{"name": "thread_name", "ph": "M", "pid": 0, "tid": {pid}, "args": {{"name": "P{pid}"}}}}')
+            events.append(
+                f'{{"name": "thread_sort_index", "ph": "M", "pid": 0, "tid": {pid}, "args": {{"sort_index": {pid}}}}}'
+            )
+        self._emit(events)
+
+    def close(self) -> None:
+        self._flush()
+        self.out.write("\n]}\n")
+
+    def __enter__(self) -> ChromeTraceWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _as_list(values: Iterable[int]) -> List[int]:
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+# Fill colours per pid (pid mod len) and for idle time, as RGB
+PALETTE = np.array(
+    [
+        (0x3C, 0x8D, 0xD0),
+        (0xF2, 0x8E, 0x2B),
+        (0x59, 0xA1, 0x4F),
+        (0xE1, 0x57, 0x59),
+        (0x76, 0xB7, 0xB2),
+        (0xED, 0xC9, 0x48),
+        (0xB0, 0x7A, 0xA1),
+        (0xFF, 0x9D, 0xA7),
+        (0x9C, 0x75, 0x5F),
+        (0x79, 0x70, 0x6E),
+    ],
+    dtype=np.float64,
+)
+IDLE_RGB = np.array((0xE8, 0xE8, 0xE8), dtype=np.float64)
+OUTLINE_RGB = np.array((0x33, 0x33, 0x33), dtype=np.uint8)
+
+
+class GanttRaster:
+    # Fixed-size Gantt bar for timelines of any length. The time axis is cut
+    # into `width` bins starting at 0; whenever a segment ends past the last
+    # bin, neighbouring bins are merged pairwise and the bin length doubles,
+    # so memory stays O(width) and the final bin length is within 2x of
+    # end_time / width. Each bin keeps its busy time and the pid with the
+    # longest single run in it, which gives the pixel colour, faded towards
+    # the idle colour by the idle share of the bin (like the GUI's bands).
+    def __init__(self, width: int = 1600, height: int = 48) -> None:
+        if width < 2 or height < 3:
+            raise ValueError("image must be at least 2 x 3 pixels")
+        self.width = width
+        self.height = height
+        self.bin = 1
+        self.end = 0
+        self.busy = np.zeros(width, dtype=np.int64)
+        self.best = np.zeros(width, dtype=np.int64)
+        self.pid = np.full(width, -1, dtype=np.int64)
+        self._pending: List[Tuple[int, int, int]] = []
+
+    def add(self, pid: int, start: int, end: int) -> None:
+        self._pending.append((pid, start, end))
+        if len(self._pending) >= _CHUNK:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            data = np.array(self._pending, dtype=np.int64)
+            self._pending.clear()
+            self.add_arrays(data[:, 0], data[:, 1], data[:, 2])
+
+    def add_arrays(self, pids: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> None:
+        pids = np.asarray(pids, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        # Halve exactly before the first segment that does not fit, so the
+        # image does not depend on how the segments were chunked
+        reach = np.maximum.accumulate(ends) if len(ends) else ends
+        lo = 0
+        while lo < len(ends):
+            hi = int(np.searchsorted(reach, self.width * self.bin, side="right"))
+            if hi <= lo:
+                self._halve()
+                continue
+            self._add_fitting(pids[lo:hi], starts[lo:hi], ends[lo:hi])
+            self.end = max(self.end, int(reach[hi - 1]))
+            lo = hi
+
+    def _add_fitting(self, pids: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> None:
+        running = (pids != -1) & (ends > starts)
+        pids, starts, ends = pids[running], starts[running], ends[running]
+        if not len(ends):
+            return
+
+        # One (bin, overlap) entry per bin a segment touches; segments do not
+        # overlap, so there are at most len(segments) + width of them.
+        size = self.bin
+        first = starts // size
+        counts = (ends - 1) // size - first + 1
+        offsets = np.cumsum(counts) - counts
+        step = np.arange(int(counts.sum())) - np.repeat(offsets, counts)
+        col = np.repeat(first, counts) + step
+        lo = np.maximum(np.repeat(starts, counts), col * size)
+        hi = np.minimum(np.repeat(ends, counts), (col + 1) * size)
+        overlap = hi - lo
+        self.busy += np.bincount(col, weights=overlap, minlength=self.width).astype(np.int64)
+
+        # The earliest longest run of each bin replaces the bin's pid if it
+        # is strictly longer than the one kept so far
+        best = np.zeros(self.width, dtype=np.int64)
+        np.maximum.at(best, col, overlap)
+        top = np.flatnonzero(overlap == best[col])
+        cols, first_top = np.unique(col[top], return_index=True)
+        top = top[first_top]
+        better = overlap[top] > self.best[cols]
+        top, cols = top[better], cols[better]
+        self.best[cols] = overlap[top]
+        self.pid[cols] = np.repeat(pids, counts)[top]
+
+    def _halve(self) -> None:
+        half = (self.width + 1) // 2
+        pad = half * 2 - self.width
+
+        def pairs(values: np.ndarray) -> np.ndarray:
+            return np.concatenate((values, np.zeros(pad, dtype=values.dtype))).reshape(half, 2)
+
+        busy = pairs(self.busy).sum(axis=1)
+        best = pairs(self.best)
+        pid = pairs(self.pid)
+        right = best[:, 1] > best[:, 0]
+        rows = np.arange(half)
+        self.busy = np.zeros(self.width, dtype=np.int64)
+        self.best = np.zeros(self.width, dtype=np.int64)
+        self.pid = np.full(self.width, -1, dtype=np.int64)
+        self.busy[:half] = busy
+        self.best[:half] = best[rows, right.astype(np.int64)]
+        self.pid[:half] = pid[rows, right.astype(np.int64)]
+        self.bin *= 2
+
+    def pixels(self) -> np.ndarray:
+        # (height, width, 3) uint8 image: the used bins stretched to the full
+        # width, with a one-pixel outline at the top and bottom
+        self._flush()
+        used = max(-(-self.end // self.bin), 1)
+        index = np.arange(self.width) * used // self.width
+        share = (self.busy[index] / self.bin)[:, None]
+        pid = self.pid[index]
+        color = np.where((pid >= 0)[:, None], PALETTE[np.maximum(pid, 0) % len(PALETTE)], IDLE_RGB)
+        row = np.rint(IDLE_RGB + np.clip(share, 0, 1) * (color - IDLE_RGB)).astype(np.uint8)
+        image = np.repeat(row[None], self.height, axis=0)
+        image[0] = image[-1] = OUTLINE_RGB
+        return image
+
+    def write_png(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(encode_png(self.pixels()))
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    # 8-bit RGB PNG, every scanline with filter type 0 (none)
+    height, width, _ = image.shape
+    raw = np.concatenate((np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 3)), axis=1)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def export_timeline(
+    timeline: Timeline,
+    pids: Iterable[int] = (),
+    trace_json: Optional[str] = None,
+    gantt_png: Optional[str] = None,
+    png_width: int = 1600,
+    title: str = "CPU",
+) -> None:
+    # Feeds an in-memory timeline to the exporters in chunks; `pids` names
+    # the trace tracks
+    raster = GanttRaster(png_width) if gantt_png else None
+    out = open(trace_json, "w") if trace_json else None
+    try:
+        writer = ChromeTraceWriter(out, title) if out is not None else None
+        if writer is not None:
+            writer.name_tracks(pids)
+        all_pids, starts, ends = timeline.arrays()
+        for lo in range(0, len(ends), 1 << 16):
+            hi = lo + (1 << 16)
+            if writer is not None:
+                writer.add_arrays(all_pids[lo:hi], starts[lo:hi], ends[lo:hi])
+            if raster is not None:
+                raster.add_arrays(all_pids[lo:hi], starts[lo:hi], ends[lo:hi])
+        if writer is not None:
+            writer.close()
+    finally:
+        if out is not None:
+            out.close()
+    if raster is not None:
+        raster.write_png(gantt_png)
@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+from algorithm import (
+    POLICIES,
+    IncrementalRun,
+    LoadReport,
+    ProcessTable,
+    Progress,
+    SimStats,
+    SimulationCancelled,
+    Timeline,
+    algorithm_title,
+    get_policy,
+    open_process_file,
+    summarize,
+    timed,
+)
+from cache import ResultCache
+from metrics import format_sim_stats, format_tail_stats, tail_stats
+
+
+class GanttView:
+    # Virtualized Gantt chart: only segments inside the visible time window are
+    # drawn, and when they would be thinner than MIN_SEGMENT_PX the window is
+    # drawn as density bands (busy fraction per few pixels) instead.
+    MIN_SEGMENT_PX = 4
+    LABEL_PX = 28
+    BAND_PX = 3
+    MAX_SCALE = 200.0
+    MARGIN = 10
+    BAR_Y = 20
+    BAR_HEIGHT = 40
+
+    def __init__(self, parent: tk.Widget) -> None:
+        toolbar = tk.Frame(parent)
+        toolbar.pack(side=tk.TOP, fill=tk.X)
+        tk.Button(toolbar, text="-", width=2, command=lambda: self.zoom(0.5)).pack(side=tk.LEFT)
+        tk.Button(toolbar, text="+", width=2, command=lambda: self.zoom(2.0)).pack(side=tk.LEFT, padx=4)
+        tk.Button(toolbar, text="Fit", command=self.fit).pack(side=tk.LEFT)
+        self.info = tk.Label(toolbar, text="", fg="#666")
+        self.info.pack(side=tk.RIGHT)
+
+        self.canvas = tk.Canvas(parent, height=120, bg="white")
+        self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.scroll = tk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self._on_scroll)
+        self.scroll.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.canvas.bind("<Configure>", lambda _e: self.redraw())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(1.25, e.x))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(0.8, e.x))
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+
+        self.scale = 25.0
+        self.offset = 0.0
+        self._drag_x = 0
+        self._pending = False
+        self.set_segments(Timeline())
+
+    def set_segments(self, timeline: Timeline) -> None:
+        self.timeline = timeline
+        self.pids, self.starts, self.ends = timeline.arrays()
+        self.total = timeline.end_time
+        self.offset = 0.0
+        self.scale = 25.0
+        if len(timeline) and self.total * self.scale > self._width():
+            self.fit()
+        else:
+            self.redraw()
+
+    def _width(self) -> int:
+        return max(self.canvas.winfo_width() - 2 * self.MARGIN, 1)
+
+    def _min_scale(self) -> float:
+        return min(self._width() / max(self.total, 1), self.MAX_SCALE)
+
+    def fit(self) -> None:
+        self.scale = self._min_scale()
+        self.offset = 0.0
+        self.redraw()
+
+    def zoom(self, factor: float, x: Optional[int] = None) -> None:
+        if x is None:
+            x = self._width() // 2
+        anchor = self.offset + (x - self.MARGIN) / self.scale
+        self.scale = min(max(self.scale * factor, self._min_scale()), self.MAX_SCALE)
+        self.offset = anchor - (x - self.MARGIN) / self.scale
+        self.redraw()
+
+    def _on_wheel(self, event: tk.Event) -> None:
+        self.zoom(1.25 if event.delta > 0 else 0.8, event.x)
+
+    def _on_press(self, event: tk.Event) -> None:
+        self._drag_x = event.x
+
+    def _on_drag(self, event: tk.Event) -> None:
+        self.offset -= (event.x - self._drag_x) / self.scale
+        self._drag_x = event.x
+        self.redraw()
+
+    def _on_scroll(self, action: str, amount: str, unit: str = "") -> None:
+        visible = self._width() / self.scale
+        if action == "moveto":
+            self.offset = float(amount) * self.total
+        elif unit == "pages":
+            self.offset += int(amount) * visible * 0.9
+        else:
+            self.offset += int(amount) * visible * 0.1
+        self.redraw()
+
+    def redraw(self) -> None:
+        # Coalesce bursts of scroll/zoom events into one redraw
+        if not self._pending:
+            self._pending = True
+            self.canvas.after_idle(self._redraw_now)
+
+    def _redraw_now(self) -> None:
+        self._pending = False
+        self.canvas.delete("all")
+        visible = self._width() / self.scale
+        self.offset = min(max(self.offset, 0.0), max(self.total - visible, 0.0))
+        if not len(self.ends):
+            self.scroll.set(0.0, 1.0)
+            self.info.configure(text="")
+            return
+        t0 = self.offset
+        t1 = self.offset + visible
+        self.scroll.set(t0 / self.total, min(t1 / self.total, 1.0))
+
+        first, last = self.timeline.window(t0, t1)
+        count = last - first
+        px_per_segment = visible * self.scale / max(count, 1)
+        if px_per_segment < self.MIN_SEGMENT_PX:
+            self._draw_bands(t0, t1)
+            mode = "density"
+        else:
+            self._draw_segments(first, last)
+            mode = "detail"
+        if px_per_segment >= self.LABEL_PX:
+            self._draw_segment_times(first, last)
+        else:
+            self._draw_axis(t0, t1)
+        self.info.configure(text=f"{count} of {len(self.ends)} segments in view ({mode})")
+
+    def _x(self, t: float) -> float:
+        return (t - self.offset) * self.scale + self.MARGIN
+
+    def _draw_segments(self, first: int, last: int) -> None:
+        y, height = self.BAR_Y, self.BAR_HEIGHT
+        rows = zip(self.pids[first:last].tolist(), self.starts[first:last].tolist(), self.ends[first:last].tolist())
+        for pid, start, end in rows:
+            x1 = self._x(start)
+            x2 = self._x(end)
+            color = "#c7e8ff" if pid != -1 else "#e8e8e8"
+            self.canvas.create_rectangle(x1, y, x2, y + height, fill=color, outline="#333")
+            if x2 - x1 >= self.LABEL_PX:
+                label = f"P{pid}" if pid != -1 else "IDLE"
+                self.canvas.create_text((x1 + x2) / 2, y + height / 2, text=label, font=("Arial", 10, "bold"))
+
+    def _draw_bands(self, t0: float, t1: float) -> None:
+        y, height = self.BAR_Y, self.BAR_HEIGHT
+        bins = max(int(self._width() // self.BAND_PX), 1)
+        edges = np.linspace(t0, t1, bins + 1)
+        busy = np.diff(self.timeline.busy_until(edges)) / np.maximum(np.diff(edges), 1e-12)
+        idle_rgb = np.array([0xE8, 0xE8, 0xE8])
+        busy_rgb = np.array([0x3C, 0x8D, 0xD0])
+        colors = np.rint(idle_rgb + np.clip(busy, 0, 1)[:, None] * (busy_rgb - idle_rgb)).astype(int)
+        for k, (r, g, b) in enumerate(colors.tolist()):
+            x1 = self.MARGIN + k * self.BAND_PX
+            color = f"#{r:02x}{g:02x}{b:02x}"
+            self.canvas.create_rectangle(x1, y, x1 + self.BAND_PX, y + height, fill=color, width=0)
+        self.canvas.create_rectangle(self.MARGIN, y, self.MARGIN + bins * self.BAND_PX, y + height, outline="#333")
+
+    def _draw_segment_times(self, first: int, last: int) -> None:
+        # Start time under each segment plus the end of the last one, as long
+        # as segments are wide enough to keep the labels apart
+        y = self.BAR_Y + self.BAR_HEIGHT + 12
+        times = self.starts[first:last].tolist()
+        if last == len(self.ends):
+            times.append(self.total)
+        for t in times:
+            self.canvas.create_text(self._x(t), y, text=str(t), anchor="n", font=("Arial", 9))
+
+    def _draw_axis(self, t0: float, t1: float) -> None:
+        # Ticks at 1/2/5 x 10^k, at least ~70 px apart
+        y = self.BAR_Y + self.BAR_HEIGHT
+        raw = 70 / self.scale
+        magnitude = 10 ** np.floor(np.log10(max(raw, 1)))
+        step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+        tick = np.ceil(t0 / step) * step
+        while tick <= min(t1, self.total):
+            x = self._x(tick)
+            self.canvas.create_line(x, y, x, y + 4, fill="#333")
+            self.canvas.create_text(x, y + 12, text=str(int(tick)), anchor="n", font=("Arial", 9))
+            tick += step
+
+
+class PagedTable:
+    # Shows one page of a ProcessTable's columns at a time, so a million-row
+    # table costs PAGE_SIZE Treeview items instead of a million text lines.
+    PAGE_SIZE = 200
+
+    def __init__(self, parent: tk.Widget, columns: Sequence[Tuple[str, str]], empty_text: str) -> None:
+        self.columns = columns
+        self.empty_text = empty_text
+        self.table: Optional[ProcessTable] = None
+        self.page = 0
+
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(frame, columns=[name for name, _ in columns], show="headings", height=8)
+        for name, heading in columns:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=60, anchor="e", stretch=True)
+        scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        pager = tk.Frame(parent)
+        pager.pack(fill=tk.X)
+        tk.Button(pager, text="<", width=2, command=lambda: self.show_page(self.page - 1)).pack(side=tk.LEFT)
+        tk.Button(pager, text=">", width=2, command=lambda: self.show_page(self.page + 1)).pack(side=tk.LEFT, padx=4)
+        self.page_label = tk.Label(pager, text=empty_text, fg="#666")
+        self.page_label.pack(side=tk.LEFT)
+
+    def set_table(self, table: Optional[ProcessTable]) -> None:
+        self.table = table
+        self.show_page(0)
+
+    def _pages(self) -> int:
+        rows = len(self.table) if self.table is not None else 0
+        return max(1, -(-rows // self.PAGE_SIZE))
+
+    def show_page(self, page: int) -> None:
+        self.page = min(max(page, 0), self._pages() - 1)
+        self.tree.delete(*self.tree.get_children())
+        table = self.table
+        if table is None or not len(table):
+            self.page_label.config(text=self.empty_text)
+            return
+        lo = self.page * self.PAGE_SIZE
+        hi = min(lo + self.PAGE_SIZE, len(table))
+        columns = [getattr(table, name)[lo:hi].tolist() for name, _ in self.columns]
+        for row in zip(*columns):
+            self.tree.insert("", tk.END, values=row)
+        self.page_label.config(text=f"Rows {lo + 1}-{hi} of {len(table)} (page {self.page + 1}/{self._pages()})")
+
+
+class SchedulerApp(tk.Tk):
+    POLL_MS = 50
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.title("CPU Scheduling Simulator")
+        self.geometry("900x600")
+        self.minsize(900, 600)
+
+        self.processes = ProcessTable.empty()
+        self._run: Optional[IncrementalRun] = None
+        self._cache = ResultCache(max_entries=8)
+
+        # Background simulation: the worker thread only touches the table, the
+        # run and the cache, and the buttons that could change them are disabled
+        # until _poll_worker sees it finish.
+        self._worker: Optional[threading.Thread] = None
+        self._progress: Optional[Progress] = None
+        self._outcome: Optional[Tuple[str, object]] = None
+        self._load_seconds: Optional[float] = None
+
+        self._build_ui()
+        self._try_load_default()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _build_ui(self) -> None:
+        header = tk.Label(self, text="CPU Scheduling Simulator", font=("Arial", 18, "bold"))
+        header.pack(pady=10)
+
+        container = tk.Frame(self)
+        container.pack(fill=tk.BOTH, expand=True, padx=12, pady=8)
+
+        left = tk.Frame(container)
+        left.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
+
+        right = tk.Frame(container)
+        right.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+
+        # Input section
+        input_box = tk.LabelFrame(left, text="Add Process", padx=8, pady=8)
+        input_box.pack(fill=tk.X)
+
+        tk.Label(input_box, text="ID").grid(row=0, column=0, sticky="w")
+        tk.Label(input_box, text="Arrival Time").grid(row=0, column=1, sticky="w")
+        tk.Label(input_box, text="Burst Time").grid(row=0, column=2, sticky="w")
+
+        self.id_entry = tk.Entry(input_box, width=10)
+        self.at_entry = tk.Entry(input_box, width=12)
+        self.bt_entry = tk.Entry(input_box, width=12)
+        self.id_entry.grid(row=1, column=0, padx=5, pady=4)
+        self.at_entry.grid(row=1, column=1, padx=5, pady=4)
+        self.bt_entry.grid(row=1, column=2, padx=5, pady=4)
+
+        add_btn = tk.Button(input_box, text="Add", command=self.add_process)
+        add_btn.grid(row=1, column=3, padx=6)
+
+        # Actions
+        action_box = tk.LabelFrame(left, text="Actions", padx=8, pady=8)
+        action_box.pack(fill=tk.X, pady=10)
+
+        load_btn = tk.Button(action_box, text="Load From File", command=self.load_from_file)
+        load_btn.grid(row=0, column=0, padx=5, pady=4)
+        clear_btn = tk.Button(action_box, text="Clear All", command=self.clear_processes)
+        clear_btn.grid(row=0, column=1, padx=5, pady=4)
+        run_btn = tk.Button(action_box, text="Run Selected", command=self.run_selected)
+        run_btn.grid(row=0, column=2, padx=5, pady=4)
+        self.cancel_btn = tk.Button(action_box, text="Cancel", command=self.cancel_run, state=tk.DISABLED)
+        self.cancel_btn.grid(row=0, column=3, padx=5, pady=4)
+        self._busy_buttons = (add_btn, load_btn, clear_btn, run_btn)
+
+        self.progress_bar = ttk.Progressbar(action_box, mode="determinate", maximum=1.0)
+        self.progress_bar.grid(row=1, column=0, columnspan=4, sticky="we", padx=5)
+        self.progress_label = tk.Label(action_box, text="", fg="#666")
+        self.progress_label.grid(row=2, column=0, columnspan=4, sticky="w", padx=5)
+
+        # Algorithm controls
+        algo_box = tk.LabelFrame(left, text="Algorithm", padx=8, pady=8)
+        algo_box.pack(fill=tk.X, pady=6)
+
+        self.algorithm_var = tk.StringVar(value="FCFS")
+        self.algorithm_menu = tk.OptionMenu(algo_box, self.algorithm_var, *POLICIES)
+        self.algorithm_menu.grid(row=0, column=0, padx=5, pady=4, sticky="w")
+
+        tk.Label(algo_box, text="RR Quantum").grid(row=0, column=1, padx=5, sticky="e")
+        self.rr_quantum_entry = tk.Entry(algo_box, width=6)
+        self.rr_quantum_entry.insert(0, "2")
+        self.rr_quantum_entry.grid(row=0, column=2, padx=5)
+
+        tk.Label(algo_box, text="MLFQ Q1").grid(row=1, column=1, padx=5, sticky="e")
+        self.mlfq_q1_entry = tk.Entry(algo_box, width=6)
+        self.mlfq_q1_entry.insert(0, "2")
+        self.mlfq_q1_entry.grid(row=1, column=2, padx=5)
+
+        tk.Label(algo_box, text="MLFQ Q2").grid(row=1, column=3, padx=5, sticky="e")
+        self.mlfq_q2_entry = tk.Entry(algo_box, width=6)
+        self.mlfq_q2_entry.insert(0, "4")
+        self.mlfq_q2_entry.grid(row=1, column=4, padx=5)
+
+        # Optional MLFQ settings; left blank they keep the 3-level default
+        tk.Label(algo_box, text="MLFQ Levels").grid(row=2, column=1, padx=5, sticky="e")
+        self.mlfq_levels_entry = tk.Entry(algo_box, width=12)
+        self.mlfq_levels_entry.grid(row=2, column=2, columnspan=2, padx=5, sticky="w")
+
+        tk.Label(algo_box, text="Boost").grid(row=2, column=3, padx=5, sticky="e")
+        self.mlfq_boost_entry = tk.Entry(algo_box, width=6)
+        self.mlfq_boost_entry.grid(row=2, column=4, padx=5)
+
+        tk.Label(algo_box, text="Allotment").grid(row=3, column=1, padx=5, sticky="e")
+        self.mlfq_allotment_entry = tk.Entry(algo_box, width=12)
+        self.mlfq_allotment_entry.grid(row=3, column=2, columnspan=2, padx=5, sticky="w")
+
+        # Entry for each setting a registered policy can ask for
+        self.param_entries = {
+            "quantum": self.rr_quantum_entry,
+            "q1": self.mlfq_q1_entry,
+            "q2": self.mlfq_q2_entry,
+        }
+        self.option_entries = {
+            "levels": self.mlfq_levels_entry,
+            "boost": self.mlfq_boost_entry,
+            "allotment": self.mlfq_allotment_entry,
+        }
+
+        self.stats_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(algo_box, text="Collect stats", variable=self.stats_var).grid(
+            row=1, column=0, padx=5, sticky="w"
+        )
+
+        # Process list
+        list_box = tk.LabelFrame(left, text="Current Processes", padx=8, pady=8)
+        list_box.pack(fill=tk.BOTH, expand=True)
+
+        self.process_list = PagedTable(
+            list_box, (("pid", "ID"), ("arrival", "AT"), ("burst", "BT")), "No processes loaded."
+        )
+
+        # Results
+        results_box = tk.LabelFrame(right, text="Results", padx=8, pady=8)
+        results_box.pack(fill=tk.BOTH, expand=True)
+
+        self.results_text = tk.Text(results_box, height=9, wrap="none", font=("Courier", 9))
+        self.results_text.pack(fill=tk.X)
+        self.results_table = PagedTable(
+            results_box,
+            (
+                ("pid", "Process"),
+                ("arrival", "AT"),
+                ("burst", "BT"),
+                ("completion", "CT"),
+                ("turnaround", "TAT"),
+                ("waiting", "WT"),
+                ("response", "RT"),
+            ),
+            "No results.",
+        )
+
+        # Gantt Chart
+        gantt_box = tk.LabelFrame(right, text="Gantt Chart", padx=8, pady=8)
+        gantt_box.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
+
+        self.gantt = GanttView(gantt_box)
+
+        footer = tk.Label(self, text="Input format: ID ArrivalTime BurstTime", fg="#666")
+        footer.pack(pady=6)
+
+    def _try_load_default(self) -> None:
+        default_file = "processes.txt"
+        loaded = open_process_file(default_file)
+        if len(loaded):
+            self.processes = loaded
+            self._refresh_process_list()
+
+    def _refresh_process_list(self) -> None:
+        # Keep the current page: adding a process should not jump back to the top
+        page = self.process_list.page if self.process_list.table is self.processes else 0
+        self.process_list.table = self.processes
+        self.process_list.show_page(page)
+
+    def _set_results(self, text: str) -> None:
+        self.results_text.delete("1.0", tk.END)
+        self.results_text.insert(tk.END, text)
+
+    def _draw_gantt(self, segments: Timeline) -> None:
+        self.gantt.set_segments(segments)
+
+    def add_process(self) -> None:
+        try:
+            pid = int(self.id_entry.get().strip())
+            at = int(self.at_entry.get().strip())
+            bt = int(self.bt_entry.get().strip())
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter valid integer values.")
+            return
+
+        if at < 0 or bt <= 0:
+            messagebox.showerror("Invalid Input", "Arrival time must be >= 0 and burst time > 0.")
+            return
+
+        self._cache.invalidate(self.processes)
+        if self._run is not None and self._run.table is self.processes:
+            self._run.insert(pid, at, bt)
+        else:
+            self.processes.append(pid, at, bt)
+        self._refresh_process_list()
+        self.id_entry.delete(0, tk.END)
+        self.at_entry.delete(0, tk.END)
+        self.bt_entry.delete(0, tk.END)
+
+    def load_from_file(self) -> None:
+        file_path = filedialog.askopenfilename(
+            title="Select processes file",
+            filetypes=[("Text Files", "*.txt"), ("Binary Traces", "*.trace"), ("All Files", "*")],
+        )
+        if not file_path:
+            return
+        report = LoadReport()
+        try:
+            start = time.perf_counter()
+            loaded = open_process_file(file_path, report)
+            load_seconds = time.perf_counter() - start
+        except ValueError as exc:
+            messagebox.showerror("Load Failed", str(exc))
+            return
+        if len(loaded):
+            self._cache.invalidate(self.processes)
+            self.processes = loaded
+            self._load_seconds = load_seconds
+            self._run = None
+            self._refresh_process_list()
+            if report.rejected:
+                messagebox.showwarning("Some Lines Skipped", report.summary())
+        else:
+            messagebox.showerror("Load Failed", "File is empty or invalid format.")
+
+    def clear_processes(self) -> None:
+        self._cache.invalidate(self.processes)
+        self.processes = ProcessTable.empty()
+        self._load_seconds = None
+        self._run = None
+        self._refresh_process_list()
+        self._set_results("")
+        self.results_table.set_table(None)
+
+    def _build_results(self, title: str) -> None:
+        table = self.processes
+        summary = summarize(table)
+        lines = [
+            f"[{title} Results]",
+            f"Average Waiting Time: {summary.avg_waiting:.2f}",
+            f"Average Turnaround Time: {summary.avg_turnaround:.2f}",
+            "",
+        ]
+        lines.extend(format_tail_stats(tail_stats(table)))
+        self._set_results("\n".join(lines))
+        self.results_table.set_table(table)
+
+    def run_selected(self) -> None:
+        if not len(self.processes):
+            messagebox.showwarning("No Data", "Load or add processes first.")
+            return
+
+        algo = self.algorithm_var.get()
+        settings = {"quantum": 2, "q1": 2, "q2": 4}
+        info = get_policy(algo)
+        for key, label in info.params:
+            try:
+                value = int(self.param_entries[key].get().strip())
+            except ValueError:
+                messagebox.showerror("Invalid Quantum", f"{info.name} {label} must be an integer.")
+                return
+            if value <= 0:
+                messagebox.showerror("Invalid Quantum", f"{info.name} {label} must be > 0.")
+                return
+            settings[key] = value
+        quantum, q1, q2 = settings["quantum"], settings["q1"], settings["q2"]
+
+        options: Dict[str, object] = {}
+        for key, label in info.options:
+            text = self.option_entries[key].get().strip()
+            if not text:
+                continue
+            try:
+                # The boost period is one number, the others are per-level lists
+                options[key] = int(text) if key == "boost" else tuple(int(part) for part in text.split(","))
+            except ValueError:
+                expected = "a single integer" if key == "boost" else "comma-separated integers"
+                messagebox.showerror("Invalid Settings", f"{info.name} {label} must be {expected}.")
+                return
+        try:
+            info.create(quantum=quantum, q1=q1, q2=q2, **options)
+        except ValueError as exc:
+            messagebox.showerror("Invalid Settings", f"{info.name}: {exc}")
+            return
+
+        self._start_worker(algo, quantum, q1, q2, options)
+
+    def _start_worker(self, algo: str, quantum: int, q1: int, q2: int, options: Dict[str, object]) -> None:
+        title = algorithm_title(algo, quantum, q1, q2, **options)
+        progress = Progress()
+        stats = SimStats() if self.stats_var.get() else None
+        if stats is not None and self._load_seconds is not None:
+            stats.phases["load"] = self._load_seconds
+        self._progress = progress
+        self._outcome = None
+
+        def work() -> None:
+            try:
+                self._outcome = ("done", self._simulate(algo, quantum, q1, q2, options, progress, stats))
+            except SimulationCancelled:
+                self._outcome = ("cancelled", None)
+            except Exception as exc:
+                self._outcome = ("error", exc)
+
+        self._set_busy(True)
+        self.progress_bar["value"] = 0.0
+        self.progress_label.config(text=f"Running {title}...")
+        self._worker = threading.Thread(target=work, daemon=True)
+        self._worker.start()
+        self.after(self.POLL_MS, self._poll_worker, title, stats)
+
+    def _poll_worker(self, title: str, stats: Optional[SimStats]) -> None:
+        worker, progress = self._worker, self._progress
+        if worker is None or progress is None:
+            return
+        if worker.is_alive():
+            self.progress_bar["value"] = progress.fraction
+            self.progress_label.config(
+                text=f"Running {title}: {progress.completed}/{progress.total} done, t = {progress.time}"
+            )
+            self.after(self.POLL_MS, self._poll_worker, title, stats)
+            return
+
+        self._worker = None
+        self._progress = None
+        self._set_busy(False)
+        status, value = self._outcome or ("error", RuntimeError("simulation thread exited"))
+        if status == "done":
+            self.progress_bar["value"] = 1.0
+            self.progress_label.config(text=f"{title}: {len(self.processes)} processes")
+            with timed(stats, "render"):
+                self._build_results(title)
+                self._draw_gantt(value)
+                self.update_idletasks()
+            if stats is not None:
+                self.results_text.insert(tk.END, "\n\n" + "\n".join(format_sim_stats(stats)))
+            return
+        # The interrupted run left its checkpoints and the table's stats
+        # half-written, so the next run has to start from scratch.
+        self._run = None
+        self.progress_bar["value"] = 0.0
+        if status == "cancelled":
+            self.progress_label.config(text=f"{title} cancelled.")
+        else:
+            self.progress_label.config(text=f"{title} failed.")
+            messagebox.showerror("Simulation Failed", str(value))
+
+    def _set_busy(self, busy: bool) -> None:
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in self._busy_buttons:
+            button.config(state=state)
+        self.cancel_btn.config(state=tk.NORMAL if busy else tk.DISABLED)
+
+    def cancel_run(self) -> None:
+        if self._progress is not None:
+            self._progress.cancel()
+            self.progress_label.config(text="Cancelling...")
+
+    def _on_close(self) -> None:
+        self.cancel_run()
+        self.destroy()
+
+    def _simulate(
+        self,
+        algo: str,
+        quantum: int,
+        q1: int,
+        q2: int,
+        options: Dict[str, object],
+        progress: Optional[Progress] = None,
+        stats: Optional[SimStats] = None,
+    ) -> Timeline:
+        # Same table and settings as last time: only processes were added since,
+        # so resume from the checkpoint before the earliest new arrival.
+        if self._run is not None and self._run.matches(self.processes, algo, quantum, q1, q2, **options):
+            segments = self._run.resume(progress, stats)
+        else:
+            with timed(stats, "sort"):
+                self.processes.sort_by_arrival()
+            segments = self._cache.get(self.processes, algo, quantum, q1, q2, **options)
+            if segments is not None:
+                # The cached result overwrote the table's stats, so the old
+                # run's checkpoints no longer match them.
+                self._run = None
+                if stats is not None:
+                    stats.record_uncounted(segments)
+                return segments
+            self._run = IncrementalRun(self.processes, algo, quantum, q1, q2, **options)
+            segments = self._run.run(progress, stats)
+        self._cache.put(self.processes, algo, segments, quantum, q1, q2, **options)
+        return segments
+
+
+def main() -> None:
+    app = SchedulerApp()
+    app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
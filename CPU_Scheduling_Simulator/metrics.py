@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from algorithm import ProcessTable, SimStats
+
+QUANTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99))
+
+
+class LatencyHistogram:
+    # Log-linear histogram (HDR style): values below 2**SUB_BITS get exact
+    # buckets, larger ones one of 2**(SUB_BITS-1) buckets per power of two. A
+    # reported quantile is the upper edge of its bucket, so it is never low and
+    # at most 1/64 above the true value. Fixed size, so it can be fed chunk by
+    # chunk and merged.
+    SUB_BITS = 7
+    SUB = 1 << SUB_BITS
+    HALF = SUB >> 1
+    BUCKETS = SUB + (63 - SUB_BITS) * HALF
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(self.BUCKETS, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.int64)
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += int(values.sum())
+        self.max = max(self.max, int(values.max()))
+        self.counts += np.bincount(self._buckets(values), minlength=self.BUCKETS)
+
+    def _buckets(self, values: np.ndarray) -> np.ndarray:
+        values = np.maximum(values, 0)
+        index = values.copy()
+        big = values >= self.SUB
+        if big.any():
+            v = values[big]
+            # frexp gives the bit length; float rounding can push it one too
+            # high for values just below a large power of two
+            shift = np.frexp(v.astype(np.float64))[1].astype(np.int64) - self.SUB_BITS
+            mantissa = v >> shift
+            low = mantissa < self.HALF
+            shift[low] -= 1
+            mantissa[low] = v[low] >> shift[low]
+            index[big] = self.SUB + (shift - 1) * self.HALF + (mantissa - self.HALF)
+        return index
+
+    def _upper_edge(self, bucket: int) -> int:
+        if bucket < self.SUB:
+            return bucket
+        shift, offset = divmod(bucket - self.SUB, self.HALF)
+        shift += 1
+        return ((offset + self.HALF + 1) << shift) - 1
+
+    def merge(self, other: LatencyHistogram) -> None:
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(1, int(np.ceil(q * self.count)))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(self._upper_edge(bucket), self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class Percentiles:
+    p50: int
+    p90: int
+    p99: int
+    max: int
+    mean: float
+
+    @classmethod
+    def from_histogram(cls, hist: LatencyHistogram) -> Percentiles:
+        return cls(*(hist.quantile(q) for _, q in QUANTILES), max=hist.max, mean=hist.mean)
+
+
+@dataclass
+class TailStats:
+    count: int
+    waiting: Percentiles
+    turnaround: Percentiles
+    response: Percentiles
+    # Completed processes and busy fraction over [first arrival, last completion]
+    throughput: float
+    utilization: float
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+class TailAccumulator:
+    # Running state behind tail_stats: three histograms plus the totals that
+    # throughput and utilization need. Fed chunk by chunk, so it also works
+    # on streamed results that never exist as one table.
+    METRICS = ("waiting", "turnaround", "response")
+
+    def __init__(self) -> None:
+        self.hists = {name: LatencyHistogram() for name in self.METRICS}
+        self.count = 0
+        self.first_arrival: Optional[int] = None
+        self.last_completion = 0
+        self.busy = 0
+
+    def add(
+        self,
+        arrival: np.ndarray,
+        burst: np.ndarray,
+        completion: np.ndarray,
+        waiting: np.ndarray,
+        turnaround: np.ndarray,
+        response: np.ndarray,
+    ) -> None:
+        if not len(arrival):
+            return
+        for hist, values in zip(self.hists.values(), (waiting, turnaround, response)):
+            hist.add(values)
+        self.count += len(arrival)
+        low = int(np.min(arrival))
+        self.first_arrival = low if self.first_arrival is None else min(self.first_arrival, low)
+        self.last_completion = max(self.last_completion, int(np.max(completion)))
+        self.busy += int(np.sum(burst))
+
+    def result(self) -> TailStats:
+        span = self.last_completion - (self.first_arrival or 0)
+        return TailStats(
+            count=self.count,
+            waiting=Percentiles.from_histogram(self.hists["waiting"]),
+            turnaround=Percentiles.from_histogram(self.hists["turnaround"]),
+            response=Percentiles.from_histogram(self.hists["response"]),
+            throughput=self.count / span if span > 0 else 0.0,
+            utilization=self.busy / span if span > 0 else 0.0,
+        )
+
+
+def tail_stats(table: ProcessTable, chunk: int = 1 << 16) -> TailStats:
+    # One pass over the result columns in chunks
+    acc = TailAccumulator()
+    for lo in range(0, len(table), chunk):
+        hi = lo + chunk
+        acc.add(
+            table.arrival[lo:hi],
+            table.burst[lo:hi],
+            table.completion[lo:hi],
+            table.waiting[lo:hi],
+            table.turnaround[lo:hi],
+            table.response[lo:hi],
+        )
+    return acc.result()
+
+
+def format_tail_stats(stats: TailStats) -> List[str]:
+    lines = [f"{'':<12}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}{'mean':>12}"]
+    for name in ("waiting", "turnaround", "response"):
+        p: Percentiles = getattr(stats, name)
+        lines.append(f"{name.capitalize():<12}{p.p50:>10}{p.p90:>10}{p.p99:>10}{p.max:>10}{p.mean:>12.2f}")
+    lines.append(f"Throughput: {stats.throughput:.4f} processes/unit")
+    lines.append(f"CPU Utilization: {stats.utilization:.1%}")
+    return lines
+
+
+def format_sim_stats(stats: SimStats) -> List[str]:
+    if not stats.counted:
+        lines = [
+            f"Context Switches: {stats.context_switches}  Idle Time: {stats.idle_time}",
+            "Dispatch and queue counters: n/a (cached or parallel result)",
+        ]
+    else:
+        lines = [
+            f"Dispatches: {stats.dispatches}  Preemptions: {stats.preemptions}  "
+            f"Context Switches: {stats.context_switches}",
+            f"Queue Pushes: {stats.queue_pushes}  Pops: {stats.queue_pops}  Idle Time: {stats.idle_time}",
+        ]
+    if stats.counted and stats.demotions:
+        demoted = ", ".join(f"Q{level + 1}: {count}" for level, count in sorted(stats.demotions.items()))
+        lines.append(f"Demotions: {demoted}")
+    if stats.phases:
+        lines.append("Phases: " + ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in stats.phases.items()))
+    return lines
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import csv
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from algorithm import (
+    ProcessTable,
+    Timeline,
+    busy_period_starts,
+    count_context_switches,
+    summarize,
+    load_trace,
+    reset_stats,
+    run_algorithm,
+    write_trace,
+)
+
+
+@dataclass
+class SweepResult:
+    algorithm: str
+    quantum: Optional[int]
+    q1: Optional[int]
+    q2: Optional[int]
+    avg_waiting: float
+    avg_turnaround: float
+    context_switches: int
+
+
+# Set once per worker process by _init_worker
+_worker_table: Optional[ProcessTable] = None
+
+
+def _init_worker(trace_path: str) -> None:
+    global _worker_table
+    _worker_table = load_trace(trace_path)
+
+
+def _simulate_setting(table: ProcessTable, setting: Tuple[str, int, int, int]) -> SweepResult:
+    algorithm, quantum, q1, q2 = setting
+    reset_stats(table)
+    segments = run_algorithm(table, algorithm, quantum=quantum, q1=q1, q2=q2)
+    summary = summarize(table)
+    return SweepResult(
+        algorithm=algorithm,
+        quantum=quantum if algorithm == "RR" else None,
+        q1=q1 if algorithm == "MLFQ" else None,
+        q2=q2 if algorithm == "MLFQ" else None,
+        avg_waiting=summary.avg_waiting,
+        avg_turnaround=summary.avg_turnaround,
+        context_switches=count_context_switches(segments),
+    )
+
+
+def _worker_task(setting: Tuple[str, int, int, int]) -> SweepResult:
+    assert _worker_table is not None
+    return _simulate_setting(_worker_table, setting)
+
+
+def run_sweep(
+    table: ProcessTable, settings: Sequence[Tuple[str, int, int, int]], workers: Optional[int] = None
+) -> List[SweepResult]:
+    table.sort_by_arrival()
+    if workers == 1 or len(settings) <= 1:
+        return [_simulate_setting(table, setting) for setting in settings]
+
+    # Workers share the trace through a memory-mapped temporary trace file
+    # (page cache), so it is written once instead of pickled per task.
+    fd, trace_path = tempfile.mkstemp(suffix=".trace")
+    os.close(fd)
+    try:
+        write_trace(trace_path, table)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(trace_path,)
+        ) as pool:
+            return list(pool.map(_worker_task, settings))
+    finally:
+        os.remove(trace_path)
+
+
+# (completion, remaining, response, timeline pids, starts, ends) for one shard
+ShardResult = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+# (algorithm, quantum, q1, q2, policy options, first row, end row)
+ShardTask = Tuple[str, int, int, int, Dict[str, object], int, int]
+
+
+def _simulate_shard(table: ProcessTable, task: ShardTask) -> ShardResult:
+    algorithm, quantum, q1, q2, options, lo, hi = task
+    shard = ProcessTable(table.pid[lo:hi], table.arrival[lo:hi], table.burst[lo:hi], arrival_sorted=True)
+    segments = run_algorithm(shard, algorithm, quantum=quantum, q1=q1, q2=q2, **options)
+    return (shard.completion, shard.remaining, shard.response) + segments.arrays()
+
+
+def _shard_worker_task(task: ShardTask) -> ShardResult:
+    assert _worker_table is not None
+    return _simulate_shard(_worker_table, task)
+
+
+def shard_bounds(table: ProcessTable, shards: int) -> List[Tuple[int, int]]:
+    # Groups whole busy periods into at most `shards` contiguous row ranges of
+    # roughly equal job counts.
+    n = len(table)
+    starts = busy_period_starts(table)
+    targets = np.arange(1, shards) * (n / shards)
+    picked = np.searchsorted(starts, targets)
+    cuts = np.unique(starts[picked[picked < len(starts)]])
+    edges = [0] + [int(c) for c in cuts if 0 < c < n] + [n]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def run_sharded(
+    table: ProcessTable,
+    algorithm: str,
+    quantum: int = 2,
+    q1: int = 2,
+    q2: int = 4,
+    workers: Optional[int] = None,
+    shards: Optional[int] = None,
+    **options: object,
+) -> Timeline:
+    # Every queue is empty whenever the CPU goes idle, so busy periods can be
+    # simulated independently and stitched back together. Produces the same
+    # timeline and stats as run_algorithm. (MLFQ boosts fall on multiples of
+    # the period and a boost is a no-op on an idle CPU, so they split too.)
+    algorithm = algorithm.upper()
+    table.sort_by_arrival()
+    reset_stats(table)
+    workers = workers or os.cpu_count() or 1
+    bounds = shard_bounds(table, shards or workers * 4)
+    if workers == 1 or len(bounds) <= 1:
+        return run_algorithm(table, algorithm, quantum=quantum, q1=q1, q2=q2, **options)
+
+    tasks = [(algorithm, quantum, q1, q2, options, lo, hi) for lo, hi in bounds]
+    fd, trace_path = tempfile.mkstemp(suffix=".trace")
+    os.close(fd)
+    try:
+        write_trace(trace_path, table)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(trace_path,)
+        ) as pool:
+            results = list(pool.map(_shard_worker_task, tasks))
+    finally:
+        os.remove(trace_path)
+
+    columns: List[List[np.ndarray]] = [[], [], []]
+    prev_end: Optional[int] = None
+    for (lo, hi), (completion, remaining, response, pids, starts, ends) in zip(bounds, results):
+        table.completion[lo:hi] = completion
+        table.remaining[lo:hi] = remaining
+        table.response[lo:hi] = response
+        if prev_end is not None:
+            # Each later shard opens with idle time from 0 up to its first
+            # arrival; it really starts where the previous shard ended.
+            starts = starts.copy()
+            starts[0] = prev_end
+        prev_end = int(ends[-1])
+        for column, values in zip(columns, (pids, starts, ends)):
+            column.append(values)
+    np.subtract(table.completion, table.arrival, out=table.turnaround)
+    np.subtract(table.turnaround, table.burst, out=table.waiting)
+    return Timeline.from_arrays(*(np.concatenate(column) for column in columns))
+
+
+def sweep_rr(table: ProcessTable, quanta: Iterable[int], workers: Optional[int] = None) -> List[SweepResult]:
+    settings = [("RR", quantum, 0, 0) for quantum in quanta]
+    return run_sweep(table, settings, workers)
+
+
+def sweep_mlfq(
+    table: ProcessTable,
+    q1_values: Iterable[int],
+    q2_values: Iterable[int],
+    workers: Optional[int] = None,
+) -> List[SweepResult]:
+    q2_values = list(q2_values)
+    settings = [("MLFQ", 0, q1, q2) for q1 in q1_values for q2 in q2_values]
+    return run_sweep(table, settings, workers)
+
+
+def parse_int_values(text: str) -> List[int]:
+    # "1,2,4" or "1:8" (inclusive) or "2:16:2", comma-separated parts may be mixed
+    values: List[int] = []
+    for part in text.split(","):
+        bounds = [int(x) for x in part.split(":")]
+        if len(bounds) == 1:
+            values.append(bounds[0])
+        elif len(bounds) in (2, 3):
+            step = bounds[2] if len(bounds) == 3 else 1
+            if step <= 0:
+                raise ValueError(f"step must be > 0 in {part!r}")
+            values.extend(range(bounds[0], bounds[1] + 1, step))
+        else:
+            raise ValueError(f"bad range {part!r}")
+    if not values or min(values) <= 0:
+        raise ValueError("values must be > 0")
+    return values
+
+
+def print_sweep(results: List[SweepResult]) -> None:
+    print("Algorithm\tQuantum\tQ1\tQ2\tAvg WT\tAvg TAT\tSwitches")
+    for r in results:
+        quantum, q1, q2 = (("-" if v is None else v) for v in (r.quantum, r.q1, r.q2))
+        print(
+            f"{r.algorithm}\t{quantum}\t{q1}\t{q2}\t"
+            f"{r.avg_waiting:.2f}\t{r.avg_turnaround:.2f}\t{r.context_switches}"
+        )
+
+
+def write_sweep_csv(results: List[SweepResult], out: TextIO = sys.stdout) -> None:
+    writer = csv.DictWriter(out, fieldnames=list(SweepResult.__dataclass_fields__))
+    writer.writeheader()
+    writer.writerows(asdict(r) for r in results)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import sys
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+from algorithm import (
+    FCFSPolicy,
+    LoadReport,
+    MLFQPolicy,
+    Policy,
+    PolicyLoop,
+    RRPolicy,
+    SJFPolicy,
+    SimStats,
+    SRTFPolicy,
+    get_policy,
+    is_trace_file,
+    iter_processes_from_file,
+    map_trace,
+)
+
+# Streaming counterparts of the simulate_* functions: arrivals come from an
+# iterator of (pid, arrival, burst) in arrival order and results go out in
+# small batches once they are final, so memory grows with the ready queue
+# only. Given the rows of an arrival-sorted table they produce the same
+# segments (merged like Timeline.add does) and stats as the batch simulators.
+
+
+class Segment(NamedTuple):
+    pid: int
+    start: int
+    end: int
+
+
+class Finished(NamedTuple):
+    pid: int
+    arrival: int
+    burst: int
+    completion: int
+    turnaround: int
+    waiting: int
+    response: int
+
+
+Event = Union[Segment, Finished]
+Arrival = Tuple[int, int, int]
+
+
+def _finished(pid: int, arrival: int, burst: int, completion: int, first_run: int) -> Finished:
+    turnaround = completion - arrival
+    return Finished(pid, arrival, burst, completion, turnaround, turnaround - burst, first_run - arrival)
+
+
+class _Arrivals:
+    # One-item lookahead over the arrival iterator; `time` is the next
+    # arrival time or None once the stream is exhausted.
+    def __init__(self, arrivals: Iterable[Arrival]) -> None:
+        self._it = iter(arrivals)
+        self.seq = 0
+        self.time: Optional[int] = None
+        self._next: Optional[Arrival] = None
+        self._advance()
+
+    def _advance(self) -> None:
+        row = next(self._it, None)
+        if row is None:
+            self.time = None
+            self._next = None
+            return
+        pid, arrival, burst = (int(v) for v in row)
+        if self._next is not None and arrival < self._next[1]:
+            raise ValueError(f"arrivals out of order: pid {pid} at {arrival} after {self._next[1]}")
+        if burst <= 0:
+            raise ValueError(f"pid {pid}: burst time must be > 0")
+        self._next = (pid, arrival, burst)
+        self.time = arrival
+
+    def pop(self) -> Tuple[int, int, int, int]:
+        # (seq, pid, arrival, burst); seq breaks ties like the batch row index
+        assert self._next is not None
+        pid, arrival, burst = self._next
+        seq = self.seq
+        self.seq += 1
+        self._advance()
+        return seq, pid, arrival, burst
+
+
+# Arrivals loaded at a time, and loop steps between passing results on
+_WINDOW = 4096
+
+
+def stream_policy(
+    arrivals: Iterable[Arrival], policy: Policy, stats: Optional[SimStats] = None
+) -> Iterator[Event]:
+    # simulate_policy's PolicyLoop with arrival sequence numbers as the job
+    # indices. Arrivals are loaded a window at a time as the loop needs them,
+    # and every _WINDOW steps the segments that can no longer grow and the
+    # finished processes are passed on and their entries dropped.
+    src = _Arrivals(arrivals)
+    pids: Dict[int, int] = {}
+    arrival: Dict[int, Optional[int]] = {0: src.time}
+    burst: Dict[int, int] = {}
+    remaining: Dict[int, int] = {}
+    completion: Dict[int, int] = {}
+    first_run: Dict[int, int] = {}
+
+    def load() -> int:
+        for _ in range(_WINDOW):
+            if src.time is None:
+                break
+            seq, pid, time, length = src.pop()
+            pids[seq] = pid
+            arrival[seq] = time
+            burst[seq] = remaining[seq] = length
+        arrival[src.seq] = src.time
+        return src.seq
+
+    loop = PolicyLoop(
+        policy, range(sys.maxsize), arrival, pids, burst, remaining, completion, first_run, 0, stats=stats, load=load
+    )
+    segments = loop.segments
+
+    def results(keep: int) -> Iterator[Event]:
+        # The last segment stays behind in case the next step extends it
+        if len(segments) > keep:
+            columns = segments.pop_front(len(segments) - keep)
+            if stats is not None:
+                stats.record_segments(*columns)
+            for row in zip(*(column.tolist() for column in columns)):
+                yield Segment(*row)
+        for seq, end in completion.items():
+            del remaining[seq]
+            yield _finished(pids.pop(seq), arrival.pop(seq), burst.pop(seq), end, first_run.pop(seq))
+        completion.clear()
+
+    loop.run(pause=_WINDOW)
+    while loop.completed < loop.count:
+        yield from results(keep=1)
+        loop.run(pause=_WINDOW)
+    yield from results(keep=0)
+    if stats is not None:
+        stats.record_steps(src.seq, loop.completed)
+
+
+def stream_fcfs(arrivals: Iterable[Arrival], stats: Optional[SimStats] = None) -> Iterator[Event]:
+    return stream_policy(arrivals, FCFSPolicy(), stats)
+
+
+def stream_sjf(arrivals: Iterable[Arrival], stats: Optional[SimStats] = None) -> Iterator[Event]:
+    return stream_policy(arrivals, SJFPolicy(), stats)
+
+
+def stream_srtf(arrivals: Iterable[Arrival], stats: Optional[SimStats] = None) -> Iterator[Event]:
+    return stream_policy(arrivals, SRTFPolicy(), stats)
+
+
+def stream_rr(arrivals: Iterable[Arrival], quantum: int, stats: Optional[SimStats] = None) -> Iterator[Event]:
+    return stream_policy(arrivals, RRPolicy(quantum), stats)
+
+
+def stream_mlfq(
+    arrivals: Iterable[Arrival], q1: int = 2, q2: int = 4, stats: Optional[SimStats] = None
+) -> Iterator[Event]:
+    return stream_policy(arrivals, MLFQPolicy(q1, q2), stats)
+
+
+def stream_algorithm(
+    arrivals: Iterable[Arrival],
+    algorithm: str,
+    quantum: int = 2,
+    q1: int = 2,
+    q2: int = 4,
+    stats: Optional[SimStats] = None,
+    **options: object,
+) -> Iterator[Event]:
+    policy = get_policy(algorithm).create(quantum=quantum, q1=q1, q2=q2, **options)
+    return stream_policy(arrivals, policy, stats)
+
+
+def iter_arrivals(path: str, report: Optional[LoadReport] = None, chunk_rows: int = 1 << 16) -> Iterator[Arrival]:
+    # (pid, arrival, burst) rows of a text file or binary trace, read chunk by
+    # chunk; a binary trace must be arrival-sorted (convert it with --sort).
+    if not is_trace_file(path):
+        for p in iter_processes_from_file(path, report):
+            yield p.pid, p.arrival_time, p.burst_time
+        return
+    columns, arrival_sorted = map_trace(path)
+    if not arrival_sorted:
+        raise ValueError(f"{path}: trace is not arrival-sorted")
+    for lo in range(0, columns.shape[1], chunk_rows):
+        chunk = columns[:, lo : lo + chunk_rows]
+        yield from zip(chunk[0].tolist(), chunk[1].tolist(), chunk[2].tolist())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from typing import Dict, List
+
+import numpy as np
+
+from algorithm import ProcessTable, run_algorithm
+from cache import ResultCache, run_cached
+
+# The result cache: keys, LRU eviction, .npz storage and invalidation.
+
+
+def make_table(seed: int, n: int = 200) -> ProcessTable:
+    rng = np.random.default_rng(seed)
+    return ProcessTable(np.arange(n), np.sort(rng.integers(0, 3 * n, n)), rng.integers(1, 20, n), arrival_sorted=True)
+
+
+def fresh(table: ProcessTable) -> ProcessTable:
+    # Same process set, result columns not filled in
+    return ProcessTable(table.pid.copy(), table.arrival.copy(), table.burst.copy(), arrival_sorted=True)
+
+
+def result_columns(table: ProcessTable) -> Dict[str, List[int]]:
+    keys = ("remaining", "completion", "turnaround", "waiting", "response")
+    return {key: getattr(table, key).tolist() for key in keys}
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.dir = self._dir.name
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def store(self, cache: ResultCache, table: ProcessTable, algorithm: str, **settings: int) -> None:
+        cache.put(table, algorithm, run_algorithm(table, algorithm, **settings), **settings)
+
+    def test_hit_restores_results(self) -> None:
+        cache = ResultCache()
+        table = make_table(0)
+        timeline = run_algorithm(table, "RR", quantum=3)
+        cache.put(table, "RR", timeline, quantum=3)
+        copy = fresh(table)
+        self.assertEqual(list(cache.get(copy, "RR", quantum=3)), list(timeline))
+        self.assertEqual(result_columns(copy), result_columns(table))
+        self.assertIsNone(cache.get(copy, "RR", quantum=4))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_key(self) -> None:
+        table = make_table(1)
+        # Parameters an algorithm does not use are not part of its key
+        self.assertEqual(ResultCache.key(table, "FCFS", quantum=2), ResultCache.key(table, "FCFS", quantum=5))
+        self.assertNotEqual(ResultCache.key(table, "RR", quantum=2), ResultCache.key(table, "RR", quantum=5))
+        self.assertNotEqual(ResultCache.key(table, "MLFQ"), ResultCache.key(table, "MLFQ", boost=50))
+        self.assertNotEqual(ResultCache.key(table, "SJF"), ResultCache.key(make_table(2), "SJF"))
+        self.assertEqual(ResultCache.key(table, "SJF"), ResultCache.key(fresh(table), "SJF"))
+
+    def test_lru_eviction(self) -> None:
+        cache = ResultCache(max_entries=2)
+        table = make_table(3)
+        self.store(cache, table, "FCFS")
+        self.store(cache, table, "SJF")
+        self.assertIsNotNone(cache.get(table, "FCFS"))
+        self.store(cache, table, "SRTF")
+        # SJF was the least recently used
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(table, "SJF"))
+        self.assertIsNotNone(cache.get(table, "FCFS"))
+        self.assertIsNotNone(cache.get(table, "SRTF"))
+
+    def test_disk(self) -> None:
+        table = make_table(4)
+        self.store(ResultCache(directory=self.dir), table, "MLFQ", q1=1, q2=3)
+        self.assertEqual(len(os.listdir(self.dir)), 1)
+        self.assertTrue(os.listdir(self.dir)[0].endswith(".npz"))
+        # A new cache on the same directory reads it back, and an evicted
+        # entry is reloaded from its file
+        cache = ResultCache(max_entries=1, directory=self.dir)
+        copy = fresh(table)
+        expected = run_algorithm(fresh(table), "MLFQ", q1=1, q2=3)
+        self.assertEqual(list(cache.get(copy, "MLFQ", q1=1, q2=3)), list(expected))
+        self.assertEqual(result_columns(copy), result_columns(table))
+        self.store(cache, table, "FCFS")
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get(fresh(table), "MLFQ", q1=1, q2=3))
+        self.assertEqual(cache.misses, 0)
+
+    def test_invalidate(self) -> None:
+        cache = ResultCache(directory=self.dir)
+        table, other = make_table(5), make_table(6)
+        for algorithm in ("FCFS", "SJF"):
+            self.store(cache, table, algorithm)
+            self.store(cache, other, algorithm)
+        cache.invalidate(table)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(len(os.listdir(self.dir)), 2)
+        self.assertIsNone(cache.get(table, "FCFS"))
+        self.assertIsNone(cache.get(table, "SJF"))
+        self.assertIsNotNone(cache.get(other, "SJF"))
+        # A table whose digest was never computed has nothing cached
+        cache.invalidate(fresh(other))
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual((len(cache), os.listdir(self.dir)), (0, []))
+
+    def test_digest_follows_edits(self) -> None:
+        # Changing the process set gives it a new key, so a stale entry is
+        # never served for it
+        cache = ResultCache()
+        table = make_table(7)
+        self.store(cache, table, "SRTF")
+        table.burst[0] += 1
+        table.forget_digest()
+        self.assertIsNone(cache.get(table, "SRTF"))
+
+    def test_run_cached(self) -> None:
+        cache = ResultCache(directory=self.dir)
+        table = make_table(8)
+        first = run_cached(table, "RR", quantum=2, cache=cache)
+        columns = result_columns(table)
+        copy = fresh(table)
+        self.assertEqual(list(run_cached(copy, "RR", quantum=2, cache=cache)), list(first))
+        self.assertEqual(result_columns(copy), columns)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import io
+import json
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from typing import List, Tuple
+from unittest import mock
+
+import numpy as np
+
+import export
+from algorithm import ProcessTable, Timeline, run_algorithm
+from export import ChromeTraceWriter, GanttRaster, encode_png, export_timeline
+
+# Timeline exporters: Chrome-trace JSON and the PNG Gantt bar.
+
+
+def make_timeline(seed: int, n: int = 3000) -> Timeline:
+    # Busy stretches with idle gaps, and a few long jobs
+    rng = np.random.default_rng(seed)
+    arrival = np.sort(rng.integers(0, 8 * n, n))
+    burst = np.where(rng.random(n) < 0.01, rng.integers(100, 2000, n), rng.integers(1, 12, n))
+    return run_algorithm(ProcessTable(np.arange(n), arrival, burst), "RR", quantum=4)
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    # Just enough of a PNG reader for encode_png's output; checks every CRC
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind, body = data[pos + 4 : pos + 8], data[pos + 8 : pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length : pos + 12 + length])
+        assert crc == zlib.crc32(kind + body) & 0xFFFFFFFF, kind
+        chunks[kind] = body
+        pos += 12 + length
+    width, height, depth, color, _, _, _ = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    assert (depth, color) == (8, 2) and b"IEND" in chunks
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, width * 3 + 1)
+    assert not raw[:, 0].any()
+    return raw[:, 1:].reshape(height, width, 3)
+
+
+class ChromeTraceTest(unittest.TestCase):
+    def events(self, text: str) -> Tuple[List[dict], List[dict]]:
+        data = json.loads(text)
+        self.assertEqual(data["displayTimeUnit"], "ms")
+        runs = [event for event in data["traceEvents"] if event["ph"] == "X"]
+        meta = [event for event in data["traceEvents"] if event["ph"] == "M"]
+        self.assertEqual(len(runs) + len(meta), len(data["traceEvents"]))
+        return runs, meta
+
+    def test_empty(self) -> None:
+        out = io.StringIO()
+        ChromeTraceWriter(out, "FCFS").close()
+        runs, meta = self.events(out.getvalue())
+        self.assertEqual(runs, [])
+        self.assertEqual(meta, [{"name": "process_name", "ph": "M", "pid": 0, "args": {"name": "FCFS"}}])
+
+    def test_segments(self) -> None:
+        # More events than one buffered chunk, fed in every way the callers
+        # do, with a title that needs escaping
+        timeline = make_timeline(0)
+        pids, starts, ends = timeline.arrays()
+        out = io.StringIO()
+        with ChromeTraceWriter(out, 'RR "Q=4"\\') as writer:
+            writer.name_tracks(np.unique(pids[pids != -1]))
+            writer.add_arrays(pids[:1000], starts[:1000], ends[:1000])
+            for pid, start, end in zip(pids[1000:1500].tolist(), starts[1000:1500].tolist(), ends[1000:1500].tolist()):
+                writer.add(pid, start, end)
+            writer.add_arrays(pids[1500:].tolist(), starts[1500:].tolist(), ends[1500:].tolist())
+        runs, meta = self.events(out.getvalue())
+        busy = [(pid, start, end) for pid, start, end in timeline if pid != -1]
+        self.assertGreater(len(busy), export._CHUNK)
+        self.assertEqual([(event["tid"], event["ts"], event["ts"] + event["dur"]) for event in runs], busy)
+        self.assertEqual({event["name"] for event in runs}, {f"P{pid}" for pid, _, _ in busy})
+        self.assertEqual(meta[0]["args"]["name"], 'RR "Q=4"\\')
+        names = {event["tid"]: event["args"]["name"] for event in meta if event["name"] == "thread_name"}
+        self.assertEqual(names, {pid: f"P{pid}" for pid, _, _ in busy})
+
+
+class GanttRasterTest(unittest.TestCase):
+    def test_same_image_however_chunked(self) -> None:
+        timeline = make_timeline(1)
+        pids, starts, ends = timeline.arrays()
+        rng = np.random.default_rng(2)
+        for width in (2, 7, 64, 333):
+            whole = GanttRaster(width, 5)
+            whole.add_arrays(pids, starts, ends)
+            expected = whole.pixels()
+            self.assertGreater(whole.bin, 1)
+
+            single = GanttRaster(width, 5)
+            for row in zip(pids.tolist(), starts.tolist(), ends.tolist()):
+                single.add(*row)
+            cuts = np.sort(rng.choice(len(ends), 40, replace=False))
+            chunked = GanttRaster(width, 5)
+            for p, s, e in zip(*(np.split(column, cuts) for column in (pids, starts, ends))):
+                chunked.add_arrays(p, s, e)
+            with mock.patch.object(export, "_CHUNK", 3):
+                small = GanttRaster(width, 5)
+                for row in zip(pids.tolist(), starts.tolist(), ends.tolist()):
+                    small.add(*row)
+                small_pixels = small.pixels()
+
+            for raster, pixels in ((single, single.pixels()), (chunked, chunked.pixels()), (small, small_pixels)):
+                self.assertEqual((raster.bin, raster.end), (whole.bin, whole.end), width)
+                self.assertTrue(np.array_equal(pixels, expected), width)
+
+    def test_bins(self) -> None:
+        # No halving: every bin holds exactly its busy time and longest run
+        raster = GanttRaster(10, 3)
+        for segment in ((1, 0, 3), (-1, 3, 4), (2, 4, 5), (3, 5, 9), (1, 9, 10)):
+            raster.add(*segment)
+        raster.pixels()
+        self.assertEqual(raster.bin, 1)
+        self.assertEqual(raster.busy.tolist(), [1, 1, 1, 0, 1, 1, 1, 1, 1, 1])
+        self.assertEqual(raster.pid.tolist(), [1, 1, 1, -1, 2, 3, 3, 3, 3, 1])
+        # One more unit halves the bins; a tie keeps the earlier pid
+        raster.add(2, 10, 11)
+        raster.pixels()
+        self.assertEqual(raster.bin, 2)
+        self.assertEqual(raster.busy.tolist(), [2, 1, 2, 2, 2, 1, 0, 0, 0, 0])
+        self.assertEqual(raster.pid.tolist(), [1, 1, 2, 3, 3, 2, -1, -1, -1, -1])
+
+    def test_png(self) -> None:
+        raster = GanttRaster(50, 4)
+        timeline = make_timeline(3, 200)
+        raster.add_arrays(*timeline.arrays())
+        pixels = raster.pixels()
+        self.assertEqual(pixels.shape, (4, 50, 3))
+        self.assertTrue(np.array_equal(decode_png(encode_png(pixels)), pixels))
+        self.assertTrue((pixels[0] == export.OUTLINE_RGB).all())
+
+    def test_export_timeline(self) -> None:
+        timeline = make_timeline(4, 500)
+        with tempfile.TemporaryDirectory() as directory:
+            trace, png = os.path.join(directory, "t.json"), os.path.join(directory, "t.png")
+            export_timeline(timeline, range(500), trace, png, png_width=80, title="RR")
+            with open(trace) as f:
+                data = json.load(f)
+            with open(png, "rb") as f:
+                image = decode_png(f.read())
+        self.assertEqual(sum(event["ph"] == "X" for event in data["traceEvents"]), sum(p != -1 for p, _, _ in timeline))
+        raster = GanttRaster(80)
+        raster.add_arrays(*timeline.arrays())
+        self.assertTrue(np.array_equal(image, raster.pixels()))
+
+
+if __name__ == "__main__":
+    unittest.main()
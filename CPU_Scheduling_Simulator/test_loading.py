@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from typing import Callable
+
+import numpy as np
+
+from algorithm import (
+    LoadReport,
+    ProcessTable,
+    _parse_chunk,
+    _parse_chunk_slow,
+    _tokenize_chunk,
+    convert_text_to_trace,
+    is_trace_file,
+    load_process_table,
+    load_trace,
+    map_trace,
+    open_process_file,
+    write_trace,
+)
+
+# Text loading and the binary trace format.
+
+
+def columns(table: ProcessTable) -> list:
+    return [table.pid.tolist(), table.arrival.tolist(), table.burst.tolist()]
+
+
+def random_lines(rng: np.random.Generator, n: int) -> list:
+    # Valid rows with assorted spacing and signs, plus the kinds of bad line
+    # the loader rejects
+    lines = []
+    for _ in range(n):
+        pid, arrival, burst = rng.integers(-(10**17), 10**17), rng.integers(0, 10**12), rng.integers(1, 10**9)
+        kind = rng.integers(0, 10)
+        if kind == 0:
+            lines.append(f"{pid}\t{arrival}")
+        elif kind == 1:
+            lines.append(f"{pid} -{arrival + 1} {burst}")
+        elif kind == 2:
+            lines.append(f"{pid} {arrival} {-burst if burst % 2 else 0}")
+        elif kind == 3:
+            lines.append("")
+        elif kind == 4:
+            lines.append(f"  +{abs(pid)}   {arrival}\t{burst} 7 8 \r")
+        else:
+            lines.append(f"{pid} {arrival} {burst}")
+    return lines
+
+
+def parsed(data: bytes, parse: Callable[[bytes, int, LoadReport], tuple]) -> tuple:
+    # The two parsers reject lines in a different order, so samples are
+    # compared sorted and all of them kept
+    report = LoadReport(max_samples=10**6)
+    columns = [column.tolist() for column in parse(data, 1, report)]
+    return columns, report.accepted, report.rejected, report.reasons, sorted(report.samples)
+
+
+class TokenizerTest(unittest.TestCase):
+    def test_matches_line_parser(self) -> None:
+        rng = np.random.default_rng(1)
+        for trial in range(20):
+            text = "\n".join(random_lines(rng, 200))
+            if trial % 2:
+                text += "\n"
+            data = text.encode()
+            self.assertIsNotNone(_tokenize_chunk(data))
+            self.assertEqual(parsed(data, _parse_chunk), parsed(data, _parse_chunk_slow))
+
+    def test_falls_back_on_other_tokens(self) -> None:
+        # Non-integers and numbers too long for the vectorized path
+        data = b"1 0 5\n2 x 3\n3 1.5 2\n4 2 3\n5 1 99999999999999999999\n6 7 1234567890123456789\n"
+        for line in data.splitlines():
+            if line not in (b"1 0 5", b"4 2 3"):
+                self.assertIsNone(_tokenize_chunk(line))
+        columns, accepted, rejected, reasons, samples = parsed(data, _parse_chunk)
+        self.assertEqual(columns, [[1, 4, 6], [0, 2, 7], [5, 3, 1234567890123456789]])
+        self.assertEqual((accepted, rejected), (3, 3))
+        self.assertEqual(reasons, {"non-integer field": 2, "value out of range": 1})
+        self.assertEqual(samples, [(2, "non-integer field"), (3, "non-integer field"), (5, "value out of range")])
+
+    def test_empty_and_blank(self) -> None:
+        for data in (b"", b"\n", b" \t\r\n\n  "):
+            self.assertEqual(parsed(data, _parse_chunk), ([[], [], []], 0, 0, {}, []))
+
+    def test_chunks_keep_line_numbers(self) -> None:
+        # Small chunks put the rejected lines in later chunks, and still
+        # report the line numbers of the whole file
+        lines = random_lines(np.random.default_rng(2), 500)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "p.txt")
+        with open(path, "w") as f:
+            f.write("\n".join(lines))
+        whole, chunked = LoadReport(max_samples=1000), LoadReport(max_samples=1000)
+        table = load_process_table(path, whole)
+        self.assertEqual(columns(load_process_table(path, chunked, chunk_bytes=256)), columns(table))
+        self.assertEqual(sorted(chunked.samples), sorted(whole.samples))
+        self.assertEqual(chunked.reasons, whole.reasons)
+        self.assertEqual(whole.accepted, len(table))
+        self.assertEqual(whole.accepted + whole.rejected, sum(bool(line.split()) for line in lines))
+
+    def test_report(self) -> None:
+        report = LoadReport(max_samples=2)
+        self.assertEqual(report.summary(), "Loaded 0 processes.")
+        report.accepted = 5
+        report.reject(3, "fewer than 3 fields")
+        report.reject(4, "negative arrival time", count=2)
+        report.reject(9, "fewer than 3 fields")
+        self.assertEqual(report.rejected, 4)
+        self.assertEqual(report.reasons, {"fewer than 3 fields": 2, "negative arrival time": 2})
+        self.assertEqual(report.samples, [(3, "fewer than 3 fields"), (4, "negative arrival time")])
+        self.assertEqual(
+            report.summary(),
+            "Loaded 5 processes, rejected 4 lines (2 fewer than 3 fields, 2 negative arrival time).",
+        )
+
+
+class TraceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.dir = self._dir.name
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def write_text(self, name: str, rows: list) -> str:
+        path = self.path(name)
+        with open(path, "w") as f:
+            f.writelines(f"{pid} {arrival} {burst}\n" for pid, arrival, burst in rows)
+        return path
+
+    def test_round_trip(self) -> None:
+        rng = np.random.default_rng(0)
+        arrival = np.sort(rng.integers(0, 10**12, 1000))
+        table = ProcessTable(np.arange(1000), arrival, rng.integers(1, 10**9, 1000))
+        write_trace(self.path("t.trace"), table)
+        self.assertTrue(is_trace_file(self.path("t.trace")))
+        mapped, arrival_sorted = map_trace(self.path("t.trace"))
+        self.assertTrue(arrival_sorted)
+        self.assertEqual(mapped.tolist(), columns(table))
+        loaded = load_trace(self.path("t.trace"))
+        self.assertTrue(loaded.arrival_sorted)
+        self.assertEqual(columns(loaded), columns(table))
+
+    def test_sorted_flag(self) -> None:
+        table = ProcessTable(np.array([1, 2, 3]), np.array([0, 5, 2]), np.array([1, 1, 1]))
+        write_trace(self.path("unsorted.trace"), table)
+        self.assertFalse(map_trace(self.path("unsorted.trace"))[1])
+        # Same arrival time: sorted only if the pids are in order as well
+        table = ProcessTable(np.array([2, 1]), np.array([4, 4]), np.array([1, 1]))
+        write_trace(self.path("tie.trace"), table)
+        self.assertFalse(map_trace(self.path("tie.trace"))[1])
+
+    def test_size_check(self) -> None:
+        table = ProcessTable(np.array([1, 2]), np.array([0, 1]), np.array([3, 4]))
+        path = self.path("t.trace")
+        write_trace(path, table)
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 8)
+        with self.assertRaisesRegex(ValueError, "expected"):
+            map_trace(path)
+        with open(path, "r+b") as f:
+            f.truncate(10)
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            map_trace(path)
+
+    def test_convert_matches_text(self) -> None:
+        rows = [(3, 0, 4), (1, 2, 5), (2, 2, 1), (9, 7, 2)]
+        src = self.write_text("p.txt", rows)
+        for sort in (False, True):
+            dst = self.path(f"p{sort}.trace")
+            report = convert_text_to_trace(src, dst, sort=sort)
+            self.assertEqual(report.accepted, len(rows))
+            self.assertEqual(columns(open_process_file(dst)), columns(load_process_table(src)))
+            self.assertTrue(map_trace(dst)[1])
+            self.assertFalse(os.path.exists(dst + ".part"))
+
+    def test_convert_unsorted(self) -> None:
+        src = self.write_text("p.txt", [(1, 5, 1), (2, 0, 1), (3, 9, 1)])
+        convert_text_to_trace(src, self.path("plain.trace"))
+        self.assertFalse(map_trace(self.path("plain.trace"))[1])
+        convert_text_to_trace(src, self.path("sorted.trace"), sort=True)
+        mapped, arrival_sorted = map_trace(self.path("sorted.trace"))
+        self.assertTrue(arrival_sorted)
+        self.assertEqual(mapped[1].tolist(), [0, 5, 9])
+
+    def test_convert_missing_source(self) -> None:
+        for sort in (False, True):
+            dst = self.path("out.trace")
+            with self.assertRaises(FileNotFoundError):
+                convert_text_to_trace(self.path("missing.txt"), dst, sort=sort)
+            self.assertEqual(os.listdir(self.dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
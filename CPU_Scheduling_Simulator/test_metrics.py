@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from algorithm import ProcessTable, run_algorithm
+from metrics import QUANTILES, LatencyHistogram, tail_stats
+
+# Tail latency percentiles: the histogram's error bound and chunked input.
+
+
+def exact_quantile(values: np.ndarray, q: float) -> int:
+    # Nearest rank, the definition LatencyHistogram.quantile approximates
+    ordered = np.sort(values)
+    return int(ordered[max(1, int(np.ceil(q * len(ordered)))) - 1])
+
+
+def histogram(*chunks: np.ndarray) -> LatencyHistogram:
+    hist = LatencyHistogram()
+    for chunk in chunks:
+        hist.add(chunk)
+    return hist
+
+
+def edge_cases() -> np.ndarray:
+    # Every power of two up to 2**62 and its neighbours, where frexp rounds
+    powers = 1 << np.arange(1, 63, dtype=np.int64)
+    values = np.concatenate((np.arange(300), powers - 1, powers, powers + 1, (powers >> 1) * 3))
+    return np.unique(values[(values >= 0) & (values < 2**63 - 1)])
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def assert_bound(self, exact: int, reported: int) -> None:
+        # Never low, at most 1/64 high
+        self.assertGreaterEqual(reported, exact)
+        self.assertLessEqual((reported - exact) * 64, exact, (exact, reported))
+
+    def test_bucket_edges(self) -> None:
+        hist = LatencyHistogram()
+        values = edge_cases()
+        buckets = hist._buckets(values)
+        self.assertTrue(np.all(np.diff(buckets) >= 0))
+        self.assertLess(int(buckets.max()), hist.BUCKETS)
+        for value, bucket in zip(values.tolist(), buckets.tolist()):
+            self.assert_bound(value, hist._upper_edge(bucket))
+        # Small values get a bucket each
+        self.assertEqual(buckets[: hist.SUB].tolist(), list(range(hist.SUB)))
+
+    def test_single_values(self) -> None:
+        for value in edge_cases().tolist():
+            hist = histogram(np.array([value]))
+            for _, q in QUANTILES:
+                # Clamped to the maximum, so a lone value is exact
+                self.assertEqual(hist.quantile(q), value)
+
+    def test_quantiles_within_bound(self) -> None:
+        rng = np.random.default_rng(0)
+        samples = (
+            rng.integers(0, 100, 5000),
+            np.floor(rng.pareto(1.2, 20000) * 1000).astype(np.int64),
+            np.floor(rng.lognormal(20, 4, 20000)).astype(np.int64).clip(0, 2**62),
+            np.concatenate((np.full(990, 10), np.full(10, 10**9))),
+        )
+        for values in samples:
+            hist = histogram(values)
+            for _, q in QUANTILES + (("min", 0.0), ("max", 1.0)):
+                self.assert_bound(exact_quantile(values, q), hist.quantile(q))
+            self.assertEqual(hist.max, int(values.max()))
+            self.assertAlmostEqual(hist.mean, float(values.mean()), delta=1e-9 * float(values.mean()) + 1e-9)
+
+    def test_chunks_and_merge(self) -> None:
+        rng = np.random.default_rng(1)
+        values = np.floor(rng.exponential(5000, 10000)).astype(np.int64)
+        whole = histogram(values)
+        chunked = histogram(*np.array_split(values, 7), np.zeros(0, dtype=np.int64))
+        merged = histogram(values[:3000])
+        merged.merge(histogram(values[3000:]))
+        for hist in (chunked, merged):
+            self.assertEqual(hist.counts.tolist(), whole.counts.tolist())
+            self.assertEqual((hist.count, hist.total, hist.max), (whole.count, whole.total, whole.max))
+
+    def test_empty(self) -> None:
+        hist = histogram(np.zeros(0, dtype=np.int64))
+        self.assertEqual((hist.quantile(0.5), hist.max, hist.mean), (0, 0, 0.0))
+
+    def test_tail_stats(self) -> None:
+        rng = np.random.default_rng(2)
+        n = 3000
+        table = ProcessTable(np.arange(n), np.sort(rng.integers(0, 2 * n, n)), rng.integers(1, 40, n))
+        run_algorithm(table, "RR", quantum=3)
+        stats = tail_stats(table, chunk=256)
+        for name in ("waiting", "turnaround", "response"):
+            values = getattr(table, name)
+            percentiles = getattr(stats, name)
+            for key, q in QUANTILES:
+                self.assert_bound(exact_quantile(values, q), getattr(percentiles, key))
+            self.assertEqual(percentiles.max, int(values.max()))
+        self.assertEqual(stats.count, n)
+        span = int(table.completion.max() - table.arrival.min())
+        self.assertAlmostEqual(stats.utilization, int(table.burst.sum()) / span)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+import unittest
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest import mock
+
+import numpy as np
+
+from algorithm import (
+    IncrementalRun,
+    Policy,
+    PolicyInfo,
+    POLICIES,
+    ProcessTable,
+    Progress,
+    SimStats,
+    SimulationCancelled,
+    Timeline,
+    register_policy,
+    reset_stats,
+    run_algorithm,
+    simulate_fcfs,
+    simulate_mlfq,
+    simulate_rr,
+    simulate_sjf,
+    simulate_srtf,
+)
+
+# Seeded random workloads checked against the original one-tick-at-a-time
+# simulators (below) and the fast paths checked against each other.
+
+Job = Tuple[int, int, int]
+Result = Tuple[List[Tuple[int, int, int]], List[int]]
+
+
+def _add(segments: List[Tuple[int, int, int]], pid: int, start: int, end: int) -> None:
+    if start == end:
+        return
+    if segments and segments[-1][0] == pid and segments[-1][2] == start:
+        segments[-1] = (pid, segments[-1][1], end)
+        return
+    segments.append((pid, start, end))
+
+
+def ref_fcfs(jobs: List[Job]) -> Result:
+    segments: List[Tuple[int, int, int]] = []
+    completion = []
+    now = 0
+    for pid, arrival, burst in jobs:
+        if now < arrival:
+            _add(segments, -1, now, arrival)
+            now = arrival
+        _add(segments, pid, now, now + burst)
+        now += burst
+        completion.append(now)
+    return segments, completion
+
+
+def ref_shortest(jobs: List[Job], preemptive: bool) -> Result:
+    # SJF runs the pick to completion, SRTF one tick at a time
+    left = [burst for _, _, burst in jobs]
+    completion = [0] * len(jobs)
+    segments: List[Tuple[int, int, int]] = []
+    now = done = 0
+    while done < len(jobs):
+        idx = -1
+        for i, (_, arrival, _) in enumerate(jobs):
+            if arrival <= now and left[i] > 0 and (idx == -1 or left[i] < left[idx]):
+                idx = i
+        if idx == -1:
+            _add(segments, -1, now, now + 1)
+            now += 1
+            continue
+        run = 1 if preemptive else left[idx]
+        _add(segments, jobs[idx][0], now, now + run)
+        now += run
+        left[idx] -= run
+        if left[idx] == 0:
+            completion[idx] = now
+            done += 1
+    return segments, completion
+
+
+def ref_queues(jobs: List[Job], quanta: List[Optional[int]]) -> Result:
+    # RR is one level; MLFQ demotes after each slice, None = run to completion
+    left = [burst for _, _, burst in jobs]
+    completion = [0] * len(jobs)
+    queues: List[List[int]] = [[] for _ in quanta]
+    segments: List[Tuple[int, int, int]] = []
+    now = done = i = 0
+
+    def admit() -> None:
+        nonlocal i
+        while i < len(jobs) and jobs[i][1] <= now:
+            queues[0].append(i)
+            i += 1
+
+    admit()
+    while done < len(jobs):
+        level = next((k for k, queue in enumerate(queues) if queue), None)
+        if level is None:
+            _add(segments, -1, now, jobs[i][1])
+            now = jobs[i][1]
+            admit()
+            continue
+        idx = queues[level].pop(0)
+        quantum = quanta[level]
+        run = left[idx] if quantum is None else min(quantum, left[idx])
+        _add(segments, jobs[idx][0], now, now + run)
+        now += run
+        left[idx] -= run
+        admit()
+        if left[idx]:
+            queues[min(level + 1, len(quanta) - 1)].append(idx)
+        else:
+            completion[idx] = now
+            done += 1
+    return segments, completion
+
+
+def random_jobs(rng: random.Random, n: int, spread: int = 3) -> List[Job]:
+    jobs = [(rng.randint(0, 6), rng.randint(0, spread * n), rng.randint(1, 9)) for _ in range(n)]
+    return sorted(jobs, key=lambda job: (job[1], job[0]))
+
+
+def table_of(jobs: List[Job]) -> ProcessTable:
+    pid, arrival, burst = zip(*jobs)
+    return ProcessTable(np.array(pid), np.array(arrival), np.array(burst), arrival_sorted=True)
+
+
+def random_table(seed: int, n: int) -> ProcessTable:
+    rng = np.random.default_rng(seed)
+    arrival = np.sort(rng.integers(0, 3 * n, n))
+    return ProcessTable(np.arange(n), arrival, rng.integers(1, 20, n), arrival_sorted=True)
+
+
+def copy_table(table: ProcessTable) -> ProcessTable:
+    copy = ProcessTable(table.pid.copy(), table.arrival.copy(), table.burst.copy())
+    copy.sort_by_arrival()
+    return copy
+
+
+def result_columns(table: ProcessTable) -> Dict[str, List[int]]:
+    return {name: getattr(table, name).tolist() for name in ("completion", "waiting", "turnaround", "response")}
+
+
+SETTINGS: List[Tuple[str, Dict[str, object]]] = [
+    ("FCFS", {}),
+    ("SJF", {}),
+    ("SRTF", {}),
+    ("RR", {"quantum": 1}),
+    ("RR", {"quantum": 3}),
+    ("MLFQ", {}),
+    ("MLFQ", {"q1": 1, "q2": 3}),
+    ("MLFQ", {"levels": (1, 2, 4, 0), "boost": 30}),
+    ("MLFQ", {"levels": (2, 4, 8), "allotment": (4, 8, 8)}),
+]
+
+
+class ReferenceTest(unittest.TestCase):
+    CASES: List[Tuple[Callable[..., Timeline], Tuple[int, ...], Callable[[List[Job]], Result]]] = [
+        (simulate_fcfs, (), ref_fcfs),
+        (simulate_sjf, (), lambda jobs: ref_shortest(jobs, False)),
+        (simulate_srtf, (), lambda jobs: ref_shortest(jobs, True)),
+        (simulate_rr, (1,), lambda jobs: ref_queues(jobs, [1])),
+        (simulate_rr, (3,), lambda jobs: ref_queues(jobs, [3])),
+        (simulate_mlfq, (2, 4), lambda jobs: ref_queues(jobs, [2, 4, None])),
+        (simulate_mlfq, (1, 1), lambda jobs: ref_queues(jobs, [1, 1, None])),
+    ]
+
+    def test_matches_per_tick_simulators(self) -> None:
+        rng = random.Random(1)
+        for _ in range(150):
+            jobs = random_jobs(rng, rng.randint(1, 25))
+            for simulate, args, reference in self.CASES:
+                segments, completion = reference(jobs)
+                table = table_of(jobs)
+                timeline = simulate(table, *args)
+                self.assertEqual(list(timeline), segments, (simulate.__name__, args, jobs))
+                self.assertEqual(table.completion.tolist(), completion)
+                burst = np.array([job[2] for job in jobs])
+                self.assertEqual(table.waiting.tolist(), (table.turnaround - burst).tolist())
+
+    def test_unsorted_table(self) -> None:
+        rng = random.Random(2)
+        for _ in range(50):
+            # Unique pids, so the (arrival, pid) order is unambiguous
+            jobs = [(pid, arrival, burst) for pid, (_, arrival, burst) in enumerate(random_jobs(rng, 25))]
+            shuffled = jobs[:]
+            rng.shuffle(shuffled)
+            for name, settings in SETTINGS:
+                expected = run_algorithm(table_of(jobs), name, **settings)
+                table = table_of(shuffled)
+                table.arrival_sorted = False
+                table.sort_by_arrival()
+                self.assertEqual(list(run_algorithm(table, name, **settings)), list(expected))
+
+
+class IncrementalRunTest(unittest.TestCase):
+    def test_resume_matches_full_run(self) -> None:
+        rng = random.Random(3)
+        for seed in range(4):
+            for name, settings in SETTINGS:
+                table = random_table(seed, 600)
+                run = IncrementalRun(table, name, checkpoint_every=16, **settings)
+                run.run()
+                for _ in range(3):
+                    run.insert(10_000 + rng.randint(0, 999), rng.randint(0, 1800), rng.randint(1, 20))
+                    resumed = run.resume()
+                    full = run_algorithm(copy_table(table), name, **settings)
+                    self.assertEqual(list(resumed), list(full), (name, settings, seed))
+                    for got, want in zip(resumed.arrays(), full.arrays()):
+                        self.assertEqual(got.tolist(), want.tolist())
+                    self.assertEqual(resumed.busy_time(), full.busy_time())
+
+    def test_columns_refresh_after_truncate(self) -> None:
+        # Back-to-back unit jobs, an idle gap [600, 605), then one more job.
+        # The resumed timeline has the same length and end as before.
+        n = 600
+        table = table_of([(pid, pid, 1) for pid in range(n)] + [(n, 605, 3)])
+        run = IncrementalRun(table, "RR")
+        run.run().arrays()
+        run.insert(999, 600, 5)
+        timeline = run.resume()
+        pids, _, _ = timeline.arrays()
+        self.assertEqual(pids[-2], 999)
+        self.assertEqual(timeline.busy_time(), 608)
+        self.assertEqual(timeline.occupancy()[999], 5)
+
+    def test_resume_leaves_published_timeline_alone(self) -> None:
+        # The GUI keeps drawing the last timeline while a resume runs, and a
+        # cancelled resume must not leave it half rewritten
+        table = random_table(8, 3000)
+        run = IncrementalRun(table, "RR", quantum=1)
+        shown = run.run()
+        segments = list(shown)
+        columns = [column.tolist() for column in shown.arrays()]
+        run.insert(99_999, 8000, 5)
+        progress = Progress(every=4)
+        progress.cancel()
+        with self.assertRaises(SimulationCancelled):
+            run.resume(progress)
+        self.assertEqual(list(shown), segments)
+        self.assertEqual([column.tolist() for column in shown.arrays()], columns)
+
+    def test_policy_without_snapshots(self) -> None:
+        class LastComeFirstServed(Policy):
+            def bind(self, remaining, stats) -> None:  # type: ignore[no-untyped-def]
+                super().bind(remaining, stats)
+                self.stack: List[int] = []
+
+            def on_arrival(self, idx: int) -> None:
+                self.stack.append(idx)
+
+            def select_next(self, now: int, next_arrival: Optional[int]) -> Tuple[int, int]:
+                idx = self.stack.pop()
+                return idx, self.remaining[idx]
+
+            def on_quantum_expiry(self, idx: int) -> None:
+                self.stack.append(idx)
+
+        register_policy(PolicyInfo("TEST-LCFS", LastComeFirstServed))
+        try:
+            table = random_table(5, 2000)
+            run = IncrementalRun(table, "TEST-LCFS")
+            run.run()
+            run.insert(99_999, 300, 4)
+            self.assertEqual(list(run.resume()), list(run_algorithm(table, "TEST-LCFS")))
+        finally:
+            del POLICIES["TEST-LCFS"]
+
+
+class StatsTest(unittest.TestCase):
+    def counters(self, name: str, jobs: List[Job], **settings: object) -> Dict[str, object]:
+        stats = SimStats()
+        run_algorithm(table_of(jobs), name, stats=stats, **settings)
+        counters = stats.to_dict()
+        keys = ("dispatches", "preemptions", "queue_pushes", "queue_pops", "context_switches")
+        return {key: counters[key] for key in keys}
+
+    def test_srtf_keeps_cpu_through_arrivals(self) -> None:
+        # P1 runs 0-5 and stops at 1, 2 and 3 for the arrivals, but none of
+        # them is shorter, so it is never preempted
+        jobs = [(1, 0, 5), (2, 1, 10), (3, 2, 10), (4, 3, 10)]
+        self.assertEqual(
+            self.counters("SRTF", jobs),
+            {"dispatches": 4, "preemptions": 0, "queue_pushes": 4, "queue_pops": 4, "context_switches": 3},
+        )
+
+    def test_srtf_preemption(self) -> None:
+        # P1 0-2, P2 2-5 (shorter, preempts P1), P1 5-13
+        jobs = [(1, 0, 10), (2, 2, 3)]
+        self.assertEqual(
+            self.counters("SRTF", jobs),
+            {"dispatches": 3, "preemptions": 1, "queue_pushes": 3, "queue_pops": 3, "context_switches": 2},
+        )
+
+    def test_rr(self) -> None:
+        # Q=2: P1 0-2, P2 2-4, P1 4-5; P1 is requeued once behind P2
+        jobs = [(1, 0, 3), (2, 1, 2)]
+        self.assertEqual(
+            self.counters("RR", jobs, quantum=2),
+            {"dispatches": 3, "preemptions": 1, "queue_pushes": 3, "queue_pops": 3, "context_switches": 2},
+        )
+
+    def test_one_dispatch_per_segment(self) -> None:
+        # With unique pids every busy segment is one job holding the CPU
+        for name, settings in SETTINGS:
+            table = random_table(4, 800)
+            stats = SimStats()
+            timeline = run_algorithm(table, name, stats=stats, **settings)
+            busy = sum(pid != -1 for pid, _, _ in timeline)
+            self.assertEqual(stats.dispatches, busy, (name, settings))
+            self.assertEqual(stats.queue_pops, stats.dispatches)
+            self.assertEqual(stats.queue_pushes, len(table) + stats.preemptions)
+
+    def test_mlfq_demotions(self) -> None:
+        # Q1=1, Q2=2: P1 0-1 (down to Q2), P2 1-2 (down to Q2), P1 2-4 (down
+        # to Q3), P2 4-6 (down to Q3), P1 6-7, P2 7-8
+        stats = SimStats()
+        run_algorithm(table_of([(1, 0, 4), (2, 1, 4)]), "MLFQ", q1=1, q2=2, stats=stats)
+        self.assertEqual((stats.dispatches, stats.preemptions, stats.context_switches), (6, 4, 5))
+        self.assertEqual(stats.demotions, {0: 2, 1: 2})
+
+
+class FastPathTest(unittest.TestCase):
+    def test_sharded_matches_serial(self) -> None:
+        from parallel import run_sharded
+
+        for name, settings in SETTINGS:
+            # Mostly busy, with a few long idle gaps to split at
+            rng = np.random.default_rng(7)
+            gaps = np.where(rng.random(400) < 0.97, rng.exponential(12.0, 400), rng.exponential(400.0, 400))
+            arrival = np.floor(np.cumsum(gaps)).astype(np.int64)
+            table = ProcessTable(np.arange(400), arrival, rng.integers(1, 20, 400), arrival_sorted=True)
+            expected = run_algorithm(table, name, **settings)
+            columns = result_columns(table)
+            reset_stats(table)
+            sharded = run_sharded(table, name, workers=2, shards=8, **settings)
+            self.assertEqual(list(sharded), list(expected), (name, settings))
+            self.assertEqual(result_columns(table), columns)
+
+    def check_streaming(self, seed: int) -> None:
+        from streaming import Finished, stream_algorithm
+
+        for name, settings in SETTINGS:
+            table = random_table(seed, 500)
+            expected_stats = SimStats()
+            expected = run_algorithm(table, name, stats=expected_stats, **settings)
+            rows = zip(table.pid.tolist(), table.arrival.tolist(), table.burst.tolist())
+            stats = SimStats()
+            segments, finished = [], {}
+            for event in stream_algorithm(rows, name, stats=stats, **settings):
+                if isinstance(event, Finished):
+                    finished[event.pid] = event
+                else:
+                    segments.append(tuple(event))
+            self.assertEqual(segments, list(expected), (name, settings))
+            self.assertEqual([finished[pid].completion for pid in table.pid.tolist()], table.completion.tolist())
+            self.assertEqual([finished[pid].response for pid in table.pid.tolist()], table.response.tolist())
+            counters, expected_counters = stats.to_dict(), expected_stats.to_dict()
+            del counters["phase_seconds"], expected_counters["phase_seconds"]
+            self.assertEqual(counters, expected_counters, (name, settings))
+
+    def test_streaming_matches_table(self) -> None:
+        self.check_streaming(11)
+
+    def test_streaming_small_windows(self) -> None:
+        # Arrivals loaded and results passed on a few steps at a time, so
+        # every window boundary falls mid-run somewhere
+        import streaming
+
+        for window in (1, 2, 7):
+            with mock.patch.object(streaming, "_WINDOW", window):
+                self.check_streaming(window)
+
+    def test_batch_matches_each_table(self) -> None:
+        from batch import WorkloadBatch, simulate_batch
+
+        rng = np.random.default_rng(13)
+        k, n = 30, 12
+        count = rng.integers(1, n + 1, k)
+        batch = WorkloadBatch(np.sort(rng.integers(0, 60, (k, n)), axis=1), rng.integers(1, 15, (k, n)), count)
+        for name, settings in SETTINGS:
+            result = simulate_batch(batch, name, **settings)
+            for row in range(k):
+                table = batch.table(row)
+                run_algorithm(table, name, **settings)
+                self.assertEqual(result.completion[row, : count[row]].tolist(), table.completion.tolist())
+                self.assertAlmostEqual(result.avg_waiting[row], table.waiting.mean())
+                self.assertAlmostEqual(result.avg_response[row], table.response.mean())
+
+    def test_parallel_stats_are_marked_uncounted(self) -> None:
+        from cache import run_cached
+
+        table = random_table(17, 300)
+        expected = SimStats()
+        run_algorithm(table, "RR", stats=expected)
+        stats = SimStats()
+        run_cached(table, "RR", workers=2, stats=stats)
+        self.assertFalse(stats.counted)
+        self.assertIsNone(stats.to_dict()["dispatches"])
+        self.assertEqual(stats.context_switches, expected.context_switches)
+        self.assertEqual(stats.idle_time, expected.idle_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from typing import Callable, Dict
+
+import numpy as np
+
+from algorithm import ProcessTable
+
+# Arrival rates are derived from the mean burst so every workload keeps the CPU
+# at roughly the same offered load.
+DEFAULT_LOAD = 0.9
+
+
+def exponential_bursts(n: int, rng: np.random.Generator, mean: float = 10.0) -> np.ndarray:
+    return np.maximum(1, np.rint(rng.exponential(mean, n))).astype(np.int64)
+
+
+def heavy_tailed_bursts(n: int, rng: np.random.Generator, alpha: float = 1.5, minimum: int = 2) -> np.ndarray:
+    # Pareto: most jobs are short, a few are orders of magnitude longer
+    bursts = minimum * (1.0 + rng.pareto(alpha, n))
+    return np.minimum(np.rint(bursts), 10**9).astype(np.int64)
+
+
+def bimodal_bursts(
+    n: int, rng: np.random.Generator, short: int = 3, long: int = 100, long_fraction: float = 0.1
+) -> np.ndarray:
+    is_long = rng.random(n) < long_fraction
+    spread = rng.integers(0, 3, n)
+    return np.where(is_long, long + spread * 10, short + spread).astype(np.int64)
+
+
+def poisson_arrivals(n: int, rng: np.random.Generator, rate: float) -> np.ndarray:
+    return np.floor(np.cumsum(rng.exponential(1.0 / rate, n))).astype(np.int64)
+
+
+def bursty_arrivals(
+    n: int, rng: np.random.Generator, rate: float, group_size: int = 50, spread: int = 5
+) -> np.ndarray:
+    # Jobs come in groups landing within a few units of each other, with the
+    # groups themselves spaced to keep the same average rate.
+    groups = -(-n // group_size)
+    group_starts = poisson_arrivals(groups, rng, rate / group_size)
+    arrivals = np.repeat(group_starts, group_size)[:n] + rng.integers(0, spread + 1, n)
+    return np.sort(arrivals)
+
+
+def idle_gap_arrivals(
+    n: int, rng: np.random.Generator, rate: float, period: int = 1000, gap: int = 100_000
+) -> np.ndarray:
+    # Poisson arrivals with a long quiet stretch after every `period` jobs
+    arrivals = poisson_arrivals(n, rng, rate)
+    return arrivals + (np.arange(n) // period) * gap
+
+
+def _poisson(n: int, rng: np.random.Generator) -> ProcessTable:
+    bursts = exponential_bursts(n, rng)
+    return _table(poisson_arrivals(n, rng, DEFAULT_LOAD / bursts.mean()), bursts)
+
+
+def _heavy_tailed(n: int, rng: np.random.Generator) -> ProcessTable:
+    bursts = heavy_tailed_bursts(n, rng)
+    return _table(poisson_arrivals(n, rng, DEFAULT_LOAD / bursts.mean()), bursts)
+
+
+def _bimodal(n: int, rng: np.random.Generator) -> ProcessTable:
+    bursts = bimodal_bursts(n, rng)
+    return _table(poisson_arrivals(n, rng, DEFAULT_LOAD / bursts.mean()), bursts)
+
+
+def _bursty(n: int, rng: np.random.Generator) -> ProcessTable:
+    bursts = exponential_bursts(n, rng)
+    return _table(bursty_arrivals(n, rng, DEFAULT_LOAD / bursts.mean()), bursts)
+
+
+def _idle_gaps(n: int, rng: np.random.Generator) -> ProcessTable:
+    bursts = exponential_bursts(n, rng)
+    return _table(idle_gap_arrivals(n, rng, DEFAULT_LOAD / bursts.mean()), bursts)
+
+
+def _table(arrivals: np.ndarray, bursts: np.ndarray) -> ProcessTable:
+    # Arrivals are already non-decreasing and pids follow arrival order
+    return ProcessTable(np.arange(1, len(arrivals) + 1), arrivals, bursts, arrival_sorted=True)
+
+
+WORKLOADS: Dict[str, Callable[[int, np.random.Generator], ProcessTable]] = {
+    "poisson": _poisson,
+    "heavy_tailed": _heavy_tailed,
+    "bimodal": _bimodal,
+    "bursty": _bursty,
+    "idle_gaps": _idle_gaps,
+}
+
+
+def generate_workload(kind: str, n: int, seed: int = 0) -> ProcessTable:
+    try:
+        make = WORKLOADS[kind]
+    except KeyError:
+        raise ValueError(f"unknown workload {kind!r}, expected one of {', '.join(WORKLOADS)}") from None
+    return make(n, np.random.default_rng(seed))